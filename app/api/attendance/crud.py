@@ -71,13 +71,13 @@ def create_attendance_location(
 
     db_location = AttendanceLocation(**location_dict)
     db.add(db_location)
-    db.commit()
+    db.flush()
     db.refresh(db_location)
 
     # Update QR code with actual ID
     qr_data = json.dumps({"location_id": str(db_location.id), "type": "attendance"})
     db_location.qr_code_data = qr_data
-    db.commit()
+    db.flush()
     db.refresh(db_location)
 
     return AttendanceLocationSchema.model_validate(db_location).model_dump(mode='json')
@@ -120,7 +120,7 @@ def update_attendance_location(
     for key, value in update_data.items():
         setattr(db_location, key, value)
 
-    db.commit()
+    db.flush()
     db.refresh(db_location)
     return AttendanceLocationSchema.model_validate(db_location).model_dump(mode='json')
 
@@ -134,7 +134,7 @@ def delete_attendance_location(db: Session, location_id: UUID) -> None:
         raise HTTPException(status_code=404, detail="Attendance location not found")
 
     db.delete(db_location)
-    db.commit()
+    db.flush()
 
 
 # ============================================================================
@@ -205,7 +205,7 @@ def check_in(db: Session, request: CheckInRequest, user_id: UUID) -> AttendanceR
         status=AttendanceStatus.CHECKED_IN,
     )
     db.add(record)
-    db.commit()
+    db.flush()
     db.refresh(record)
 
     return AttendanceRecordSchema.model_validate(record).model_dump(mode='json')
@@ -240,7 +240,7 @@ def check_out(db: Session, request: CheckOutRequest, user_id: UUID) -> Attendanc
     if request.notes:
         record.notes = request.notes
 
-    db.commit()
+    db.flush()
     db.refresh(record)
 
     return AttendanceRecordSchema.model_validate(record).model_dump(mode='json')
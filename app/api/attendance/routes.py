@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from app.api.attendance import crud, schemas
 from app.api.auth.crud import can_view_all_employees, log_contribution
 from app.api.auth.models import UserRole
-from app.api.auth.utils import get_current_user
+from app.api.auth.utils import get_current_principal, get_current_user
 from app.core.dependencies import get_db_session
 from app.core.schema_operations import create_api_response
 from app.core.utils.request import get_request
@@ -56,7 +56,7 @@ async def get_all_locations(
     active_only: bool = False,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     locations = crud.get_all_attendance_locations(db, request, active_only)
     return create_api_response(
@@ -73,7 +73,7 @@ async def get_location(
     id: UUID,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     location = crud.get_attendance_location(db, id)
     return create_api_response(
@@ -179,7 +179,7 @@ async def get_records(
     end_date: Optional[datetime] = None,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     # Employees can only see their own records unless they're in HR/Finance
     if not can_view_all_employees(user):
@@ -202,7 +202,7 @@ async def get_record(
     id: UUID,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     record = crud.get_attendance_record(db, id)
 
@@ -225,7 +225,7 @@ async def get_record(
 async def get_status(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     """Get the current user's active check-in status"""
     active_record = crud.get_active_check_in(db, user.id)
@@ -1,10 +1,24 @@
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import List, Literal, Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy import event, func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.api.auth import models
-from app.core.security import pwd_context
+from app.api.auth.utils import token_versions
+from app.core.batch_writer import BatchWriter
+from app.core.config import settings
+from app.core.database import sessionmanager
+from app.core.principal_cache import principal_cache
+from app.core.password_pool import password_pool
+from app.core.security import new_refresh_token, token_digest
+from app.core.token_revocation import revocation_list
+
+logger = logging.getLogger("tse.auth")
 
 # ---------------------------------------------------------------------------- #
 #                                  USER LOGIN                                  #
@@ -15,15 +29,17 @@ def get_user_by_username(db: Session, username: str):
     return db.query(models.User).filter(models.User.username == username).first()
 
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def authenticate_user(username: str, password: str, db: Session):
+async def authenticate_user(username: str, password: str, db: Session):
     user = get_user_by_username(db, username)
+    if not user:
+        return False
 
-    if not user or not verify_password(password, user.hashed_password):
+    valid, new_hash = await password_pool.verify_and_update(password, user.hashed_password)
+    if not valid:
         return False
+    if new_hash:
+        # Hashed with other cost parameters than PASSWORD_BCRYPT_ROUNDS
+        user.hashed_password = new_hash
     return user
 
 
@@ -46,7 +62,11 @@ def log_contribution(
     entity_name: Optional[str] = None,
 ):
     """
-    Inserts a user contribution entry in human-readable format.
+    Records a user contribution entry in human-readable format.
+
+    Nothing is committed here: in "transaction" mode the entry joins the
+    request's unit of work, in "background" mode it is handed to the batched
+    writer once that unit of work commits.
     """
 
     username = user.username if user else "Someone"
@@ -92,7 +112,7 @@ def log_contribution(
             f" '{entity_name}'" if entity_name else ""
         )
 
-    contribution = models.UserAction(
+    contribution = dict(
         user_id=user.id if user else None,
         action=action,
         entity=entity,
@@ -100,12 +120,191 @@ def log_contribution(
         description=description,
     )
 
-    db.add(contribution)
-    db.commit()
-    db.refresh(contribution)
+    if settings.CONTRIBUTION_LOG_MODE == "background":
+        contribution["timestamp"] = datetime.now(timezone.utc)
+        db.info.setdefault("pending_contributions", []).append(contribution)
+        return contribution
+
+    db.add(models.UserAction(**contribution))
     return contribution
 
 
+contribution_writer = BatchWriter(
+    "contributions",
+    models.UserAction,
+    batch_size=settings.CONTRIBUTION_LOG_BATCH_SIZE,
+    flush_interval=settings.CONTRIBUTION_LOG_FLUSH_INTERVAL_SECONDS,
+    max_size=settings.CONTRIBUTION_LOG_BUFFER_SIZE,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_pending_contributions(session):
+    """Hands contributions to the writer only once the request's work is committed."""
+    pending = session.info.pop("pending_contributions", None)
+    if pending:
+        contribution_writer.put_many(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_contributions(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop("pending_contributions", None)
+
+
+def invalidate_principal(db: Session, user_id):
+    """
+    Drops the user's cached tokens now, and again once the change commits so a
+    request that re-cached the old row in between does not keep it.
+    """
+    principal_cache.invalidate(user_id)
+    db.info.setdefault("invalidated_principals", set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session):
+    invalidated = session.info.pop("invalidated_principals", ())
+    for user_id in invalidated:
+        principal_cache.invalidate(user_id)
+        token_versions.expire(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_invalidated_principals(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop("invalidated_principals", None)
+
+
+# ---------------------------------------------------------------------------- #
+#                          REFRESH TOKENS AND LOGOUT                           #
+# ---------------------------------------------------------------------------- #
+
+
+def issue_refresh_token(
+    db: Session, user_id, family_id: Optional[uuid.UUID] = None
+) -> tuple[str, uuid.UUID]:
+    """
+    (token, family_id): a new refresh token in `family_id`, or in a new family
+    (login session) when None.
+    """
+    token = new_refresh_token()
+    family_id = family_id or uuid.uuid4()
+    db.execute(
+        insert(models.RefreshToken).values(
+            token_digest=token_digest(token),
+            user_id=user_id,
+            family_id=family_id,
+            expires_at=datetime.now(timezone.utc)
+            + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return token, family_id
+
+
+def rotate_refresh_token(db: Session, token: str):
+    """
+    (user, new refresh token, family_id) for a valid refresh token, which is
+    marked rotated; None otherwise. A token that was already rotated has been
+    presented twice, by the client and by whoever copied it, so its family is
+    revoked (committed even though the request then fails).
+    """
+    digest = token_digest(token)
+    RefreshToken = models.RefreshToken
+    claimed = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_digest == digest,
+            RefreshToken.rotated_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > func.now(),
+        )
+        .values(rotated_at=func.now())
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+    ).first()
+
+    if claimed is None:
+        reused_family = db.scalar(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_digest == digest,
+                RefreshToken.rotated_at.is_not(None),
+                RefreshToken.revoked_at.is_(None),
+            )
+        )
+        if reused_family is not None:
+            logger.warning("Rotated refresh token reused, revoking session %s", reused_family)
+            with sessionmanager.session() as session:
+                revoke_refresh_family(session, reused_family)
+                session.commit()
+        return None
+
+    user = db.get(models.User, claimed.user_id)
+    if user is None:
+        return None
+    new_token, family_id = issue_refresh_token(db, user.id, claimed.family_id)
+    return user, new_token, family_id
+
+
+def revoke_refresh_family(db: Session, family_id):
+    db.execute(
+        update(models.RefreshToken)
+        .where(
+            models.RefreshToken.family_id == family_id,
+            models.RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=func.now())
+    )
+
+
+def revoke_user_sessions(db: Session, user_id):
+    """
+    Ends every login session of the user: revoke_refresh_family for all of
+    their families, in one statement. Their access tokens are refused through
+    token_version, which the caller bumps.
+    """
+    db.execute(
+        update(models.RefreshToken)
+        .where(
+            models.RefreshToken.user_id == user_id,
+            models.RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=func.now())
+    )
+
+
+def revoke_access_token(db: Session, token: str, claims: dict):
+    """
+    Adds the token to revoked_tokens until its expiry, and ends its login
+    session (refresh token family, the `sid` claim) if it has one.
+    """
+    digest = token_digest(token)
+    db.execute(
+        insert(models.RevokedToken)
+        .values(
+            token_digest=digest,
+            user_id=claims.get("sub"),
+            expires_at=datetime.fromtimestamp(claims["exp"], timezone.utc),
+        )
+        .on_conflict_do_nothing()
+    )
+    if claims.get("sid"):
+        revoke_refresh_family(db, uuid.UUID(claims["sid"]))
+    principal_cache.discard(token)
+    db.info.setdefault("revoked_tokens", set()).add(digest)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_revoked_tokens(session):
+    # Other workers pick the rows up on their next revocation_list refresh
+    for digest in session.info.pop("revoked_tokens", ()):
+        revocation_list.add(digest)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_revoked_tokens(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop("revoked_tokens", None)
+
+
 # ---------------------------------------------------------------------------- #
 #                              EMPLOYEE MANAGEMENT                              #
 # ---------------------------------------------------------------------------- #
@@ -116,7 +315,7 @@ def get_all_employees(db: Session) -> List[models.User]:
     return db.query(models.User).all()
 
 
-def create_user(
+async def create_user(
     db: Session,
     username: str,
     name: str,
@@ -144,7 +343,7 @@ def create_user(
 
     from datetime import datetime
 
-    hashed_password = pwd_context.hash(password)
+    hashed_password = await password_pool.hash(password)
     new_user = models.User(
         username=username,
         name=name,
@@ -164,12 +363,12 @@ def create_user(
         updated_at=datetime.now(),
     )
     db.add(new_user)
-    db.commit()
+    db.flush()
     db.refresh(new_user)
     return new_user
 
 
-def update_user(
+async def update_user(
     db: Session,
     user_id,
     username: Optional[str] = None,
@@ -194,6 +393,7 @@ def update_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
+    claimed = (user.role, user.department)
 
     if username:
         # Check if new username is taken by another user
@@ -240,21 +440,31 @@ def update_user(
         user.emergency_contact_phone = emergency_contact_phone
 
     if password:
-        user.hashed_password = pwd_context.hash(password)
+        user.hashed_password = await password_pool.hash(password)
 
     if role:
         user.role = role
 
+    if password:
+        # Sessions opened with the old password end: no refreshes, and access
+        # tokens issued before this are refused
+        user.token_version = (user.token_version or 0) + 1
+        revoke_user_sessions(db, user.id)
+    elif (user.role, user.department) != claimed:
+        # Role and department claims in tokens issued before this no longer hold
+        user.token_version = (user.token_version or 0) + 1
+
     from datetime import datetime
 
     user.updated_at = datetime.now()
 
-    db.commit()
+    db.flush()
     db.refresh(user)
+    invalidate_principal(db, user.id)
     return user
 
 
-def update_profile(
+async def update_profile(
     db: Session,
     user_id,
     username: Optional[str] = None,
@@ -307,14 +517,18 @@ def update_profile(
         user.emergency_contact_phone = emergency_contact_phone
 
     if password:
-        user.hashed_password = pwd_context.hash(password)
+        user.hashed_password = await password_pool.hash(password)
+        # Sessions opened with the old password end, as in update_user
+        user.token_version = (user.token_version or 0) + 1
+        revoke_user_sessions(db, user.id)
 
     from datetime import datetime
 
     user.updated_at = datetime.now()
 
-    db.commit()
+    db.flush()
     db.refresh(user)
+    invalidate_principal(db, user.id)
     return user
 
 
@@ -329,7 +543,8 @@ def delete_user(db: Session, user_id) -> bool:
         )
 
     db.delete(user)
-    db.commit()
+    db.flush()
+    invalidate_principal(db, user.id)
     return True
 
 
@@ -6,7 +6,9 @@ from sqlalchemy import (
     Column,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Integer,
     String,
     func,
 )
@@ -60,6 +62,10 @@ class User(Base):
     )
 
     hashed_password: Mapped[str] = mapped_column(String(128))
+    # Bumped when the role or department changes; older tokens stop authorizing
+    token_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
 
     created_at: Mapped[DateTime] = mapped_column(DateTime)
     updated_at: Mapped[DateTime] = mapped_column(DateTime)
@@ -80,6 +86,8 @@ class UserLog(Base):
     path = Column(String, nullable=False)
     method = Column(String, nullable=False)
     status_code = Column(String, nullable=False)
+    query = Column(String, nullable=True)
+    duration_ms = Column(Float, nullable=True)
     request_body = Column(JSON, nullable=True)
     response_body = Column(JSON, nullable=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
@@ -108,3 +116,42 @@ class UserAction(Base):
 
     def __repr__(self):
         return f"<UserAction {self.description} at {self.timestamp:%Y-%m-%d %H:%M:%S}>"
+
+
+class RefreshToken(Base):
+    """
+    One issued refresh token, stored by digest. Every refresh rotates it: the
+    row is marked rotated and a new one joins the same family (one login
+    session). Presenting a rotated token again means it leaked, and the whole
+    family is revoked.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    token_digest = Column(String(64), primary_key=True)  # SHA-256 hex of the token
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey(column="users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    rotated_at = Column(DateTime(timezone=True), nullable=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class RevokedToken(Base):
+    """
+    Access tokens revoked before their expiry (logout), kept until they would
+    have expired anyway. Workers mirror it in a bloom filter, see token_revocation.
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    token_digest = Column(String(64), primary_key=True)  # SHA-256 hex of the token
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -11,17 +11,21 @@ from app.api.auth.crud import (
     create_user,
     delete_user,
     get_all_employees,
+    issue_refresh_token,
     log_contribution,
     require_manager,
+    revoke_access_token,
+    rotate_refresh_token,
     update_profile,
     update_user,
 )
-from app.api.auth.utils import get_current_user
-from app.core.dependencies import get_db_session, get_db_session_base
+from app.api.auth.utils import Principal, get_current_principal, get_current_user
+from app.core.dependencies import decode_token, get_db_session, get_db_session_base
 from app.core.schema_operations import create_api_response
 from app.core.security import (
     create_access_token,
     get_current_token,
+    principal_claims,
 )
 from app.core.utils.request import get_request
 
@@ -44,14 +48,15 @@ async def login_for_access_token(
     request=Depends(get_request),
     # user: schemas.GetUser = Depends(get_current_user),
 ):
-    user = authenticate_user(token_request.username, token_request.password, db)
+    user = await authenticate_user(token_request.username, token_request.password, db)
     if not user:
         return create_api_response(
             success=False,
             message="Incorrect username or password or Invalid account type",
             status_code=401,
         )
-    access_token = create_access_token(data={"sub": str(user.id)})
+    refresh_token, session_id = issue_refresh_token(db, user.id)
+    access_token = create_access_token(data={**principal_claims(user), "sid": str(session_id)})
     log_contribution(db, user, "LOGIN", "user", user.name)
     return create_api_response(
         success=True,
@@ -59,6 +64,34 @@ async def login_for_access_token(
         data=schemas.TokenSchema(
             token_type="bearer",
             access_token=access_token,
+            refresh_token=refresh_token,
+        ),
+    )
+
+
+@router.post("/refresh", summary="Rotate Refresh Token", tags=["User"])
+async def refresh_access_token(
+    token_request: schemas.RefreshTokenRequest,
+    db: Session = Depends(get_db_session_base),
+    request=Depends(get_request),
+):
+    """New access and refresh tokens; the refresh token sent is used up."""
+    rotated = rotate_refresh_token(db, token_request.refresh_token)
+    if rotated is None:
+        return create_api_response(
+            success=False,
+            message="Invalid or expired refresh token",
+            status_code=401,
+        )
+    user, refresh_token, session_id = rotated
+    access_token = create_access_token(data={**principal_claims(user), "sid": str(session_id)})
+    return create_api_response(
+        success=True,
+        message="Token refreshed",
+        data=schemas.TokenSchema(
+            token_type="bearer",
+            access_token=access_token,
+            refresh_token=refresh_token,
         ),
     )
 
@@ -83,6 +116,7 @@ async def logout(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
 ):
+    revoke_access_token(db, token, decode_token(token))
     log_contribution(db, user, "LOGOUT", "user", user.name)
     return create_api_response(success=True, message="Token expired successfully")
 
@@ -95,7 +129,7 @@ async def update_user_profile(
     request=Depends(get_request),
 ):
     """Allow users to update their own profile data (personal fields only)"""
-    updated_user = update_profile(
+    updated_user = await update_profile(
         db=db,
         user_id=user.id,
         username=profile_data.username,
@@ -129,7 +163,7 @@ async def update_user_profile(
     tags=["Employee Management"],
 )
 async def get_employees(
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
 ):
@@ -155,7 +189,7 @@ async def get_employees(
 )
 async def get_employee(
     employee_id: UUID,
-    user: models.User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
 ):
@@ -202,7 +236,7 @@ async def create_employee(
         else models.UserRole.EMPLOYEE
     )
 
-    new_employee = create_user(
+    new_employee = await create_user(
         db=db,
         username=employee_data.username,
         name=employee_data.name,
@@ -253,7 +287,7 @@ async def update_employee(
             else models.UserRole.EMPLOYEE
         )
 
-    updated_employee = update_user(
+    updated_employee = await update_user(
         db=db,
         user_id=employee_id,
         username=employee_data.username,
@@ -31,6 +31,11 @@ class TokenRequest(BaseModel):
 class TokenSchema(BaseModel):
     token_type: str
     access_token: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 
 # Employee Management Schemas
@@ -1,19 +1,227 @@
+import asyncio
+import logging
+import time
+from typing import Optional
 from uuid import UUID
 
-from app.api.auth.models import User
-from app.core.dependencies import get_current_user_id, get_db_session_base
+from app.api.auth.models import DepartmentEnum, User, UserRole
+from app.core import request_context
+from app.core.config import settings
+from app.core.database import sessionmanager
+from app.core.dependencies import decode_token, ensure_not_revoked, revoked_exception
+from app.core.principal_cache import principal_cache
+from app.core.security import oauth2_scheme
 from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 
+logger = logging.getLogger("tse.auth")
 
-async def get_current_user(
-    user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db_session_base),
-) -> User:
-    
-    user = db.query(User).filter_by(id=user_id).first()
+# Users per `IN (...)` list when reloading token versions
+REFRESH_CHUNK_SIZE = 1000
+
+_UNKNOWN = object()
+
+
+class CurrentUser:
+    """
+    Detached snapshot of the authenticated user's columns.
+
+    Handlers get this instead of a session-bound `User`, so it can be cached
+    across requests (see principal_cache). It has the attributes handlers read
+    and validates into UserSchema like the ORM object; to change the user, load
+    it in the request's session by id.
+    """
+
+    __slots__ = (
+        "id",
+        "username",
+        "name",
+        "employee_num",
+        "email",
+        "nik",
+        "position",
+        "department",
+        "phone_number",
+        "hire_date",
+        "address",
+        "emergency_contact_name",
+        "emergency_contact_phone",
+        "role",
+        "token_version",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(self, user: User):
+        for name in self.__slots__:
+            setattr(self, name, getattr(user, name))
+
+    def __repr__(self) -> str:
+        return f"CurrentUser(id={self.id!r}, username={self.username!r}, role={self.role!r})"
+
+
+class Principal:
+    """The caller as far as authorization needs: id, role and department."""
+
+    __slots__ = ("id", "role", "department", "version")
+
+    def __init__(
+        self, id: UUID, role: UserRole, department: Optional[DepartmentEnum], version: int
+    ):
+        self.id = id
+        self.role = role
+        self.department = department
+        self.version = version
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> "Principal":
+        department = claims.get("department")
+        return cls(
+            UUID(claims["sub"]),
+            UserRole(claims["role"]),
+            DepartmentEnum(department) if department else None,
+            claims.get("ver", 0),
+        )
+
+    def __repr__(self) -> str:
+        return f"Principal(id={self.id!r}, role={self.role!r}, department={self.department!r})"
+
+
+class TokenVersions:
+    """
+    The current token_version of the users whose tokens this worker has seen.
+
+    Tokens carry the version they were issued under, so claims issued before a
+    role or department change are refused once this sees the bump. A user is
+    looked up by id the first time one of their tokens arrives; after that
+    run_token_version_refresher reloads the tracked users (one query for all
+    of them) every `refresh_interval` seconds, so the cost follows the active
+    users rather than the size of `users`. Users not seen for `idle_timeout`
+    seconds are dropped. A user that no longer exists is stored as None.
+    """
+
+    def __init__(self, refresh_interval: float = 30, idle_timeout: float = 600):
+        self.refresh_interval = refresh_interval
+        self.idle_timeout = idle_timeout
+        self._versions: dict[UUID, Optional[int]] = {}
+        self._seen: dict[UUID, float] = {}  # time.monotonic() of the last token seen
+        # Bumped by expire(); a load that started before a user's last expiry
+        # read the row before the change and must not be stored
+        self._generation = 0
+        self._expired: dict[UUID, int] = {}
+
+    def _store(self, user_id: UUID, version: Optional[int], generation: int):
+        if self._expired.get(user_id, 0) <= generation:
+            self._versions[user_id] = version
+
+    def lookup(self, user_id: UUID) -> Optional[int]:
+        """Loads one user missing from the table; called from a thread."""
+        generation = self._generation
+        with sessionmanager.session() as session:
+            row = session.execute(select(User.token_version).where(User.id == user_id)).first()
+        version = (row.token_version or 0) if row is not None else None
+        self._store(user_id, version, generation)
+        return version
+
+    def refresh(self):
+        """Reloads the users seen recently; called from one thread."""
+        generation = self._generation
+        cutoff = time.monotonic() - self.idle_timeout
+        seen = list(self._seen.items())
+        user_ids = [user_id for user_id, last_seen in seen if last_seen > cutoff]
+        versions: dict[UUID, Optional[int]] = dict.fromkeys(user_ids)
+        with sessionmanager.session() as session:
+            for start in range(0, len(user_ids), REFRESH_CHUNK_SIZE):
+                chunk = user_ids[start : start + REFRESH_CHUNK_SIZE]
+                rows = session.execute(
+                    select(User.id, User.token_version).where(User.id.in_(chunk))
+                )
+                versions.update((user_id, version or 0) for user_id, version in rows)
+        # Key by key: requests keep reading (and lookup() writing) this dict meanwhile
+        for user_id, version in versions.items():
+            self._store(user_id, version, generation)
+        for user_id, last_seen in seen:
+            if last_seen <= cutoff and self._seen.get(user_id, 0) <= cutoff:
+                self._seen.pop(user_id, None)
+                self._versions.pop(user_id, None)
+                self._expired.pop(user_id, None)
+
+    def expire(self, user_id: UUID):
+        """Looks the user up again on their next request (this worker changed them)."""
+        self._generation += 1
+        self._expired[user_id] = self._generation
+        self._versions.pop(user_id, None)
+
+    async def is_current(self, user_id: UUID, version: int) -> bool:
+        self._seen[user_id] = time.monotonic()
+        current = self._versions.get(user_id, _UNKNOWN)
+        if current is _UNKNOWN:
+            current = await asyncio.to_thread(self.lookup, user_id)
+        return current is not None and version >= current
+
+
+token_versions = TokenVersions(refresh_interval=settings.TOKEN_VERSION_REFRESH_SECONDS)
+
+
+async def run_token_version_refresher():
+    """Keeps token_versions current for the users this worker is serving."""
+    while True:
+        await asyncio.sleep(token_versions.refresh_interval)
+        try:
+            await asyncio.to_thread(token_versions.refresh)
+        except Exception:
+            logger.exception("Token version refresh failed")
+
+
+def _load_user(user_id: UUID) -> Optional[CurrentUser]:
+    # In a thread: with the pool exhausted, a checkout on the event loop would
+    # stall the very requests that hold the connections
+    with sessionmanager.session() as session:
+        row = session.query(User).filter_by(id=user_id).first()
+        return CurrentUser(row) if row is not None else None
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> CurrentUser:
+    with request_context.timed("auth"):
+        await ensure_not_revoked(token)
+        user = principal_cache.get(token)
+        if user is None:
+            claims = decode_token(token)
+            user = await asyncio.to_thread(_load_user, UUID(claims["sub"]))
+            if user is not None:
+                if claims.get("ver", user.token_version) < user.token_version:
+                    raise revoked_exception()
+                principal_cache.put(token, user, claims.get("exp"))
 
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
+    request_context.set_user(user.id, user.role)
     return user
+
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    The caller's id, role and department from the token's claims, without a
+    `users` query, for handlers that only authorize. Handlers that need the
+    user's other columns depend on get_current_user instead.
+    """
+    with request_context.timed("auth"):
+        await ensure_not_revoked(token)
+        cached = principal_cache.peek(token)
+        if cached is not None:
+            principal = Principal(cached.id, cached.role, cached.department, cached.token_version)
+        else:
+            claims = decode_token(token)
+            principal = Principal.from_claims(claims) if "role" in claims else None
+            if principal is not None:
+                if not await token_versions.is_current(principal.id, principal.version):
+                    raise revoked_exception()
+
+    if principal is None:
+        # Issued before tokens carried claims
+        user = await get_current_user(token)
+        principal = Principal(user.id, user.role, user.department, user.token_version)
+
+    request_context.set_user(principal.id, principal.role)
+    return principal
@@ -6,13 +6,14 @@ from sqlalchemy.orm import Session
 from app.api.contacts.models import Contact
 from app.api.contacts.schemas import ContactSchema
 from app.core.schema_operations import parse_schema
+from app.utils.bulk_utils import bulk_soft_delete
 from app.utils.filter_utils import get_options, get_paginated_data
 
 
 def create_contact(db: Session, contact: ContactSchema):
     db_contact = Contact(**parse_schema(contact))
     db.add(db_contact)
-    db.commit()
+    db.flush()
     db.refresh(db_contact)
     return db_contact
 
@@ -26,7 +27,7 @@ def update_contact(db: Session, id: UUID, contact: ContactSchema):
     db_contact = db.query(Contact).get(id)
     for key, value in parse_schema(contact).items():
         setattr(db_contact, key, value)
-    db.commit()
+    db.flush()
     db.refresh(db_contact)
     return db_contact
 
@@ -36,7 +37,11 @@ def delete_contact(db: Session, id: UUID):
     if db_contact is None:
         raise ValueError(f"Contact with id {id} does not exist")
     db_contact.soft_delete()
-    db.commit()
+    db.flush()
+
+
+def bulk_delete_contacts(db: Session, ids: list[UUID]):
+    return bulk_soft_delete(db, Contact, ids)
 
 
 def get_all_contacts(db: Session, request: Request):
@@ -4,11 +4,12 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.api.auth.crud import log_contribution
-from app.api.auth.utils import get_current_user
+from app.api.auth.utils import get_current_principal, get_current_user
 from app.api.contacts import crud, schemas
 from app.core.dependencies import get_db_session
-from app.core.schema_operations import create_api_response
+from app.core.schema_operations import BulkIdsSchema, create_api_response
 from app.core.utils.request import get_request
+from app.utils.bulk_utils import summarize_outcomes
 
 router = APIRouter(prefix="/contacts")
 
@@ -21,7 +22,7 @@ router = APIRouter(prefix="/contacts")
 async def get_all_contacts(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     contacts = crud.get_all_contacts(db, request)
     return create_api_response(
@@ -59,7 +60,9 @@ async def bulk_import_contacts(
     created_count = 0
     for contact in contacts:
         try:
-            crud.create_contact(db, contact)
+            # Savepoint per contact so one bad row doesn't abort the whole import
+            with db.begin_nested():
+                crud.create_contact(db, contact)
             created_count += 1
         except Exception as e:
             # Continue with other contacts if one fails
@@ -80,7 +83,7 @@ async def bulk_import_contacts(
 async def get_contact_options(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     options = crud.get_contacts_options(db)
     return create_api_response(
@@ -96,7 +99,7 @@ async def get_contact_options(
 async def get_zone_options(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     options = crud.get_zone_options(db)
     return create_api_response(
@@ -112,7 +115,7 @@ async def get_zone_options(
 async def export_contacts_csv(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     """Export all contacts data for CSV download."""
     contacts = crud.get_all_contacts_for_export(db)
@@ -130,7 +133,7 @@ async def get_contact(
     id: UUID,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     contact = crud.get_contact(db, id)
     return create_api_response(
@@ -169,3 +172,25 @@ async def delete_contact(
     crud.delete_contact(db, id)
     log_contribution(db, user, "DELETED", "contact", f"id={id}")
     return create_api_response(success=True, message="Contact deleted successfully")
+
+
+@router.post(
+    "/bulk-delete",
+    summary="Bulk Delete Contacts",
+    tags=["Contact"],
+)
+async def bulk_delete_contacts(
+    payload: BulkIdsSchema,
+    db: Session = Depends(get_db_session),
+    request=Depends(get_request),
+    user=Depends(get_current_user),
+):
+    summary = summarize_outcomes(crud.bulk_delete_contacts(db, payload.ids))
+    log_contribution(
+        db, user, "DELETED", "contacts", f"{summary['succeeded']} contacts"
+    )
+    return create_api_response(
+        success=True,
+        message=f"{summary['succeeded']} of {len(payload.ids)} contacts deleted",
+        data=summary,
+    )
@@ -6,13 +6,14 @@ from sqlalchemy.orm import Session
 from app.api.facilities.models import Facility
 from app.api.facilities.schemas import FacilitySchema
 from app.core.schema_operations import parse_schema
+from app.utils.bulk_utils import bulk_soft_delete
 from app.utils.filter_utils import get_options, get_paginated_data
 
 
 def create_facility(db: Session, facility: FacilitySchema):
     db_facility = Facility(**parse_schema(facility))
     db.add(db_facility)
-    db.commit()
+    db.flush()
     db.refresh(db_facility)
     return db_facility
 
@@ -26,7 +27,7 @@ def update_facility(db: Session, id: UUID, facility: FacilitySchema):
     db_facility = db.query(Facility).get(id)
     for key, value in parse_schema(facility).items():
         setattr(db_facility, key, value)
-    db.commit()
+    db.flush()
     db.refresh(db_facility)
     return db_facility
 
@@ -36,7 +37,11 @@ def delete_facility(db: Session, id: UUID):
     if db_facility is None:
         raise ValueError(f"Facility with id {id} does not exist")
     db_facility.soft_delete()
-    db.commit()
+    db.flush()
+
+
+def bulk_delete_facilities(db: Session, ids: list[UUID]):
+    return bulk_soft_delete(db, Facility, ids)
 
 
 def get_all_facilities(db: Session, request: Request):
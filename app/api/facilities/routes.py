@@ -4,11 +4,12 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.api.auth.crud import log_contribution, require_manager
-from app.api.auth.utils import get_current_user
+from app.api.auth.utils import get_current_principal, get_current_user
 from app.api.facilities import crud, schemas
 from app.core.dependencies import get_db_session
-from app.core.schema_operations import create_api_response
+from app.core.schema_operations import BulkIdsSchema, create_api_response
 from app.core.utils.request import get_request
+from app.utils.bulk_utils import summarize_outcomes
 
 router = APIRouter(prefix="/facilities")
 
@@ -21,7 +22,7 @@ router = APIRouter(prefix="/facilities")
 async def get_all_services(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     require_manager(user)
     facilities = crud.get_all_facilities(db, request)
@@ -56,7 +57,7 @@ async def get_facility(
     id: UUID,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     require_manager(user)
     facility = crud.get_facility(db, id)
@@ -100,6 +101,29 @@ async def delete_facility(
     return create_api_response(success=True, message="Facility deleted successfully")
 
 
+@router.post(
+    "/bulk-delete",
+    summary="Bulk Delete Facilities",
+    tags=["Facility"],
+)
+async def bulk_delete_facilities(
+    payload: BulkIdsSchema,
+    db: Session = Depends(get_db_session),
+    request=Depends(get_request),
+    user=Depends(get_current_user),
+):
+    require_manager(user)
+    summary = summarize_outcomes(crud.bulk_delete_facilities(db, payload.ids))
+    log_contribution(
+        db, user, "DELETED", "facilities", f"{summary['succeeded']} facilities"
+    )
+    return create_api_response(
+        success=True,
+        message=f"{summary['succeeded']} of {len(payload.ids)} facilities deleted",
+        data=summary,
+    )
+
+
 @router.get(
     "/utils/options",
     summary="Get Facility Options",
@@ -108,7 +132,7 @@ async def delete_facility(
 async def get_facility_options(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     require_manager(user)
     options = crud.get_facilities_options(db)
@@ -126,7 +150,7 @@ async def get_facility_coordinates(
     id: UUID,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     require_manager(user)
     coordinates = crud.get_facility_coordinates(db, id)
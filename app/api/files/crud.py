@@ -29,7 +29,7 @@ def get_presigned_upload_url(filename: str, size: int, db: Session, user):
         uploaded_by_id=user.id,
     )
     db.add(uploaded_file)
-    db.commit()
+    db.flush()
 
     return presigned_url, uploaded_file.id
 
@@ -51,7 +51,7 @@ def update_file_metadata(file_id: UUID, db: Session, user):
 
     uploaded_file.update_file_metadata()
 
-    db.commit()
+    db.flush()
 
 
 def get_file_metadata(file_id: UUID, db: Session, user):
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.api.auth.crud import log_contribution
-from app.api.auth.utils import get_current_user
+from app.api.auth.utils import get_current_principal, get_current_user
 from app.api.files import crud
 from app.core.dependencies import get_db_session
 from app.core.schema_operations import create_api_response
@@ -51,7 +51,7 @@ async def get_file_metadata(
     file_id: UUID,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     file_metadata = crud.get_file_metadata(file_id, db, user)
     return create_api_response(
@@ -64,7 +64,7 @@ async def download_file(
     file_id: UUID,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     download_url = crud.get_presigned_download_url(file_id, db, user)
     return create_api_response(
@@ -82,7 +82,7 @@ async def get_image_url(
     extension: str = Query("jpg", description="Extension of the image"),
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     image_url = crud.get_image_url(
         file_id, db, width, height, resize_type, enlarge, extension
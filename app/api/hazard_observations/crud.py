@@ -35,7 +35,7 @@ def create_observation(
 
     db_observation = HazardObservation(**observation_dict)
     db.add(db_observation)
-    db.commit()
+    db.flush()
     db.refresh(db_observation)
 
     return HazardObservationSchema.model_validate(db_observation).model_dump(mode="json")
@@ -160,7 +160,7 @@ def update_observation(
     for key, value in update_data.items():
         setattr(db_observation, key, value)
 
-    db.commit()
+    db.flush()
     db.refresh(db_observation)
     return HazardObservationSchema.model_validate(db_observation).model_dump(mode="json")
 
@@ -176,7 +176,7 @@ def delete_observation(db: Session, observation_id: UUID) -> None:
         raise HTTPException(status_code=404, detail="Hazard observation not found")
 
     db.delete(db_observation)
-    db.commit()
+    db.flush()
 
 
 def resolve_observation(
@@ -204,7 +204,7 @@ def resolve_observation(
     db_observation.resolved_at = datetime.utcnow()
     db_observation.resolution_notes = resolution.resolution_notes
 
-    db.commit()
+    db.flush()
     db.refresh(db_observation)
     return HazardObservationSchema.model_validate(db_observation).model_dump(mode="json")
 
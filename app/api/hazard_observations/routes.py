@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from app.api.hazard_observations import crud, schemas
 from app.api.auth.crud import log_contribution
 from app.api.auth.models import DepartmentEnum, UserRole
-from app.api.auth.utils import get_current_user
+from app.api.auth.utils import get_current_principal, get_current_user
 from app.core.dependencies import get_db_session
 from app.core.schema_operations import create_api_response
 from app.core.utils.request import get_request
@@ -60,7 +60,7 @@ async def get_observations(
     end_date: Optional[date] = None,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     """
     Get hazard observations with filters.
@@ -90,7 +90,7 @@ async def get_observation(
     id: UUID,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     """
     Get a specific hazard observation.
@@ -232,7 +232,7 @@ async def resolve_observation(
 async def export_observations_csv(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     """
     Export all hazard observations data for CSV download.
@@ -257,7 +257,7 @@ async def export_observations_csv(
 async def get_analytics(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     """
     Get hazard observation analytics.
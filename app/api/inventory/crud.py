@@ -6,13 +6,14 @@ from sqlalchemy.orm import Session
 from app.api.inventory.models import Inventory
 from app.api.inventory.schemas import InventorySchema
 from app.core.schema_operations import parse_schema
+from app.utils.bulk_utils import bulk_soft_delete
 from app.utils.filter_utils import get_options, get_paginated_data
 
 
 def create_inventory(db: Session, inventory: InventorySchema):
     db_inventory = Inventory(**parse_schema(inventory))
     db.add(db_inventory)
-    db.commit()
+    db.flush()
     db.refresh(db_inventory)
     return db_inventory
 
@@ -28,7 +29,7 @@ def update_inventory(db: Session, id: UUID, inventory: InventorySchema):
         if key == "storage_location":
             continue
         setattr(db_inventory, key, value)
-    db.commit()
+    db.flush()
     db.refresh(db_inventory)
     return db_inventory
 
@@ -38,7 +39,11 @@ def delete_inventory(db: Session, id: UUID):
     if db_inventory is None:
         raise ValueError(f"Inventory with id {id} does not exist")
     db_inventory.soft_delete()
-    db.commit()
+    db.flush()
+
+
+def bulk_delete_inventory(db: Session, ids: list[UUID]):
+    return bulk_soft_delete(db, Inventory, ids)
 
 
 def get_all_inventory(db: Session, request: Request):
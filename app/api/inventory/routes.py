@@ -4,11 +4,12 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.api.auth.crud import log_contribution
-from app.api.auth.utils import get_current_user
+from app.api.auth.utils import get_current_principal, get_current_user
 from app.api.inventory import crud, schemas
 from app.core.dependencies import get_db_session
-from app.core.schema_operations import create_api_response
+from app.core.schema_operations import BulkIdsSchema, create_api_response
 from app.core.utils.request import get_request
+from app.utils.bulk_utils import summarize_outcomes
 
 router = APIRouter(prefix="/inventory")
 
@@ -21,7 +22,7 @@ router = APIRouter(prefix="/inventory")
 async def get_all_services(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     inventory = crud.get_all_inventory(db, request)
     return create_api_response(
@@ -54,7 +55,7 @@ async def get_inventory(
     id: UUID,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     inventory = crud.get_inventory(db, id)
     return create_api_response(
@@ -101,6 +102,32 @@ async def delete_inventory(
     return create_api_response(success=True, message="Inventory deleted successfully")
 
 
+@router.post(
+    "/bulk-delete",
+    summary="Bulk Delete Inventory (Manager Only)",
+    tags=["Inventory"],
+)
+async def bulk_delete_inventory(
+    payload: BulkIdsSchema,
+    db: Session = Depends(get_db_session),
+    request=Depends(get_request),
+    user=Depends(get_current_user),
+):
+    from app.api.auth.crud import require_manager
+
+    require_manager(user)
+
+    summary = summarize_outcomes(crud.bulk_delete_inventory(db, payload.ids))
+    log_contribution(
+        db, user, "DELETED", "inventory", f"{summary['succeeded']} items"
+    )
+    return create_api_response(
+        success=True,
+        message=f"{summary['succeeded']} of {len(payload.ids)} inventory items deleted",
+        data=summary,
+    )
+
+
 @router.get(
     "/utils/options",
     summary="Get Inventory Options",
@@ -109,7 +136,7 @@ async def delete_inventory(
 async def get_inventory_options(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     options = crud.get_inventory_options(db)
     return create_api_response(
@@ -1,8 +1,9 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy import case, func, literal
 from sqlalchemy.orm import Session
 
 from app.api.it_tickets.models import ITTicket, TicketStatus
@@ -13,6 +14,7 @@ from app.api.it_tickets.schemas import (
     ITTicketSchema,
     ITTicketUpdateSchema,
 )
+from app.utils.bulk_utils import bulk_update
 from app.utils.filter_utils import get_paginated_data
 
 
@@ -25,7 +27,7 @@ def create_ticket(
 
     db_ticket = ITTicket(**ticket_dict)
     db.add(db_ticket)
-    db.commit()
+    db.flush()
     db.refresh(db_ticket)
 
     return ITTicketSchema.model_validate(db_ticket).model_dump(mode="json")
@@ -146,7 +148,7 @@ def update_ticket(
     for key, value in update_data.items():
         setattr(db_ticket, key, value)
 
-    db.commit()
+    db.flush()
     db.refresh(db_ticket)
     return ITTicketSchema.model_validate(db_ticket).model_dump(mode="json")
 
@@ -163,7 +165,7 @@ def assign_ticket(
     if db_ticket.status == TicketStatus.OPEN:
         db_ticket.status = TicketStatus.IN_PROGRESS
 
-    db.commit()
+    db.flush()
     db.refresh(db_ticket)
     return ITTicketSchema.model_validate(db_ticket).model_dump(mode="json")
 
@@ -187,7 +189,7 @@ def resolve_ticket(
     db_ticket.resolved_at = datetime.utcnow()
     db_ticket.resolution_notes = resolution.resolution_notes
 
-    db.commit()
+    db.flush()
     db.refresh(db_ticket)
     return ITTicketSchema.model_validate(db_ticket).model_dump(mode="json")
 
@@ -199,13 +201,66 @@ def delete_ticket(db: Session, ticket_id: UUID) -> None:
         raise HTTPException(status_code=404, detail="IT ticket not found")
 
     db.delete(db_ticket)
-    db.commit()
+    db.flush()
+
+
+def bulk_assign_tickets(
+    db: Session, ids: list[UUID], assigned_to_id: UUID
+) -> list[dict]:
+    """Assign many IT tickets at once, moving open ones to in progress"""
+    return bulk_update(
+        db,
+        ITTicket,
+        ids,
+        {
+            "assigned_to_id": assigned_to_id,
+            "status": case(
+                (
+                    ITTicket.status == TicketStatus.OPEN,
+                    # Typed, so the enum binds by name like the column does
+                    literal(TicketStatus.IN_PROGRESS, ITTicket.status.type),
+                ),
+                else_=ITTicket.status,
+            ),
+        },
+    )
+
+
+def bulk_update_ticket_status(
+    db: Session, ids: list[UUID], status: TicketStatus, user_id: UUID
+) -> list[dict]:
+    """
+    Set the status of many IT tickets at once, with the rules of the
+    single-ticket routes: resolving an already resolved ticket is refused,
+    and moving a ticket out of resolved clears its resolver.
+    """
+    values = {"status": status}
+    where = None
+    if status == TicketStatus.RESOLVED:
+        values["resolved_by_id"] = user_id
+        values["resolved_at"] = datetime.now(timezone.utc)
+        where = ITTicket.status != TicketStatus.RESOLVED
+    else:
+        values["resolved_by_id"] = None
+        values["resolved_at"] = None
+    outcomes = bulk_update(db, ITTicket, ids, values, where=where)
+
+    refused = [UUID(outcome["id"]) for outcome in outcomes if not outcome["success"]]
+    if where is not None and refused:
+        resolved = {
+            row.id
+            for row in db.query(ITTicket.id).filter(
+                ITTicket.id.in_(refused), ITTicket.status == TicketStatus.RESOLVED
+            )
+        }
+        for outcome in outcomes:
+            if not outcome["success"] and UUID(outcome["id"]) in resolved:
+                outcome["message"] = "Ticket is already resolved"
+    return outcomes
 
 
 def get_analytics(db: Session) -> dict:
     """Get analytics for IT tickets"""
-    from sqlalchemy import func
-
     # Total tickets
     total = db.query(ITTicket).count()
 
@@ -7,10 +7,11 @@ from sqlalchemy.orm import Session
 from app.api.it_tickets import crud, schemas
 from app.api.auth.crud import log_contribution
 from app.api.auth.models import DepartmentEnum, UserRole
-from app.api.auth.utils import get_current_user
+from app.api.auth.utils import get_current_principal, get_current_user
 from app.core.dependencies import get_db_session
 from app.core.schema_operations import create_api_response
 from app.core.utils.request import get_request
+from app.utils.bulk_utils import summarize_outcomes
 
 router = APIRouter(prefix="/it-tickets", tags=["IT Tickets"])
 
@@ -59,7 +60,7 @@ async def get_tickets(
     priority: Optional[str] = None,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     """
     Get IT tickets with filters.
@@ -87,7 +88,7 @@ async def get_tickets(
 async def export_tickets_csv(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     """
     Export IT tickets data for CSV download.
@@ -111,7 +112,7 @@ async def export_tickets_csv(
 async def get_analytics(
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     """
     Get IT ticket analytics.
@@ -129,6 +130,78 @@ async def get_analytics(
     )
 
 
+@router.post(
+    "/bulk-assign",
+    summary="Bulk Assign IT Tickets",
+    tags=["IT Tickets"],
+)
+async def bulk_assign_tickets(
+    payload: schemas.ITTicketBulkAssignSchema,
+    db: Session = Depends(get_db_session),
+    request=Depends(get_request),
+    user=Depends(get_current_user),
+):
+    """
+    Assign many IT tickets to one staff member.
+    Managers and IT department employees can assign tickets.
+    """
+    if user.role != UserRole.MANAGER and user.department != DepartmentEnum.IT:
+        raise HTTPException(
+            status_code=403,
+            detail="Only managers and IT department employees can assign tickets",
+        )
+
+    summary = summarize_outcomes(
+        crud.bulk_assign_tickets(db, payload.ids, payload.assigned_to_id)
+    )
+    log_contribution(
+        db, user, "ASSIGNED", "it_ticket", f"{summary['succeeded']} tickets"
+    )
+    return create_api_response(
+        success=True,
+        message=f"{summary['succeeded']} of {len(payload.ids)} tickets assigned",
+        data=summary,
+    )
+
+
+@router.post(
+    "/bulk-status",
+    summary="Bulk Update IT Ticket Status",
+    tags=["IT Tickets"],
+)
+async def bulk_update_ticket_status(
+    payload: schemas.ITTicketBulkStatusSchema,
+    db: Session = Depends(get_db_session),
+    request=Depends(get_request),
+    user=Depends(get_current_user),
+):
+    """
+    Set the status of many IT tickets.
+    Managers and IT department employees can change ticket status in bulk.
+    """
+    if user.role != UserRole.MANAGER and user.department != DepartmentEnum.IT:
+        raise HTTPException(
+            status_code=403,
+            detail="Only managers and IT department employees can update tickets in bulk",
+        )
+
+    summary = summarize_outcomes(
+        crud.bulk_update_ticket_status(db, payload.ids, payload.status, user.id)
+    )
+    log_contribution(
+        db,
+        user,
+        "UPDATED",
+        "it_ticket",
+        f"{summary['succeeded']} tickets to {payload.status.value}",
+    )
+    return create_api_response(
+        success=True,
+        message=f"{summary['succeeded']} of {len(payload.ids)} tickets updated",
+        data=summary,
+    )
+
+
 @router.get(
     "/{id}",
     summary="Get IT Ticket",
@@ -138,7 +211,7 @@ async def get_ticket(
     id: UUID,
     db: Session = Depends(get_db_session),
     request=Depends(get_request),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
 ):
     """
     Get a specific IT ticket.
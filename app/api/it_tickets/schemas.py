@@ -10,7 +10,7 @@ from app.api.it_tickets.models import (
     TicketPriority,
     TicketStatus,
 )
-from app.core.schema_operations import BaseModel
+from app.core.schema_operations import BaseModel, BulkIdsSchema
 
 
 class ITTicketSchema(BaseModel):
@@ -103,3 +103,11 @@ class ITTicketResolveSchema(BaseModel):
 
 class ITTicketAssignSchema(BaseModel):
     assigned_to_id: UUID = Field(..., description="ID of IT staff to assign")
+
+
+class ITTicketBulkAssignSchema(BulkIdsSchema):
+    assigned_to_id: UUID = Field(..., description="ID of IT staff to assign")
+
+
+class ITTicketBulkStatusSchema(BulkIdsSchema):
+    status: TicketStatus = Field(..., description="New status for every ticket")
@@ -0,0 +1,277 @@
+import asyncio
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import FileResponse
+
+from app.api.auth.crud import require_manager
+from app.api.auth.utils import get_current_principal
+from app.core import metrics
+from app.core.admission import admission
+from app.core.config import settings
+from app.core.database.profiler import statement_profiler
+from app.core.loop_monitor import loop_watchdog
+from app.core.memory_profiler import memory_profiler
+from app.core.sampling_profiler import sampling_profiler
+from app.core.schema_operations import create_api_response
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
+@router.get(
+    "/monitoring/sql-stats",
+    summary="SQL Statement Statistics",
+    tags=["Monitoring"],
+)
+async def get_sql_stats(
+    sort: Literal["total_time", "mean_time", "max_time", "calls", "rows"] = "total_time",
+    limit: int = 50,
+    user=Depends(get_current_principal),
+):
+    require_manager(user)
+    return create_api_response(
+        success=True,
+        message="SQL statistics retrieved successfully",
+        data=statement_profiler.snapshot(sort=sort, limit=limit),
+    )
+
+
+@router.delete(
+    "/monitoring/sql-stats",
+    summary="Reset SQL Statement Statistics",
+    tags=["Monitoring"],
+)
+async def reset_sql_stats(user=Depends(get_current_principal)):
+    require_manager(user)
+    statement_profiler.reset()
+    return create_api_response(success=True, message="SQL statistics reset")
+
+
+@router.get(
+    "/monitoring/admission",
+    summary="Load Shedding State",
+    tags=["Monitoring"],
+)
+async def get_admission(user=Depends(get_current_principal)):
+    require_manager(user)
+    return create_api_response(
+        success=True,
+        message="Admission state retrieved successfully",
+        data=admission.status(),
+    )
+
+
+@router.get(
+    "/monitoring/loop-blocks",
+    summary="Top Event Loop Blocking Calls",
+    tags=["Monitoring"],
+)
+async def get_loop_blocks(
+    sort: Literal["total_time", "max_time", "count"] = "total_time",
+    limit: int = 50,
+    user=Depends(get_current_principal),
+):
+    require_manager(user)
+    return create_api_response(
+        success=True,
+        message="Event loop blocking calls retrieved successfully",
+        data=loop_watchdog.snapshot(sort=sort, limit=limit),
+    )
+
+
+@router.delete(
+    "/monitoring/loop-blocks",
+    summary="Reset Event Loop Blocking Calls",
+    tags=["Monitoring"],
+)
+async def reset_loop_blocks(user=Depends(get_current_principal)):
+    require_manager(user)
+    loop_watchdog.reset()
+    return create_api_response(success=True, message="Event loop blocking calls reset")
+
+
+@router.get(
+    "/monitoring/profiles",
+    summary="List Request Profiles",
+    tags=["Monitoring"],
+)
+async def list_profiles(user=Depends(get_current_principal)):
+    require_manager(user)
+    return create_api_response(
+        success=True,
+        message="Profiles retrieved successfully",
+        data=sampling_profiler.list(),
+    )
+
+
+@router.get(
+    "/monitoring/profiles/{profile_id}",
+    summary="Download Request Profile (folded stacks)",
+    tags=["Monitoring"],
+)
+async def download_profile(
+    profile_id: str,
+    kind: Literal["wall", "cpu"] = "wall",
+    user=Depends(get_current_principal),
+):
+    require_manager(user)
+    path = sampling_profiler.path(profile_id, kind)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=path.name)
+
+
+@router.get(
+    "/monitoring/memory",
+    summary="Memory Profiler Status",
+    tags=["Monitoring"],
+)
+async def get_memory_status(user=Depends(get_current_principal)):
+    require_manager(user)
+    return create_api_response(
+        success=True,
+        message="Memory status retrieved successfully",
+        data=memory_profiler.status(),
+    )
+
+
+@router.post(
+    "/monitoring/memory/tracing",
+    summary="Start tracemalloc",
+    tags=["Monitoring"],
+)
+async def start_memory_tracing(
+    frames: int = Query(settings.MEMORY_TRACE_FRAMES, ge=1, le=100),
+    user=Depends(get_current_principal),
+):
+    require_manager(user)
+    memory_profiler.start_tracing(frames)
+    return create_api_response(
+        success=True,
+        message="Memory tracing started",
+        data=memory_profiler.status(),
+    )
+
+
+@router.delete(
+    "/monitoring/memory/tracing",
+    summary="Stop tracemalloc",
+    tags=["Monitoring"],
+)
+async def stop_memory_tracing(user=Depends(get_current_principal)):
+    require_manager(user)
+    memory_profiler.stop_tracing()
+    return create_api_response(success=True, message="Memory tracing stopped")
+
+
+@router.get(
+    "/monitoring/memory/routes",
+    summary="Memory Growth by Route",
+    tags=["Monitoring"],
+)
+async def get_memory_routes(
+    sort: Literal[
+        "peak_growth_kb", "rss_growth_kb", "max_rss_growth_kb", "max_traced_peak_kb", "requests"
+    ] = "peak_growth_kb",
+    limit: int = 50,
+    top: int = 10,
+    user=Depends(get_current_principal),
+):
+    require_manager(user)
+    return create_api_response(
+        success=True,
+        message="Memory growth by route retrieved successfully",
+        data=memory_profiler.routes(sort=sort, limit=limit, top=top),
+    )
+
+
+@router.delete(
+    "/monitoring/memory/routes",
+    summary="Reset Memory Growth by Route",
+    tags=["Monitoring"],
+)
+async def reset_memory_routes(user=Depends(get_current_principal)):
+    require_manager(user)
+    memory_profiler.reset()
+    return create_api_response(success=True, message="Memory growth by route reset")
+
+
+@router.post(
+    "/monitoring/memory/snapshots",
+    summary="Take tracemalloc Snapshot",
+    tags=["Monitoring"],
+)
+async def take_memory_snapshot(user=Depends(get_current_principal)):
+    require_manager(user)
+    snapshot_id = await asyncio.to_thread(memory_profiler.take_snapshot)
+    if snapshot_id is None:
+        raise HTTPException(status_code=409, detail="Memory tracing is not running")
+    return create_api_response(
+        success=True,
+        message="Snapshot taken",
+        data={"id": snapshot_id},
+    )
+
+
+@router.delete(
+    "/monitoring/memory/snapshots",
+    summary="Discard tracemalloc Snapshots",
+    tags=["Monitoring"],
+)
+async def clear_memory_snapshots(user=Depends(get_current_principal)):
+    require_manager(user)
+    memory_profiler.clear_snapshots()
+    return create_api_response(success=True, message="Snapshots discarded")
+
+
+@router.get(
+    "/monitoring/memory/snapshots/{snapshot_id}",
+    summary="Top Allocators in a Snapshot",
+    tags=["Monitoring"],
+)
+async def get_memory_snapshot(
+    snapshot_id: int,
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+    limit: int = 50,
+    user=Depends(get_current_principal),
+):
+    require_manager(user)
+    data = await asyncio.to_thread(memory_profiler.top, snapshot_id, group_by, limit)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return create_api_response(
+        success=True,
+        message="Snapshot retrieved successfully",
+        data=data,
+    )
+
+
+@router.get(
+    "/monitoring/memory/diff",
+    summary="Diff Two tracemalloc Snapshots",
+    tags=["Monitoring"],
+)
+async def diff_memory_snapshots(
+    base: int,
+    target: int,
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+    limit: int = 50,
+    user=Depends(get_current_principal),
+):
+    require_manager(user)
+    data = await asyncio.to_thread(memory_profiler.diff, base, target, group_by, limit)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return create_api_response(
+        success=True,
+        message="Snapshot diff retrieved successfully",
+        data=data,
+    )
@@ -0,0 +1,211 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import suppress
+from typing import Optional
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import TimedQueuePool
+
+# Adaptive limits are multiplied by this while the pool wait is above target,
+# and grow by one per interval once it is below half the target
+DECREASE_FACTOR = 0.75
+
+
+class RouteClass:
+    __slots__ = (
+        "name",
+        "max_limit",
+        "max_queue",
+        "adaptive",
+        "limit",
+        "active",
+        "waiters",
+        "active_gauge",
+    )
+
+    def __init__(self, name: str, max_limit: int, max_queue: int, adaptive: bool):
+        self.name = name
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.adaptive = adaptive
+        self.limit = float(max_limit)
+        self.active = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        # Looked up once: the gauge moves twice per admitted request
+        self.active_gauge = metrics.ADMISSION_ACTIVE.labels(name)
+
+    def has_capacity(self) -> bool:
+        return self.active < max(1, int(self.limit))
+
+
+class AdmissionController:
+    """
+    Per-route-class concurrency limits with bounded queues, per worker.
+
+    A request runs at once while its class is under its limit, otherwise
+    waits in the class's queue (first come, first served) for up to
+    `queue_timeout` seconds. When the queue is full, or the wait times out,
+    it is shed: the caller gets a 503 with Retry-After right away instead of
+    queueing on the database pool behind everyone else.
+
+    Classes are separate, so a burst of exports only ever occupies the export
+    slots. The adaptive classes (analytics and exports by default) also give
+    way to the rest: every `adjust_interval` the mean time checkouts waited for
+    a pooled connection is compared with `target_pool_wait`, and their limits
+    shrink multiplicatively while it is above (down to one request) and grow
+    back by one while it is well below.
+    """
+
+    def __init__(
+        self,
+        classes: dict[str, tuple[int, int]],
+        routes: dict[str, str],
+        adaptive: list[str],
+        exempt_paths: list[str],
+        queue_timeout: float = 5,
+        target_pool_wait: float = 0.02,
+        adjust_interval: float = 1,
+        retry_after: int = 2,
+    ):
+        self.classes = {
+            name: RouteClass(name, limit, queue, name in adaptive)
+            for name, (limit, queue) in classes.items()
+        }
+        self.routes = routes
+        self.exempt_paths = tuple(exempt_paths)
+        self.queue_timeout = queue_timeout
+        self.target_pool_wait = target_pool_wait
+        self.adjust_interval = adjust_interval
+        self.retry_after = retry_after
+
+        self._wait_total = 0.0
+        self._wait_count = 0
+        self._wait_lock = threading.Lock()
+        self._adjusted = time.monotonic()
+        self.last_pool_wait = 0.0
+        for route_class in self.classes.values():
+            metrics.ADMISSION_LIMIT.labels(route_class.name).set(route_class.max_limit)
+
+    def classify(self, path: str) -> Optional[RouteClass]:
+        """The route class for a request path (relative to root_path); None if exempt."""
+        if path.startswith(self.exempt_paths):
+            return None
+        for pattern, name in self.routes.items():
+            if pattern in path:
+                return self.classes.get(name)
+        return self.classes.get("interactive")
+
+    def record_pool_wait(self, seconds: float):
+        """TimedQueuePool listener; called from any thread."""
+        with self._wait_lock:
+            self._wait_total += seconds
+            self._wait_count += 1
+
+    async def acquire(self, route_class: RouteClass) -> bool:
+        """Takes a slot in `route_class`; False when the request should be shed."""
+        self._maybe_adjust()
+        if route_class.has_capacity() and not route_class.waiters:
+            self._admit(route_class)
+            return True
+        if len(route_class.waiters) >= route_class.max_queue:
+            metrics.ADMISSION_SHED.labels(route_class.name, "queue_full").inc()
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        route_class.waiters.append(waiter)
+        queued = metrics.ADMISSION_QUEUED.labels(route_class.name)
+        queued.inc()
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter
+        except TimeoutError:
+            pass  # unless the slot was granted as the timeout fired, see below
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(route_class)  # granted just as the client went away
+            raise
+        finally:
+            queued.dec()
+            # asyncio.timeout cancels the future itself, so "not granted" is
+            # cancelled or still pending; either way it must leave the queue
+            if waiter.cancelled() or not waiter.done():
+                waiter.cancel()
+                with suppress(ValueError):  # already popped by _wake
+                    route_class.waiters.remove(waiter)
+        if waiter.cancelled():
+            metrics.ADMISSION_SHED.labels(route_class.name, "timeout").inc()
+            return False
+        metrics.ADMISSION_WAIT.labels(route_class.name).observe(time.perf_counter() - started)
+        return True
+
+    def release(self, route_class: RouteClass):
+        route_class.active -= 1
+        route_class.active_gauge.dec()
+        self._wake(route_class)
+
+    def _admit(self, route_class: RouteClass):
+        route_class.active += 1
+        route_class.active_gauge.inc()
+
+    def _wake(self, route_class: RouteClass):
+        # The slot passes straight to the waiter, so a new arrival cannot take it first
+        while route_class.waiters and route_class.has_capacity():
+            waiter = route_class.waiters.popleft()
+            if not waiter.done():
+                self._admit(route_class)
+                waiter.set_result(None)
+
+    def _maybe_adjust(self):
+        now = time.monotonic()
+        if now - self._adjusted < self.adjust_interval:
+            return
+        self._adjusted = now
+        with self._wait_lock:
+            total, count = self._wait_total, self._wait_count
+            self._wait_total, self._wait_count = 0.0, 0
+        self.last_pool_wait = total / count if count else 0.0
+
+        for route_class in self.classes.values():
+            if not route_class.adaptive:
+                continue
+            if self.last_pool_wait > self.target_pool_wait:
+                route_class.limit = max(1.0, route_class.limit * DECREASE_FACTOR)
+            elif self.last_pool_wait < self.target_pool_wait / 2:
+                route_class.limit = min(float(route_class.max_limit), route_class.limit + 1)
+                self._wake(route_class)
+            metrics.ADMISSION_LIMIT.labels(route_class.name).set(int(route_class.limit))
+
+    def status(self) -> dict:
+        return {
+            "pool_wait_ms": round(self.last_pool_wait * 1000, 2),
+            "target_pool_wait_ms": round(self.target_pool_wait * 1000, 2),
+            "classes": [
+                {
+                    "name": route_class.name,
+                    "adaptive": route_class.adaptive,
+                    "limit": max(1, int(route_class.limit)),
+                    "max_limit": route_class.max_limit,
+                    "active": route_class.active,
+                    "queued": len(route_class.waiters),
+                    "max_queue": route_class.max_queue,
+                }
+                for route_class in self.classes.values()
+            ],
+        }
+
+
+admission = AdmissionController(
+    classes=settings.LOAD_SHEDDING_CLASSES,
+    routes=settings.LOAD_SHEDDING_ROUTES,
+    adaptive=settings.LOAD_SHEDDING_ADAPTIVE_CLASSES,
+    exempt_paths=settings.LOAD_SHEDDING_EXEMPT_PATHS,
+    queue_timeout=settings.LOAD_SHEDDING_QUEUE_TIMEOUT_SECONDS,
+    target_pool_wait=settings.LOAD_SHEDDING_TARGET_POOL_WAIT_SECONDS,
+    adjust_interval=settings.LOAD_SHEDDING_ADJUST_INTERVAL_SECONDS,
+    retry_after=settings.LOAD_SHEDDING_RETRY_AFTER_SECONDS,
+)
+TimedQueuePool.wait_listeners.append(admission.record_pool_wait)
@@ -0,0 +1,113 @@
+import logging
+import threading
+from collections import deque
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import insert
+
+from app.core.database import sessionmanager
+
+logger = logging.getLogger("tse.batch_writer")
+
+
+class BatchWriter:
+    """
+    Buffers rows in memory and inserts them in batches from a background thread,
+    so request handlers never wait on these writes.
+
+    The buffer is a ring: when it is full the oldest rows are dropped (and
+    counted) instead of blocking the caller.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_size: int = 10000,
+        prepare: Optional[Callable[[list[dict]], list[dict]]] = None,
+    ):
+        self.name = name
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.prepare = prepare
+
+        self._buffer: deque[dict] = deque(maxlen=max_size)
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+    def put(self, row: dict):
+        self.put_many([row])
+
+    def put_many(self, rows: Iterable[dict]):
+        with self._condition:
+            for row in rows:
+                if len(self._buffer) == self._buffer.maxlen:
+                    self.dropped += 1
+                self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._condition.notify()
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"batch-writer-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stops the writer thread after writing whatever is still buffered."""
+        if self._thread is None:
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def flush(self):
+        """Writes every buffered row in the calling thread."""
+        while self._write_batch():
+            pass
+
+    def _take_batch(self) -> list[dict]:
+        with self._condition:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _write_batch(self) -> int:
+        rows = self._take_batch()
+        if not rows:
+            return 0
+        try:
+            if self.prepare is not None:
+                rows = self.prepare(rows)
+            with sessionmanager.connect() as connection:
+                connection.execute(insert(self.model), rows)
+            self.written += len(rows)
+        except Exception:
+            self.failed += len(rows)
+            logger.exception("Batch writer %s failed to insert %d rows", self.name, len(rows))
+        return len(rows)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._stopping and len(self._buffer) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
@@ -0,0 +1,103 @@
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # optional, "br" is simply not offered
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional, "zstd" is simply not offered
+    zstandard = None
+
+from app.core.config import settings
+
+
+class GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(
+            settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(
+            level=settings.COMPRESSION_ZSTD_LEVEL
+        ).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Server preference, used to break ties between equal q-values
+ENCODERS = {
+    name: encoder
+    for name, encoder, available in (
+        ("zstd", ZstdEncoder, zstandard is not None),
+        ("br", BrotliEncoder, brotli is not None),
+        ("gzip", GzipEncoder, True),
+    )
+    if available
+}
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Picks the encoding with the highest q-value that we support."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name] = q
+
+    best, best_q = None, 0.0
+    for name in ENCODERS:
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    return any(
+        content_type.startswith(allowed) for allowed in settings.COMPRESSION_CONTENT_TYPES
+    )
@@ -24,8 +24,136 @@ class Settings(BaseSettings):
     ROOT_PATH: str = "/backend"
     SECRET_KEY: str = secrets.token_urlsafe(32)
 
-    LIMITER_TIMES: int = 9999
-    LIMITER_SECONDS: int = 9999
+    # Token-bucket rate limit per user (per IP before login): bursts of up to
+    # LIMITER_TIMES requests, refilled at LIMITER_TIMES per LIMITER_SECONDS.
+    # Overrides are keyed by route prefix as [times, seconds] and get their own
+    # bucket; times 0 exempts the prefix. "postgres" shares buckets between workers
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal["memory", "postgres"] = "memory"
+    LIMITER_TIMES: int = 600
+    LIMITER_SECONDS: int = 60
+    RATE_LIMIT_OVERRIDES: dict[str, tuple[int, float]] = {
+        "/hazard-observations/analytics": (30, 60),
+        "/it-tickets/analytics": (30, 60),
+        "/metrics": (0, 0),
+    }
+
+    # Seconds until the response must start; overrides are keyed by path prefix
+    # (e.g. {"/files": 300}) and 0 disables the timeout for that prefix
+    REQUEST_TIMEOUT_SECONDS: float = 60
+    REQUEST_TIMEOUT_OVERRIDES: dict[str, float] = {}
+
+    # Load shedding: requests are admitted per route class (first matching path
+    # substring in LOAD_SHEDDING_ROUTES, else "interactive") up to a concurrency
+    # limit, with a bounded queue ([concurrency, queue] per worker). A full queue, or
+    # LOAD_SHEDDING_QUEUE_TIMEOUT_SECONDS spent in it, gets a 503 with Retry-After.
+    # Adaptive classes shrink while the mean DB pool wait is above the target and
+    # grow back once it is well below, leaving the pool to interactive requests
+    LOAD_SHEDDING_ENABLED: bool = True
+    LOAD_SHEDDING_CLASSES: dict[str, tuple[int, int]] = {
+        "interactive": (12, 100),
+        "auth": (4, 50),
+        "analytics": (3, 10),
+        "export": (2, 4),
+    }
+    LOAD_SHEDDING_ROUTES: dict[str, str] = {
+        "/auth/login": "auth",
+        "/auth/refresh": "auth",
+        "/analytics/": "analytics",
+        "/export/": "export",
+    }
+    LOAD_SHEDDING_ADAPTIVE_CLASSES: list[str] = ["analytics", "export"]
+    LOAD_SHEDDING_EXEMPT_PATHS: list[str] = [
+        "/metrics",
+        "/monitoring",
+        "/docs",
+        "/redoc",
+        "/openapi.json",
+    ]
+    LOAD_SHEDDING_QUEUE_TIMEOUT_SECONDS: float = 5
+    LOAD_SHEDDING_TARGET_POOL_WAIT_SECONDS: float = 0.02
+    LOAD_SHEDDING_ADJUST_INTERVAL_SECONDS: float = 1
+    LOAD_SHEDDING_RETRY_AFTER_SECONDS: int = 2
+
+    # Response compression, negotiated from Accept-Encoding (zstd > br > gzip
+    # when equally acceptable; br/zstd only if their packages are installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_CONTENT_TYPES: list[str] = [
+        "application/json",
+        "application/javascript",
+        "application/xml",
+        "image/svg+xml",
+        "text/",
+    ]
+
+    # Prometheus metrics at /metrics. With several workers, point
+    # METRICS_MULTIPROC_DIR at a directory that is emptied before the server starts
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: str = ""
+
+    # Event-loop lag: a heartbeat every LOOP_LAG_INTERVAL_SECONDS feeds
+    # tse_event_loop_lag_seconds whenever metrics are on. The watchdog beats every
+    # LOOP_WATCHDOG_INTERVAL_SECONDS instead, and one that waits longer than the
+    # threshold captures the blocking stack and route (GET /monitoring/loop-blocks).
+    # Diagnostic, off by default
+    LOOP_LAG_INTERVAL_SECONDS: float = 0.25
+    LOOP_WATCHDOG_ENABLED: bool = False
+    LOOP_WATCHDOG_INTERVAL_SECONDS: float = 0.05
+    LOOP_BLOCK_THRESHOLD_SECONDS: float = 0.1
+    LOOP_BLOCK_MAX_SITES: int = 500
+
+    # Per-request accounting: a Server-Timing header (auth/db/serialize/storage),
+    # X-DB-Query-Count/X-DB-Time when DEBUG_HEADERS_ENABLED, and a log entry with
+    # statement fingerprints for requests slower than the threshold (0 disables).
+    # The headers are diagnostic and off by default
+    SERVER_TIMING_ENABLED: bool = False
+    DEBUG_HEADERS_ENABLED: bool = False
+    SLOW_REQUEST_THRESHOLD_SECONDS: float = 1.0
+
+    # In-app statement statistics per fingerprint (GET /monitoring/sql-stats).
+    # Slow SELECTs are sampled for EXPLAIN (ANALYZE, BUFFERS), and CTEs for a plain
+    # EXPLAIN, at most once per fingerprint per interval. When SQL_PROFILER_DUMP_PATH
+    # is set (may contain {pid}), the stats are dumped there on exit. Diagnostic,
+    # off by default
+    SQL_PROFILER_ENABLED: bool = False
+    SQL_PROFILER_MAX_FINGERPRINTS: int = 2000
+    SQL_PROFILER_EXPLAIN_THRESHOLD_SECONDS: float = 0.5
+    SQL_PROFILER_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SQL_PROFILER_EXPLAIN_INTERVAL_SECONDS: float = 300
+    SQL_PROFILER_DUMP_PATH: str = ""
+
+    # Per-request sampling profiler: managers opt in with an `X-Profile: 1` header or
+    # `?_profile=1`, and PROFILER_SAMPLE_RATE profiles a random fraction of requests.
+    # Folded-stack output goes to PROFILER_DIR (GET /monitoring/profiles)
+    PROFILER_ENABLED: bool = False
+    PROFILER_SAMPLE_RATE: float = 0.0
+    PROFILER_INTERVAL_SECONDS: float = 0.005
+    PROFILER_MAX_CONCURRENT: int = 2
+    PROFILER_MAX_PROFILES: int = 200
+    PROFILER_DIR: str = "profiles"
+
+    # Memory profiling (GET /monitoring/memory). Snapshots and diffs work at any
+    # time; MEMORY_PROFILER_ENABLED adds per-request bookkeeping (RSS and peak-RSS
+    # growth per route, two /proc reads per request). tracemalloc only runs between
+    # POST/DELETE /monitoring/memory/tracing, or from startup with
+    # MEMORY_TRACE_ON_STARTUP, and then with the profiler enabled
+    # MEMORY_ROUTE_SAMPLE_RATE of the requests are diffed to find each route's
+    # top allocators
+    MEMORY_PROFILER_ENABLED: bool = False
+    MEMORY_TRACE_ON_STARTUP: bool = False
+    MEMORY_TRACE_FRAMES: int = 10
+    MEMORY_ROUTE_SAMPLE_RATE: float = 0.01
+    MEMORY_MAX_SNAPSHOTS: int = 5
+
+    # N+1 detector for development: flags statements repeated with the same shape
+    # QUERY_DETECTOR_THRESHOLD times in one request, and lazy relationship loads
+    QUERY_DETECTOR_MODE: Literal["off", "log", "raise"] = "off"
+    QUERY_DETECTOR_THRESHOLD: int = 5
+    QUERY_DETECTOR_LAZY_LOADS: bool = True
 
     LOCAL_UPLOAD_DIR: str = "/uploads"
 
@@ -33,6 +161,35 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # bcrypt runs in a pool of PASSWORD_HASH_WORKERS processes per worker (os_crypt
+    # holds the GIL). Logins and password changes beyond PASSWORD_HASH_MAX_QUEUE
+    # waiting get a 503. Changing the rounds rehashes each password at next login
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Authenticated users cached per token (skips the JWT decode and the users
+    # lookup). Updates and deletes invalidate the worker that made them at once;
+    # other workers may serve the old snapshot for up to the TTL. 0 disables
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    # Tokens carry role/department claims and the user's token_version; each
+    # worker reloads the versions of the users it has seen this often to refuse
+    # claims made stale by a role or department change (or a deleted user)
+    TOKEN_VERSION_REFRESH_SECONDS: float = 30
+    # Login issues a refresh token as well; POST /auth/refresh rotates it (a reused
+    # one revokes its whole session). Logged-out access tokens go to revoked_tokens,
+    # which each worker mirrors in a bloom filter, reloaded in the background every
+    # REVOCATION_REFRESH_SECONDS and rebuilt (pruning expired rows) every
+    # REVOCATION_REBUILD_SECONDS
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    REVOCATION_REFRESH_SECONDS: float = 5
+    REVOCATION_REBUILD_SECONDS: float = 600
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+
+    # "memory" swaps MinIO for an in-process stand-in (benchmarks, budget checks)
+    S3_BACKEND: Literal["minio", "memory"] = "minio"
     S3_ENDPOINT_URL: str = "tse-minio:9000"
     S3_ACCESS_KEY: str = "12345678"
     S3_SECRET_ACCESS_KEY: str = "password"
@@ -42,6 +199,35 @@ class Settings(BaseSettings):
     IMGPROXY_KEY: str = "736563726574"
     IMGPROXY_SALT: str = "68656C6C6F"
 
+    # Soft-delete purge: rows deleted longer ago than the retention period are
+    # moved to `archived_records` in small batches, at most PURGE_MAX_BATCHES_PER_TABLE
+    # per table and run, only inside the quiet window
+    PURGE_RETENTION_DAYS: int = 90
+    PURGE_BATCH_SIZE: int = 500
+    PURGE_BATCH_PAUSE_SECONDS: float = 0.5
+    PURGE_MAX_BATCHES_PER_TABLE: int = 200
+    PURGE_INTERVAL_SECONDS: int = 0  # 0 disables the in-app scheduler
+    PURGE_WINDOW_START_HOUR: int = 22
+    PURGE_WINDOW_END_HOUR: int = 5
+
+    # Contribution log: "transaction" writes the entry in the request's own commit,
+    # "background" queues it (after the commit succeeds) to a batched writer
+    CONTRIBUTION_LOG_MODE: Literal["transaction", "background"] = "transaction"
+    CONTRIBUTION_LOG_BATCH_SIZE: int = 200
+    CONTRIBUTION_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+    CONTRIBUTION_LOG_BUFFER_SIZE: int = 10000
+
+    # Request/response capture into `user_logs`: sampled in the middleware and
+    # inserted in batches by a background thread. 5xx responses use their own rate
+    REQUEST_LOG_ENABLED: bool = False
+    REQUEST_LOG_SAMPLE_RATE: float = 0.05
+    REQUEST_LOG_ERROR_SAMPLE_RATE: float = 1.0
+    REQUEST_LOG_MAX_BODY_BYTES: int = 8192
+    REQUEST_LOG_BATCH_SIZE: int = 200
+    REQUEST_LOG_FLUSH_INTERVAL_SECONDS: float = 2.0
+    REQUEST_LOG_BUFFER_SIZE: int = 2000
+    REQUEST_LOG_EXCLUDE_PATHS: list[str] = ["/docs", "/redoc", "/openapi.json"]
+
     APP_CORS_ORIGINS: Annotated[list[AnyUrl] | str, BeforeValidator(parse_cors)] = []
 
     APP_NAME: str = "TSE"
@@ -1,6 +1,7 @@
 import contextlib
+import time
 import uuid
-from typing import Any, Iterator
+from typing import Any, Callable, Iterator
 
 from sqlalchemy import (
     JSON,
@@ -9,7 +10,9 @@ from sqlalchemy import (
     Column,
     Connection,
     DateTime,
+    Float,
     String,
+    Table,
     create_engine,
     event,
     func,
@@ -17,15 +20,35 @@ from sqlalchemy import (
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
 from app.utils.model_bases.audit_base import CreateMixin, SoftDeleteMixin, UpdateMixin
 from app.utils.models_utils import to_jsonable_dict
 
 
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that reports how long each checkout took, waiting for a free
+    connection or opening a new one, to every callable in `wait_listeners`
+    (load shedding, metrics). Class level: dispose() replaces the pool instance.
+    """
+
+    wait_listeners: list[Callable[[float], None]] = []
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            for listener in self.wait_listeners:
+                listener(waited)
+
+
 class DatabaseSessionManager:
     def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
-        self._engine = create_engine(host, **engine_kwargs)
+        self._engine = create_engine(host, poolclass=TimedQueuePool, **engine_kwargs)
         self._sessionmaker = sessionmaker(
             autocommit=False, bind=self._engine, autoflush=True
         )
@@ -88,6 +111,28 @@ class DataChange(Base):
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class ArchivedRecord(Base):
+    __tablename__ = "archived_records"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    table_name = Column(String, nullable=False, index=True)
+    row_id = Column(String, nullable=False)
+    data = Column(JSON, nullable=False)  # full row as it was when purged
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# Shared rate limiter state (RATE_LIMIT_BACKEND=postgres): one theoretical
+# arrival time per bucket, see app.core.rate_limiter
+rate_limit_buckets = Table(
+    "rate_limit_buckets",
+    DeclarativeBase.metadata,
+    Column("key", String, primary_key=True),
+    Column("tat", Float, nullable=False),
+)
+
+
 def track_changes(session, flush_context):
     # INSERT
     for obj in session.new:
@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database.statements import fingerprint
+
+logger = logging.getLogger("tse.sql_profiler")
+
+# Row-locking SELECTs are explained without ANALYZE, which would take the locks
+LOCKING_CLAUSES = (" FOR UPDATE", " FOR NO KEY UPDATE", " FOR SHARE", " FOR KEY SHARE")
+
+
+class StatementProfiler:
+    """
+    Aggregates calls, total/max time and rows per statement fingerprint from
+    engine events, a lightweight stand-in for pg_stat_statements.
+
+    Statements slower than `explain_threshold` are occasionally re-run as
+    EXPLAIN (ANALYZE, BUFFERS) on a separate connection by a background thread.
+    ANALYZE executes the statement, so it is only used for plain SELECTs; CTEs
+    (which may modify data) and locking SELECTs get a plain EXPLAIN.
+    """
+
+    def __init__(
+        self,
+        max_fingerprints: int = 2000,
+        explain_threshold: float = 0.5,
+        explain_sample_rate: float = 0.1,
+        explain_interval: float = 300.0,
+    ):
+        self.max_fingerprints = max_fingerprints
+        self.explain_threshold = explain_threshold
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_interval = explain_interval
+
+        self._stats: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._explain_queue: queue.Queue = queue.Queue(maxsize=20)
+        self._explain_thread: Optional[threading.Thread] = None
+        self._engine = None
+
+        self.started_at = datetime.now(timezone.utc)
+        self.dropped = 0
+
+    def instrument(self, engine):
+        self._engine = engine
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["profiler_started"].pop()
+        self.record(statement, duration, max(cursor.rowcount, 0))
+
+        if (
+            duration >= self.explain_threshold
+            and not executemany
+            and random.random() < self.explain_sample_rate
+        ):
+            self._queue_explain(statement, parameters, duration)
+
+    def _handle_error(self, exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("profiler_started"):
+            connection.info["profiler_started"].pop()
+
+    def record(self, statement: str, duration: float, rows: int):
+        key = fingerprint(statement)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    self.dropped += 1
+                    return
+                stats = self._stats[key] = {
+                    "fingerprint": key,
+                    "calls": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                    "rows": 0,
+                    "explain": None,
+                    "explained_at": 0.0,
+                }
+            stats["calls"] += 1
+            stats["total_time"] += duration
+            stats["rows"] += rows
+            if duration > stats["max_time"]:
+                stats["max_time"] = duration
+
+    def _queue_explain(self, statement: str, parameters, duration: float):
+        normalized = statement.lstrip().upper()
+        if not normalized.startswith(("SELECT", "WITH")):
+            return
+        analyze = normalized.startswith("SELECT") and not any(
+            clause in normalized for clause in LOCKING_CLAUSES
+        )
+
+        key = fingerprint(statement)
+        with self._lock:
+            stats = self._stats.get(key)
+            now = time.monotonic()
+            if stats is None or now - stats["explained_at"] < self.explain_interval:
+                return
+            stats["explained_at"] = now
+
+        try:
+            self._explain_queue.put_nowait((key, statement, parameters, duration, analyze))
+        except queue.Full:
+            return
+        self._ensure_explain_thread()
+
+    def _ensure_explain_thread(self):
+        if self._explain_thread is None or not self._explain_thread.is_alive():
+            self._explain_thread = threading.Thread(
+                target=self._run_explains, name="sql-profiler-explain", daemon=True
+            )
+            self._explain_thread.start()
+
+    def _run_explains(self):
+        while True:
+            key, statement, parameters, duration, analyze = self._explain_queue.get()
+            try:
+                plan = self._explain(statement, parameters, analyze)
+            except Exception:
+                logger.exception("EXPLAIN failed for %s", key)
+                continue
+            with self._lock:
+                if key in self._stats:
+                    self._stats[key]["explain"] = {
+                        "captured_at": datetime.now(timezone.utc).isoformat(),
+                        "duration": duration,
+                        "analyzed": analyze,
+                        "plan": plan,
+                    }
+
+    def _explain(self, statement: str, parameters, analyze: bool):
+        # Raw DBAPI connection, so the EXPLAIN itself bypasses the engine events
+        connection = self._engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SET LOCAL statement_timeout = '30s'")
+            options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+            cursor.execute(f"EXPLAIN ({options}) " + statement, parameters)
+            plan = cursor.fetchone()[0]
+            cursor.close()
+            return plan
+        finally:
+            connection.rollback()
+            connection.close()
+
+    def snapshot(self, sort: str = "total_time", limit: Optional[int] = None) -> dict:
+        with self._lock:
+            statements = [
+                {
+                    "fingerprint": stats["fingerprint"],
+                    "calls": stats["calls"],
+                    "total_time": stats["total_time"],
+                    "mean_time": stats["total_time"] / stats["calls"],
+                    "max_time": stats["max_time"],
+                    "rows": stats["rows"],
+                    "explain": stats["explain"],
+                }
+                for stats in self._stats.values()
+            ]
+        statements.sort(key=lambda item: item[sort], reverse=True)
+        return {
+            "pid": os.getpid(),
+            "since": self.started_at.isoformat(),
+            "fingerprints": len(statements),
+            "dropped": self.dropped,
+            "statements": statements[:limit] if limit else statements,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.dropped = 0
+            self.started_at = datetime.now(timezone.utc)
+
+    def dump(self, path: str):
+        path = path.format(pid=os.getpid())
+        with open(path, "w") as file:
+            json.dump(self.snapshot(), file, indent=2, default=str)
+        return path
+
+
+statement_profiler = StatementProfiler(
+    max_fingerprints=settings.SQL_PROFILER_MAX_FINGERPRINTS,
+    explain_threshold=settings.SQL_PROFILER_EXPLAIN_THRESHOLD_SECONDS,
+    explain_sample_rate=settings.SQL_PROFILER_EXPLAIN_SAMPLE_RATE,
+    explain_interval=settings.SQL_PROFILER_EXPLAIN_INTERVAL_SECONDS,
+)
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import ArchivedRecord, Base, sessionmanager
+
+logger = logging.getLogger("tse.purge")
+
+
+def get_purge_models():
+    """Soft-deletable models whose deleted rows are moved out of the hot tables."""
+    from app.core import models  # noqa: F401  (registers every FK in the metadata)
+    from app.api.contacts.models import Contact
+    from app.api.facilities.models import Facility
+    from app.api.inventory.models import Inventory
+
+    return [Inventory, Contact, Facility]
+
+
+def in_purge_window(now: Optional[datetime] = None) -> bool:
+    """Whether the current local hour falls inside the configured quiet window."""
+    hour = (now or datetime.now()).hour
+    start, end = settings.PURGE_WINDOW_START_HOUR, settings.PURGE_WINDOW_END_HOUR
+    if start == end:
+        return True
+    if start < end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def _not_referenced_clauses(table) -> list[str]:
+    """
+    Rows that are still referenced by a foreign key (even from a soft-deleted row)
+    cannot be removed physically, so they are held back until the referrer goes.
+    """
+    clauses = []
+    for other in Base.metadata.sorted_tables:
+        for fk in other.foreign_keys:
+            if fk.column.table is not table:
+                continue
+            clauses.append(
+                f"NOT EXISTS (SELECT 1 FROM {other.name} AS r "
+                f"WHERE r.{fk.parent.name} = t.{fk.column.name})"
+            )
+    return clauses
+
+
+def _purge_conditions(table) -> str:
+    return " AND ".join(
+        ["t.is_deleted", "t.deleted_at < :cutoff", *_not_referenced_clauses(table)]
+    )
+
+
+def purge_batch(table, cutoff: datetime, batch_size: int) -> int:
+    """
+    Moves one batch of purgeable rows into `archived_records` in a single statement.
+    Rows locked by live transactions are skipped and picked up by a later batch.
+    """
+    statement = text(
+        f"""
+        WITH batch AS (
+            SELECT t.id FROM {table.name} AS t
+            WHERE {_purge_conditions(table)}
+            ORDER BY t.deleted_at
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        ), moved AS (
+            DELETE FROM {table.name} AS t USING batch
+            WHERE t.id = batch.id
+            RETURNING t.*
+        )
+        INSERT INTO {ArchivedRecord.__tablename__}
+            (id, table_name, row_id, data, deleted_at, archived_at, is_deleted)
+        SELECT gen_random_uuid(), :table_name, moved.id::text, to_json(moved),
+               moved.deleted_at, now(), false
+        FROM moved
+        """
+    )
+
+    with sessionmanager.connect() as connection:
+        connection.execute(text("SET LOCAL lock_timeout = '2s'"))
+        result = connection.execute(
+            statement,
+            {"cutoff": cutoff, "batch_size": batch_size, "table_name": table.name},
+        )
+        return result.rowcount or 0
+
+
+def count_remaining(table, cutoff: datetime) -> int:
+    """Rows past retention still in the hot table (referenced, locked or over budget)."""
+    statement = text(
+        f"SELECT count(*) FROM {table.name} AS t "
+        "WHERE t.is_deleted AND t.deleted_at < :cutoff"
+    )
+    with sessionmanager.connect() as connection:
+        return connection.execute(statement, {"cutoff": cutoff}).scalar_one()
+
+
+def purge_soft_deleted(
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+    max_batches: Optional[int] = None,
+) -> dict:
+    """
+    Archives soft-deleted rows older than the retention period, table by table,
+    pausing between batches so the job never holds locks for long. Each table
+    gets its own `max_batches` budget, so a large backlog in one table cannot
+    starve the ones after it.
+    Returns a report of what was moved and what is still waiting.
+    """
+    retention_days = retention_days if retention_days is not None else settings.PURGE_RETENTION_DAYS
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    pause_seconds = pause_seconds if pause_seconds is not None else settings.PURGE_BATCH_PAUSE_SECONDS
+    max_batches = max_batches or settings.PURGE_MAX_BATCHES_PER_TABLE
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    started = time.perf_counter()
+    report = {"cutoff": cutoff.isoformat(), "tables": {}}
+    batches = 0
+
+    for model in get_purge_models():
+        table = model.__table__
+        moved = 0
+        for _ in range(max_batches):
+            count = purge_batch(table, cutoff, batch_size)
+            batches += 1
+            moved += count
+            if count < batch_size:
+                break
+            time.sleep(pause_seconds)
+
+        report["tables"][table.name] = {
+            "moved": moved,
+            "remaining": count_remaining(table, cutoff),
+        }
+
+    report["batches"] = batches
+    report["duration_seconds"] = round(time.perf_counter() - started, 3)
+    logger.info("Soft-delete purge finished: %s", report)
+    return report
+
+
+async def run_purge_scheduler():
+    """
+    Periodically runs the purge inside the quiet window. Safe to run on every
+    worker at once: SKIP LOCKED keeps concurrent runs from touching the same rows.
+    """
+    while True:
+        await asyncio.sleep(settings.PURGE_INTERVAL_SECONDS)
+        if not in_purge_window():
+            continue
+        try:
+            await asyncio.to_thread(purge_soft_deleted)
+        except Exception:
+            logger.exception("Soft-delete purge failed")
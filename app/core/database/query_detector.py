@@ -0,0 +1,112 @@
+import logging
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Literal, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.database.statements import fingerprint
+
+logger = logging.getLogger("tse.query_detector")
+logger.setLevel(logging.WARNING)
+
+APP_ROOT = Path(__file__).resolve().parents[2]
+_INTERNAL_DIRS = (APP_ROOT / "core" / "database",)
+_INTERNAL_FILES = (APP_ROOT / "core" / "middlewares.py", APP_ROOT / "core" / "metrics.py")
+
+
+class NPlusOneError(Exception):
+    """Raised in "raise" mode when a repeated statement or lazy load is detected."""
+
+
+class DetectorState:
+    """Statement shapes and findings for one request (or one `detect_queries` block)."""
+
+    def __init__(self, mode: Literal["log", "raise"], threshold: int, lazy_loads: bool):
+        self.mode = mode
+        self.threshold = threshold
+        self.lazy_loads = lazy_loads
+        self.counts: Counter[str] = Counter()
+        self.findings: list[dict] = []
+
+    def flag(self, kind: str, detail: str):
+        finding = {"kind": kind, "detail": detail, "call_site": call_site()}
+        if finding in self.findings:
+            return
+        self.findings.append(finding)
+        message = f"{kind}: {detail} at {finding['call_site']}"
+        if self.mode == "raise":
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+
+_state: ContextVar[Optional[DetectorState]] = ContextVar("query_detector", default=None)
+
+
+def call_site() -> str:
+    """Innermost application frame outside the database plumbing."""
+    for frame in reversed(traceback.extract_stack()):
+        path = Path(frame.filename).resolve()
+        if APP_ROOT not in path.parents or path == Path(__file__).resolve():
+            continue
+        if path in _INTERNAL_FILES or any(root in path.parents for root in _INTERNAL_DIRS):
+            continue
+        return f"{path.relative_to(APP_ROOT.parent)}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+@contextmanager
+def detect_queries(
+    mode: Literal["log", "raise"] = "raise", threshold: int = 5, lazy_loads: bool = True
+):
+    """
+    Flags statements repeated `threshold` times with the same shape, and lazy
+    relationship loads, for everything executed inside the block:
+
+        with detect_queries("raise") as state:
+            await asgi_request(app, "GET", "/it-tickets/...")
+        assert not state.findings
+
+    Blocks nest: an inner block (e.g. the per-request one) reuses the outer state.
+    """
+    state = _state.get()
+    if state is not None:
+        yield state
+        return
+
+    state = DetectorState(mode, threshold, lazy_loads)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def install(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_statement(conn, cursor, statement, parameters, context, executemany):
+        state = _state.get()
+        if state is None:
+            return
+        key = fingerprint(statement)
+        state.counts[key] += 1
+        if state.counts[key] == state.threshold:
+            state.flag("repeated statement", f"{state.threshold}x {key}")
+
+    @event.listens_for(Session, "do_orm_execute")
+    def _flag_lazy_load(orm_execute_state):
+        state = _state.get()
+        if state is None or not state.lazy_loads or not orm_execute_state.is_select:
+            return
+        loaded_from = orm_execute_state.lazy_loaded_from
+        if loaded_from is not None:
+            target = orm_execute_state.bind_mapper
+            state.flag(
+                "lazy load",
+                f"{target.class_.__name__ if target else 'related rows'} "
+                f"lazy-loaded from {loaded_from.mapper.class_.__name__}",
+            )
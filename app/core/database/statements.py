@@ -0,0 +1,24 @@
+import re
+from functools import lru_cache
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)+\s*\)")
+_VALUES_ROWS = re.compile(r"(VALUES \(\?\+?\))(?:\s*,\s*\(\?\+?\))+", re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Normalizes a SQL statement so that executions differing only in literal
+    values, bound parameters or IN-list length share one fingerprint.
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _STRING.sub("?", statement)
+    statement = _PARAMETER.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = _VALUE_LIST.sub("(?+)", statement)
+    statement = _VALUES_ROWS.sub(r"\1, ...", statement)
+    return statement
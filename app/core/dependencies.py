@@ -1,21 +1,52 @@
 from uuid import UUID
 
+from app.core import request_context
 from app.core.config import settings
 from app.core.database import sessionmanager
+from app.core.principal_cache import principal_cache
 from app.core.security import oauth2_scheme
+from app.core.token_revocation import revocation_list
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 
 def get_db_session_base():
+    # One unit of work per request: CRUD functions only flush, the commit
+    # happens here once the handler has finished without raising
     with sessionmanager.session() as session:
         yield session
+        session.commit()
 
-async def get_current_user_id(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db_session_base),
-) -> UUID:
+async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> UUID:
+    with request_context.timed("auth"):
+        await ensure_not_revoked(token)
+        principal = principal_cache.peek(token)
+        if principal is not None:
+            return principal.id
+        return _decode_user_id(token)
+
+
+def revoked_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token has been revoked, please log in again",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def ensure_not_revoked(token: str):
+    """Raises 401 for a token revoked by logout (see token_revocation)."""
+    if await revocation_list.is_revoked(token):
+        raise revoked_exception()
+
+
+def _decode_user_id(token: str) -> UUID:
+    return UUID(decode_token(token)["sub"])
+
+
+def decode_token(token: str) -> dict:
+    """Verified JWT claims; raises 401 when the token is invalid, expired or has no subject."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -38,10 +69,11 @@ async def get_current_user_id(
     except JWTError:
         raise credentials_exception
 
-    return UUID(user_id)
+    return payload
 
 
 def get_db_session(user_id=Depends(get_current_user_id)):
   with sessionmanager.session() as session:
     session.info["user_id"] = user_id
-    yield session
\ No newline at end of file
+    yield session
+    session.commit()
\ No newline at end of file
@@ -11,14 +11,18 @@ async def custom_starlette_http_exception_handler(
 ):
     logging.error(exc.detail)
     return JSONResponse(
-        status_code=exc.status_code, content={"success": False, "message": exc.detail}
+        status_code=exc.status_code,
+        content={"success": False, "message": exc.detail},
+        headers=getattr(exc, "headers", None),  # WWW-Authenticate, Retry-After
     )
 
 
 async def custom_http_exception_handler(request: Request, exc: HTTPException):
     logging.error(exc.detail)
     return JSONResponse(
-        status_code=exc.status_code, content={"success": False, "message": exc.detail}
+        status_code=exc.status_code,
+        content={"success": False, "message": exc.detail},
+        headers=getattr(exc, "headers", None),  # WWW-Authenticate, Retry-After
     )
 
 
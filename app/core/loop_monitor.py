@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from app.core import metrics, request_context
+from app.core.config import settings
+
+logger = logging.getLogger("tse.loop_monitor")
+logger.setLevel(logging.WARNING)
+
+_APP_DIR = str(Path(__file__).resolve().parent.parent) + "/"
+_SELF = str(Path(__file__).resolve())
+
+# Innermost frames kept in a call site's example stack
+EXAMPLE_STACK_DEPTH = 25
+
+
+def _label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_APP_DIR):
+        filename = "app/" + filename[len(_APP_DIR) :]
+    else:
+        for marker in ("/site-packages/", "/lib/python3"):
+            index = filename.rfind(marker)
+            if index != -1:
+                filename = filename[index + 1 :]
+                break
+    return f"{code.co_name} ({filename}:{frame.f_lineno})"
+
+
+class LoopWatchdog:
+    """
+    Measures event-loop lag from a background thread and catches blocking calls.
+
+    Every `interval` seconds the thread schedules a heartbeat on the loop and
+    records how long it took to run (tse_event_loop_lag_seconds). A heartbeat
+    that has not run after `threshold` seconds means something is holding the
+    loop: the loop thread's stack is captured right then and attributed to the
+    route of the task that was running, and the block's full duration is added
+    once the heartbeat finally runs. With `capture_blocks` off only the lag is
+    measured.
+
+    Blocks are aggregated per (route, innermost app frame, innermost frame),
+    so a sync DB call in a handler and bcrypt in login show up as separate sites.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        threshold: float = 0.1,
+        max_sites: int = 500,
+        capture_blocks: bool = True,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_sites = max_sites
+        self.capture_blocks = capture_blocks
+
+        self._sites: dict[tuple[str, str, str], dict] = {}
+        self._lock = threading.Lock()
+        self._beat = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop = None
+        self._loop_thread: Optional[int] = None
+
+        self.started_at = datetime.now(timezone.utc)
+        self.dropped = 0
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._beat.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _heartbeat(self):
+        self._beat.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._beat.clear()
+            posted = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(self._heartbeat)
+            except RuntimeError:  # loop closed
+                return
+
+            blocked = None
+            if not self.capture_blocks:
+                self._beat.wait()
+            elif not self._beat.wait(self.threshold):
+                blocked = self._capture()
+                self._beat.wait()
+            lag = time.perf_counter() - posted
+            metrics.EVENT_LOOP_LAG.observe(lag)
+            if blocked is not None:
+                self._record(*blocked, lag)
+
+            self._stopped.wait(self.interval)
+
+    def _capture(self) -> Optional[tuple[str, str, str, list[str]]]:
+        """
+        (route, app frame, blocking frame, stack) while the loop is still
+        blocked: frame line numbers change as soon as it moves on, so the
+        labels are built here rather than once the heartbeat has run.
+        """
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+        leaf = _label(frame)
+        app_site = None
+        stack = []
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if app_site is None and filename.startswith(_APP_DIR) and filename != _SELF:
+                app_site = _label(frame)
+            if len(stack) < EXAMPLE_STACK_DEPTH:
+                stack.append(_label(frame))
+            frame = frame.f_back
+
+        task = asyncio.current_task(self._loop)
+        context = task.get_context().get(request_context._current, None) if task else None
+        route = context.route if context is not None else "(no request)"
+        return route, app_site or "(outside app code)", leaf, stack
+
+    def _record(self, route: str, app_site: str, leaf: str, stack: list[str], duration: float):
+        metrics.record_loop_block(route, duration)
+        logger.warning("Event loop blocked %.3fs in %s at %s -> %s", duration, route, app_site, leaf)
+
+        key = (route, app_site, leaf)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                if len(self._sites) >= self.max_sites:
+                    self.dropped += 1
+                    return
+                site = self._sites[key] = {
+                    "route": route,
+                    "app_frame": app_site,
+                    "blocking_frame": leaf,
+                    "count": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                    "stack": stack,
+                    "last_seen": None,
+                }
+            site["count"] += 1
+            site["total_time"] += duration
+            site["last_seen"] = datetime.now(timezone.utc).isoformat()
+            if duration > site["max_time"]:
+                site["max_time"] = duration
+                site["stack"] = stack
+
+    def snapshot(self, sort: str = "total_time", limit: Optional[int] = None) -> dict:
+        with self._lock:
+            sites = [dict(site) for site in self._sites.values()]
+        sites.sort(key=lambda site: site[sort], reverse=True)
+        return {
+            "since": self.started_at.isoformat(),
+            "threshold": self.threshold,
+            "sites": len(sites),
+            "dropped": self.dropped,
+            "blocking_calls": sites[:limit] if limit else sites,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._sites.clear()
+            self.dropped = 0
+            self.started_at = datetime.now(timezone.utc)
+
+
+loop_watchdog = LoopWatchdog(
+    interval=(
+        settings.LOOP_WATCHDOG_INTERVAL_SECONDS
+        if settings.LOOP_WATCHDOG_ENABLED
+        else settings.LOOP_LAG_INTERVAL_SECONDS
+    ),
+    threshold=settings.LOOP_BLOCK_THRESHOLD_SECONDS,
+    max_sites=settings.LOOP_BLOCK_MAX_SITES,
+    capture_blocks=settings.LOOP_WATCHDOG_ENABLED,
+)
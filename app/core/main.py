@@ -1,25 +1,32 @@
 import asyncio
 import logging
 import sys
-import time
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 import uvicorn
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api.attendance import routes as attendance_routes
 from app.api.auth import routes as auth_routes
+from app.api.auth.crud import contribution_writer
+from app.api.auth.utils import run_token_version_refresher
 from app.api.contacts import routes as contacts_routes
 from app.api.facilities import routes as facilities_routes
 from app.api.files import routes as files_routes
 from app.api.hazard_observations import routes as hazard_observations_routes
 from app.api.inventory import routes as inventory_routes
 from app.api.it_tickets import routes as it_tickets_routes
+from app.api.monitoring import routes as monitoring_routes
+from app.core import metrics, request_context
 from app.core.config import settings
+from app.core.database import query_detector, sessionmanager
+from app.core.database.profiler import statement_profiler
+from app.core.database.purge import run_purge_scheduler
 from app.core.error_handlers import (
     custom_exception_handler,
     custom_http_exception_handler,
@@ -28,8 +35,19 @@ from app.core.error_handlers import (
     # validation_exception_handler
     sqlalchemy_exception_handler,
 )
-from app.core.middlewares import CustomHeaderMiddleware, TimeoutMiddleware
+from app.core.middlewares import (
+    CompressionMiddleware,
+    RequestLogMiddleware,
+    RequestPipelineMiddleware,
+)
+from app.core.loop_monitor import loop_watchdog
+from app.core.memory_profiler import memory_profiler
+from app.core.password_pool import password_pool
+from app.core.rate_limiter import rate_limit
 from app.core.models import *  # noqa: F401, F403
+from app.core.request_log import request_log_writer
+from app.core.responses import TimedJSONResponse
+from app.core.token_revocation import run_revocation_refresher
 
 load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
 
@@ -60,16 +78,68 @@ def async_exception_handler(loop, context):
 asyncio.get_event_loop().set_exception_handler(async_exception_handler)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background_tasks = []
+    if settings.METRICS_ENABLED or settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start(asyncio.get_running_loop())
+    if settings.MEMORY_TRACE_ON_STARTUP:
+        memory_profiler.start_tracing(settings.MEMORY_TRACE_FRAMES)
+    password_pool.start()
+    if settings.PURGE_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_purge_scheduler()))
+    background_tasks.append(asyncio.create_task(run_revocation_refresher()))
+    background_tasks.append(asyncio.create_task(run_token_version_refresher()))
+    if settings.CONTRIBUTION_LOG_MODE == "background":
+        contribution_writer.start()
+    if settings.REQUEST_LOG_ENABLED:
+        request_log_writer.start()
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    loop_watchdog.stop()
+    await asyncio.to_thread(contribution_writer.stop)
+    await asyncio.to_thread(request_log_writer.stop)
+    await asyncio.to_thread(password_pool.stop)
+    metrics.mark_process_dead()
+    if settings.SQL_PROFILER_ENABLED and settings.SQL_PROFILER_DUMP_PATH:
+        try:
+            statement_profiler.dump(settings.SQL_PROFILER_DUMP_PATH)
+        except OSError:
+            logger.exception("Could not write SQL statistics dump")
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     root_path=settings.ROOT_PATH,
-    redirect_slashes=False
+    redirect_slashes=False,
+    default_response_class=TimedJSONResponse,
+    lifespan=lifespan,
+    dependencies=[Depends(rate_limit)] if settings.RATE_LIMIT_ENABLED else [],
 )
 
 
-# app.add_middleware(GZipMiddleware, minimum_size=1000)  # Compress responses larger than 1000 bytes
-app.add_middleware(CustomHeaderMiddleware)
-app.add_middleware(TimeoutMiddleware, timeout=999)
+request_context.instrument_engine(
+    sessionmanager._engine, metrics.record_query if settings.METRICS_ENABLED else None
+)
+if settings.METRICS_ENABLED:
+    metrics.instrument_engine(sessionmanager._engine)
+query_detector.install(sessionmanager._engine)
+if settings.SQL_PROFILER_ENABLED:
+    statement_profiler.instrument(sessionmanager._engine)
+
+app.add_middleware(RequestPipelineMiddleware)
+if settings.REQUEST_LOG_ENABLED:
+    app.add_middleware(
+        RequestLogMiddleware, max_body_bytes=settings.REQUEST_LOG_MAX_BODY_BYTES
+    )
+# Outside the request log so captured bodies are stored uncompressed
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
 
 
 # app.add_middleware(HTTPSRedirectMiddleware)
@@ -90,15 +160,6 @@ app.add_middleware(
 # app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.perf_counter()
-    response = await call_next(request)
-    process_time = time.perf_counter() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
-
 app.add_exception_handler(HTTPException, custom_http_exception_handler)  # type: ignore
 app.add_exception_handler(500, custom_exception_handler)  # type: ignore
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)  # type: ignore
@@ -114,6 +175,7 @@ app.include_router(attendance_routes.router)
 app.include_router(hazard_observations_routes.router)
 app.include_router(contacts_routes.router)
 app.include_router(it_tickets_routes.router)
+app.include_router(monitoring_routes.router)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,312 @@
+import asyncio
+import itertools
+import logging
+import os
+import random
+import resource
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger("tse.memory_profiler")
+
+# Allocations made by the profiler itself or by the import machinery
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+# Allocation sites kept per route for the sampled request diffs
+MAX_SITES_PER_ROUTE = 200
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size in bytes; None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as file:
+            return int(file.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def peak_rss() -> int:
+    """High-water mark of the resident set size in bytes (ru_maxrss is KiB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _filename(filename: str) -> str:
+    for marker in ("/site-packages/", "/lib/python3", "/app/"):
+        index = filename.rfind(marker)
+        if index != -1:
+            return filename[index + 1 :]
+    return filename
+
+
+def _location(frame) -> str:
+    return f"{_filename(frame.filename)}:{frame.lineno}"
+
+
+def _statistic(stat, group_by: str) -> dict:
+    frame = stat.traceback[0]
+    entry = {
+        "location": _filename(frame.filename) if group_by == "filename" else _location(frame),
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count,
+    }
+    if hasattr(stat, "size_diff"):
+        entry["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+        entry["count_diff"] = stat.count_diff
+    if group_by == "traceback":
+        entry["traceback"] = [_location(item) for item in reversed(stat.traceback)]
+    return entry
+
+
+class RequestMemory:
+    __slots__ = ("context", "rss", "peak", "baseline", "traced")
+
+    def __init__(self, context, rss: Optional[int], peak: int):
+        self.context = context
+        self.rss = rss
+        self.peak = peak
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.traced = 0
+
+
+class MemoryProfiler:
+    """
+    tracemalloc snapshots and per-route memory growth, for finding leaks and
+    requests that build large results in memory.
+
+    Every request records how much the process RSS and its high-water mark
+    grew while it ran. Peak growth is what matters for the container's memory
+    limit: a route that keeps raising it (an export materializing every row,
+    say) shows up here even when the memory is freed afterwards. With several
+    requests in flight the growth is shared between them, so look at totals
+    over many requests rather than a single one.
+
+    While tracemalloc is tracing, `sample_rate` of the requests (one at a time)
+    are bracketed by snapshots: the positive differences by line, memory still
+    held after the response, are added to their route's top allocators, and the
+    traced peak above the starting point shows how much the request allocated
+    at once. Snapshots taken through the admin API are
+    kept in memory (the newest `max_snapshots`) and can be diffed against each
+    other to confirm that something keeps growing. Everything is per worker.
+    """
+
+    def __init__(self, sample_rate: float = 0.01, max_snapshots: int = 5):
+        self.sample_rate = sample_rate
+        self.max_snapshots = max_snapshots
+
+        self._routes: dict[str, dict] = {}
+        self._allocators: dict[str, Counter] = {}
+        self._snapshots: dict[int, tuple[datetime, tracemalloc.Snapshot]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._sampling = False
+        self.started_at = datetime.now(timezone.utc)
+
+    # Tracing
+
+    def start_tracing(self, frames: int):
+        if tracemalloc.is_tracing():
+            return
+        tracemalloc.start(frames)
+        logger.warning("tracemalloc started with %d frames", frames)
+
+    def stop_tracing(self):
+        tracemalloc.stop()
+
+    def status(self) -> dict:
+        tracing = tracemalloc.is_tracing()
+        traced, traced_peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = [
+                {
+                    "id": snapshot_id,
+                    "taken_at": taken_at.isoformat(),
+                    "traces": len(snapshot.traces),
+                }
+                for snapshot_id, (taken_at, snapshot) in self._snapshots.items()
+            ]
+        return {
+            "tracing": tracing,
+            "traceback_limit": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_kb": round(traced / 1024, 1),
+            "traced_peak_kb": round(traced_peak / 1024, 1),
+            "tracemalloc_overhead_kb": round(tracemalloc.get_tracemalloc_memory() / 1024, 1),
+            "rss_kb": round((current_rss() or 0) / 1024, 1),
+            "peak_rss_kb": round(peak_rss() / 1024, 1),
+            "snapshots": snapshots,
+        }
+
+    # Snapshots
+
+    def take_snapshot(self) -> Optional[int]:
+        """Stores a filtered snapshot and returns its id; None when not tracing."""
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        with self._lock:
+            snapshot_id = next(self._ids)
+            self._snapshots[snapshot_id] = (datetime.now(timezone.utc), snapshot)
+            while len(self._snapshots) > self.max_snapshots:
+                del self._snapshots[min(self._snapshots)]
+        return snapshot_id
+
+    def _snapshot(self, snapshot_id: int) -> Optional[tracemalloc.Snapshot]:
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+        return entry[1] if entry else None
+
+    def top(self, snapshot_id: int, group_by: str = "lineno", limit: int = 50) -> Optional[dict]:
+        snapshot = self._snapshot(snapshot_id)
+        if snapshot is None:
+            return None
+        stats = snapshot.statistics(group_by)
+        return {
+            "id": snapshot_id,
+            "total_kb": round(sum(stat.size for stat in stats) / 1024, 1),
+            "allocators": [_statistic(stat, group_by) for stat in stats[:limit]],
+        }
+
+    def diff(
+        self, base_id: int, target_id: int, group_by: str = "lineno", limit: int = 50
+    ) -> Optional[dict]:
+        """Allocation changes from `base_id` to `target_id`, largest growth first."""
+        base, target = self._snapshot(base_id), self._snapshot(target_id)
+        if base is None or target is None:
+            return None
+        stats = target.compare_to(base, group_by)
+        return {
+            "base": base_id,
+            "target": target_id,
+            "size_diff_kb": round(sum(stat.size_diff for stat in stats) / 1024, 1),
+            "allocators": [_statistic(stat, group_by) for stat in stats[:limit]],
+        }
+
+    def clear_snapshots(self):
+        with self._lock:
+            self._snapshots.clear()
+
+    # Per-request tracking
+
+    async def begin(self, context) -> RequestMemory:
+        request = RequestMemory(context, current_rss(), peak_rss())
+        if (
+            self.sample_rate
+            and tracemalloc.is_tracing()
+            and not self._sampling
+            and random.random() < self.sample_rate
+        ):
+            self._sampling = True
+            try:
+                request.baseline = await asyncio.to_thread(tracemalloc.take_snapshot)
+                tracemalloc.reset_peak()
+                request.traced = tracemalloc.get_traced_memory()[0]
+            except BaseException:
+                self._sampling = False
+                raise
+        return request
+
+    async def end(self, request: RequestMemory):
+        route = request.context.route
+        rss = current_rss()
+        rss_growth = rss - request.rss if rss is not None and request.rss is not None else 0
+        peak_growth = peak_rss() - request.peak
+        if peak_growth > 0:
+            metrics.record_peak_rss_growth(route, peak_growth)
+
+        with self._lock:
+            stats = self._routes.setdefault(
+                route,
+                {
+                    "requests": 0,
+                    "sampled": 0,
+                    "max_traced_peak_kb": 0.0,
+                    "rss_growth_kb": 0.0,
+                    "max_rss_growth_kb": 0.0,
+                    "peak_raises": 0,
+                    "peak_growth_kb": 0.0,
+                },
+            )
+            stats["requests"] += 1
+            stats["rss_growth_kb"] += rss_growth / 1024
+            stats["max_rss_growth_kb"] = max(stats["max_rss_growth_kb"], rss_growth / 1024)
+            if peak_growth > 0:
+                stats["peak_raises"] += 1
+                stats["peak_growth_kb"] += peak_growth / 1024
+
+        if request.baseline is not None:
+            try:
+                if tracemalloc.is_tracing():
+                    traced_peak = tracemalloc.get_traced_memory()[1] - request.traced
+                    after = await asyncio.to_thread(tracemalloc.take_snapshot)
+                    self._add_allocators(route, request.baseline, after, traced_peak)
+            finally:
+                request.baseline = None
+                self._sampling = False
+
+    def _add_allocators(self, route: str, before, after, traced_peak: int):
+        growth = [
+            stat
+            for stat in after.filter_traces(_SNAPSHOT_FILTERS).compare_to(
+                before.filter_traces(_SNAPSHOT_FILTERS), "lineno"
+            )
+            if stat.size_diff > 0
+        ]
+        with self._lock:
+            sites = self._allocators.setdefault(route, Counter())
+            for stat in growth:
+                sites[_location(stat.traceback[0])] += stat.size_diff
+            if len(sites) > MAX_SITES_PER_ROUTE:
+                self._allocators[route] = Counter(dict(sites.most_common(MAX_SITES_PER_ROUTE)))
+            stats = self._routes[route]
+            stats["sampled"] += 1
+            stats["max_traced_peak_kb"] = max(stats["max_traced_peak_kb"], traced_peak / 1024)
+
+    def routes(
+        self, sort: str = "peak_growth_kb", limit: Optional[int] = None, top: int = 10
+    ) -> dict:
+        routes = []
+        with self._lock:
+            for route, stats in self._routes.items():
+                entry = {"route": route}
+                for key, value in stats.items():
+                    entry[key] = round(value, 1) if isinstance(value, float) else value
+                entry["mean_rss_growth_kb"] = round(stats["rss_growth_kb"] / stats["requests"], 1)
+                entry["top_allocators"] = [
+                    {"location": location, "size_kb": round(size / 1024, 1)}
+                    for location, size in self._allocators.get(route, Counter()).most_common(top)
+                ]
+                routes.append(entry)
+        routes.sort(key=lambda entry: entry[sort], reverse=True)
+        return {
+            "since": self.started_at.isoformat(),
+            "tracing": tracemalloc.is_tracing(),
+            "routes": routes[:limit] if limit else routes,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._allocators.clear()
+            self.started_at = datetime.now(timezone.utc)
+
+
+memory_profiler = MemoryProfiler(
+    sample_rate=settings.MEMORY_ROUTE_SAMPLE_RATE,
+    max_snapshots=settings.MEMORY_MAX_SNAPSHOTS,
+)
@@ -0,0 +1,112 @@
+import hashlib
+import mimetypes
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from urllib.parse import quote
+
+from minio.error import S3Error
+
+
+@dataclass
+class StoredObject:
+    bucket_name: str
+    object_name: str
+    data: bytes
+    content_type: str
+    etag: str
+    last_modified: datetime
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+class MemoryResponse:
+    """Mimics the urllib3 response returned by Minio.get_object."""
+
+    def __init__(self, stored: StoredObject):
+        self.data = stored.data
+        self.headers = {"Content-Type": stored.content_type, "ETag": stored.etag}
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self.data if amt is None else self.data[:amt]
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+class MemoryObjectStorage:
+    """
+    In-process stand-in for the subset of the Minio client this app uses, for
+    benchmarks and budget checks that run without a MinIO server
+    (S3_BACKEND="memory"). Presigned URLs are fake but stable.
+    """
+
+    def __init__(self):
+        self._buckets: dict[str, dict[str, StoredObject]] = {}
+        self._lock = threading.Lock()
+
+    def bucket_exists(self, bucket_name: str) -> bool:
+        return bucket_name in self._buckets
+
+    def make_bucket(self, bucket_name: str):
+        self._buckets.setdefault(bucket_name, {})
+
+    def put_bytes(self, bucket_name: str, object_name: str, data: bytes, content_type=None):
+        stored = StoredObject(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            data=data,
+            content_type=content_type
+            or mimetypes.guess_type(object_name)[0]
+            or "application/octet-stream",
+            etag=hashlib.md5(data).hexdigest(),
+            last_modified=datetime.now(timezone.utc),
+        )
+        with self._lock:
+            self._buckets.setdefault(bucket_name, {})[object_name] = stored
+        return stored
+
+    def fput_object(self, bucket_name: str, object_name: str, file_path: str, content_type=None):
+        with open(file_path, "rb") as file:
+            return self.put_bytes(bucket_name, object_name, file.read(), content_type)
+
+    def presigned_put_object(self, bucket_name: str, object_name: str, expires=timedelta(days=7)):
+        return self._url(bucket_name, object_name, "PUT", expires)
+
+    def presigned_get_object(
+        self, bucket_name: str, object_name: str, expires=timedelta(days=7), response_headers=None
+    ):
+        return self._url(bucket_name, object_name, "GET", expires)
+
+    def stat_object(self, bucket_name: str, object_name: str) -> StoredObject:
+        return self._get(bucket_name, object_name)
+
+    def get_object(self, bucket_name: str, object_name: str) -> MemoryResponse:
+        return MemoryResponse(self._get(bucket_name, object_name))
+
+    def _get(self, bucket_name: str, object_name: str) -> StoredObject:
+        stored = self._buckets.get(bucket_name, {}).get(object_name)
+        if stored is None:
+            raise S3Error(
+                "NoSuchKey",
+                "Object does not exist",
+                f"/{bucket_name}/{object_name}",
+                "memory",
+                "memory",
+                None,
+                bucket_name=bucket_name,
+                object_name=object_name,
+            )
+        return stored
+
+    def _url(self, bucket_name: str, object_name: str, method: str, expires: timedelta) -> str:
+        return (
+            f"memory://{bucket_name}/{quote(object_name)}"
+            f"?method={method}&expires={int(expires.total_seconds())}"
+        )
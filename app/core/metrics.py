@@ -0,0 +1,271 @@
+import functools
+import os
+import time
+
+from app.core.config import settings
+
+# prometheus_client picks its storage backend at import time, so the
+# multiprocess directory has to be in the environment before it is imported
+if settings.METRICS_MULTIPROC_DIR:
+    os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.METRICS_MULTIPROC_DIR)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event  # noqa: E402
+
+from app.core import request_context  # noqa: E402
+
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+HTTP_REQUESTS = Counter(
+    "tse_http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "tse_http_request_duration_seconds",
+    "Time until the response body has been fully sent",
+    ["method", "route"],
+)
+HTTP_IN_FLIGHT = Gauge(
+    "tse_http_requests_in_flight",
+    "Requests currently being handled",
+    multiprocess_mode="livesum",
+)
+
+DB_QUERIES = Counter(
+    "tse_db_queries_total",
+    "SQL statements executed, by the route that issued them",
+    ["route"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "tse_db_query_duration_seconds",
+    "SQL statement execution time, by the route that issued them",
+    ["route"],
+    buckets=DB_BUCKETS,
+)
+DB_POOL_SIZE = Gauge(
+    "tse_db_pool_size", "Configured connection pool size", multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "tse_db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "tse_db_pool_overflow",
+    "Connections open beyond the pool size",
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "tse_db_pool_wait_seconds",
+    "Time a checkout waited for a pooled connection (or opened a new one)",
+    buckets=DB_BUCKETS,
+)
+
+CACHE_REQUESTS = Counter(
+    "tse_cache_requests_total",
+    "Cache lookups by cache name and result (hit/miss)",
+    ["cache", "result"],
+)
+
+STORAGE_LATENCY = Histogram(
+    "tse_object_storage_duration_seconds",
+    "Object storage (MinIO) call latency",
+    ["operation", "outcome"],
+    buckets=DB_BUCKETS,
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "tse_event_loop_lag_seconds",
+    "Delay between when a loop callback was due and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+EVENT_LOOP_BLOCKS = Histogram(
+    "tse_event_loop_block_duration_seconds",
+    "Event loop stalls past LOOP_BLOCK_THRESHOLD_SECONDS, by the route that was running",
+    ["route"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUEST_PEAK_RSS_GROWTH = Counter(
+    "tse_request_peak_rss_growth_bytes_total",
+    "Growth of the worker's peak RSS while requests of the route were in flight",
+    ["route"],
+)
+PASSWORD_HASH_QUEUE = Gauge(
+    "tse_password_hash_queue_depth",
+    "bcrypt operations submitted to the hashing pool and not yet finished",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_WAIT = Histogram(
+    "tse_password_hash_wait_seconds",
+    "Time bcrypt operations waited for a hashing pool process",
+    ["operation"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "tse_password_hash_duration_seconds",
+    "Time a hashing pool process spent on one bcrypt operation",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1, 2.5),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "tse_password_hash_rejected_total",
+    "bcrypt operations refused because the hashing pool queue was full",
+    ["operation"],
+)
+
+TOKEN_REVOCATION_LOOKUPS = Counter(
+    "tse_token_revocation_lookups_total",
+    "Bloom filter matches confirmed against revoked_tokens (revoked/false_positive)",
+    ["result"],
+)
+
+RATE_LIMITED = Counter(
+    "tse_rate_limited_total",
+    "Requests refused with 429 by the rate limiter, by route",
+    ["route"],
+)
+
+ADMISSION_ACTIVE = Gauge(
+    "tse_admission_active",
+    "Admitted requests still running, by route class",
+    ["route_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUED = Gauge(
+    "tse_admission_queued",
+    "Requests waiting for admission, by route class",
+    ["route_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_LIMIT = Gauge(
+    "tse_admission_limit",
+    "Current concurrency limit, by route class (summed over workers)",
+    ["route_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_WAIT = Histogram(
+    "tse_admission_wait_seconds",
+    "Time admitted requests waited in their route class queue",
+    ["route_class"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+ADMISSION_SHED = Counter(
+    "tse_admission_shed_total",
+    "Requests refused with 503 by load shedding (queue_full/timeout)",
+    ["route_class", "reason"],
+)
+
+
+def render() -> tuple[bytes, str]:
+    """Prometheus text exposition, aggregated over all workers if multiprocess."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    """Drops this worker's live gauges from the multiprocess aggregate."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+# (method, route template, status) -> (counter, histogram) children; labels()
+# is the costliest part of recording a request, and the key space is bounded
+_request_series: dict[tuple[str, str, int], tuple] = {}
+
+
+def record_request(method: str, route: str, status: int, duration: float):
+    series = _request_series.get((method, route, status))
+    if series is None:
+        series = _request_series[(method, route, status)] = (
+            HTTP_REQUESTS.labels(method, route, str(status)),
+            HTTP_LATENCY.labels(method, route),
+        )
+    series[0].inc()
+    series[1].observe(duration)
+
+
+def record_loop_block(route: str, duration: float):
+    EVENT_LOOP_BLOCKS.labels(route).observe(duration)
+
+
+def record_peak_rss_growth(route: str, growth: int):
+    REQUEST_PEAK_RSS_GROWTH.labels(route).inc(growth)
+
+
+def record_password_hash(operation: str, wait: float, duration: float):
+    PASSWORD_HASH_WAIT.labels(operation).observe(wait)
+    PASSWORD_HASH_DURATION.labels(operation).observe(duration)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_revocation_lookup(revoked: bool):
+    TOKEN_REVOCATION_LOOKUPS.labels("revoked" if revoked else "false_positive").inc()
+
+
+def record_rate_limited(route: str):
+    RATE_LIMITED.labels(route).inc()
+
+
+def timed_storage_call(operation: str):
+    """Decorator recording the latency and outcome of an object storage call."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = func(*args, **kwargs)
+                outcome = "ok" if result is not None else "error"
+                return result
+            finally:
+                duration = time.perf_counter() - started
+                STORAGE_LATENCY.labels(operation, outcome).observe(duration)
+                request_context.add_time("storage", duration)
+
+        return wrapper
+
+    return decorator
+
+
+def record_query(route: str, duration: float):
+    """request_context.instrument_engine callback, once per statement."""
+    DB_QUERIES.labels(route).inc()
+    DB_QUERY_LATENCY.labels(route).observe(duration)
+
+
+def instrument_engine(engine):
+    """Pool occupancy and checkout waits from engine events."""
+
+    def _update_pool_gauges(*args):
+        pool = engine.pool
+        if hasattr(pool, "checkedout"):
+            DB_POOL_SIZE.set(pool.size())
+            DB_POOL_CHECKED_OUT.set(pool.checkedout())
+            DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    for name in ("connect", "checkout", "checkin", "close"):
+        event.listen(engine, name, _update_pool_gauges)
+    _update_pool_gauges()
+
+    wait_listeners = getattr(type(engine.pool), "wait_listeners", None)
+    if wait_listeners is not None and DB_POOL_WAIT.observe not in wait_listeners:
+        wait_listeners.append(DB_POOL_WAIT.observe)
+
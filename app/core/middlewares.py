@@ -1,24 +1,336 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request, HTTPException
 import asyncio
+import logging
+import time
+from contextlib import nullcontext
 
+from starlette.datastructures import MutableHeaders
 
-class TimeoutMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, timeout: int):
-        super().__init__(app)
-        self.timeout = timeout
+from app.core import compression, metrics, request_context, request_log
+from app.core.admission import admission
+from app.core.config import settings
+from app.core.database import query_detector
+from app.core.database.statements import fingerprint
+from app.core.memory_profiler import memory_profiler
+from app.core.sampling_profiler import sampling_profiler
+
+slow_request_logger = logging.getLogger("tse.slow_requests")
+slow_request_logger.setLevel(logging.WARNING)
+
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+]
+
+TIMEOUT_BODY = b'{"success":false,"message":"Request timed out"}'
+SHED_BODY = b'{"success":false,"message":"Server is busy, please retry shortly"}'
+
+
+def route_path(scope) -> str:
+    """Request path relative to the app's root_path, as routes see it."""
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        return path[len(root_path) :] or "/"
+    return path
+
+
+def timeout_for(path: str) -> float:
+    """Longest matching prefix in REQUEST_TIMEOUT_OVERRIDES, else the default."""
+    best, timeout = -1, settings.REQUEST_TIMEOUT_SECONDS
+    for prefix, value in settings.REQUEST_TIMEOUT_OVERRIDES.items():
+        if path.startswith(prefix) and len(prefix) > best:
+            best, timeout = len(prefix), value
+    return timeout
+
+
+async def send_json(send, status: int, body: bytes, headers: tuple = ()):
+    """Sends a complete JSON response produced by the middleware itself."""
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def timing_headers(context: request_context.RequestContext, elapsed: float) -> list:
+    headers = []
+    if settings.SERVER_TIMING_ENABLED:
+        phases = [
+            ("auth", context.timings.get("auth", 0.0)),
+            ("db", context.db_time),
+            ("serialize", context.timings.get("serialize", 0.0)),
+            ("storage", context.timings.get("storage", 0.0)),
+            ("total", elapsed),
+        ]
+        value = ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in phases)
+        headers.append((b"server-timing", value.encode()))
+    if settings.DEBUG_HEADERS_ENABLED:
+        headers.append((b"x-db-query-count", str(context.db_queries).encode()))
+        headers.append((b"x-db-time", f"{context.db_time:.6f}".encode()))
+    return headers
+
+
+def log_slow_request(
+    context: request_context.RequestContext, method: str, status_code: int, duration: float
+):
+    """Logs a slow request with its statements grouped by fingerprint, slowest first."""
+    grouped: dict[str, list] = {}
+    for statement, seconds in context.statements:
+        entry = grouped.setdefault(fingerprint(statement), [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    statements = "\n".join(
+        f"  {count}x {seconds * 1000:.1f}ms  {text}"
+        for text, (count, seconds) in sorted(
+            grouped.items(), key=lambda item: item[1][1], reverse=True
+        )
+    )
+    slow_request_logger.warning(
+        "Slow request %s %s -> %s in %.3fs (%d queries, %.3fs in db, timings %s)\n%s",
+        method,
+        context.route,
+        status_code,
+        duration,
+        context.db_queries,
+        context.db_time,
+        {phase: round(seconds, 4) for phase, seconds in context.timings.items()},
+        statements,
+    )
+
+
+class RequestPipelineMiddleware:
+    """
+    Security headers, load shedding, request timeout, X-Process-Time, the
+    request context and request metrics in a single pure ASGI layer, so
+    responses (including streaming ones) pass through untouched.
+
+    Admission (see admission.py) happens before the timeout starts and the slot
+    is held until the response has been sent. The timeout covers the time until
+    the response starts; once headers are sent the body is allowed to stream
+    for as long as it needs.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        context, token = request_context.activate(scope)
+        status_code = 500
+        response_started = False
+        deadline = None
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = True
+                if deadline is not None and not deadline.expired():
+                    deadline.reschedule(None)
+                elapsed = time.perf_counter() - started
+                headers = list(message.get("headers", []))
+                headers.extend(SECURITY_HEADERS)
+                headers.append((b"x-process-time", str(elapsed).encode()))
+                headers.extend(timing_headers(context, elapsed))
+                message["headers"] = headers
+            await send(message)
+
+        if settings.QUERY_DETECTOR_MODE != "off":
+            detector = query_detector.detect_queries(
+                settings.QUERY_DETECTOR_MODE,
+                settings.QUERY_DETECTOR_THRESHOLD,
+                settings.QUERY_DETECTOR_LAZY_LOADS,
+            )
+        else:
+            detector = nullcontext()
+        profile = memory = None
+
+        if settings.METRICS_ENABLED:
+            metrics.HTTP_IN_FLIGHT.inc()
+        path = route_path(scope)
+        route_class = admission.classify(path) if settings.LOAD_SHEDDING_ENABLED else None
+        admitted = False
+        try:
+            if settings.PROFILER_ENABLED:
+                profile = sampling_profiler.start(scope, context)
+            if settings.MEMORY_PROFILER_ENABLED:
+                memory = await memory_profiler.begin(context)
+            with detector:
+                if route_class is not None:
+                    admitted = await admission.acquire(route_class)
+                    if not admitted:
+                        retry_after = (b"retry-after", str(admission.retry_after).encode())
+                        await send_json(send_wrapper, 503, SHED_BODY, (retry_after,))
+                        return
+
+                timeout = timeout_for(path)
+                if not timeout:
+                    await self.app(scope, receive, send_wrapper)
+                    return
+
+                try:
+                    async with asyncio.timeout(timeout) as deadline:
+                        await self.app(scope, receive, send_wrapper)
+                except TimeoutError:
+                    if response_started:
+                        raise
+                    await send_json(send_wrapper, 408, TIMEOUT_BODY)
+        finally:
+            if admitted:
+                admission.release(route_class)
+            duration = time.perf_counter() - started
+            if profile is not None:
+                sampling_profiler.finish(profile, status_code, duration)
+            if memory is not None:
+                await memory_profiler.end(memory)
+            if settings.METRICS_ENABLED:
+                metrics.HTTP_IN_FLIGHT.dec()
+                metrics.record_request(scope["method"], context.route, status_code, duration)
+            if 0 < settings.SLOW_REQUEST_THRESHOLD_SECONDS <= duration:
+                log_slow_request(context, scope["method"], status_code, duration)
+            request_context.deactivate(token)
+
+
+class RequestLogMiddleware:
+    """
+    Pure ASGI capture of request/response bodies for `user_logs`.
+
+    Chunks are copied (up to the size cap) as they pass through; sampling,
+    parsing and the insert all happen after the response has been sent.
+    """
+
+    def __init__(self, app, max_body_bytes: int):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        capture = request_log.Capture(scope, self.max_body_bytes)
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                capture.add_request_chunk(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                capture.start_response(message)
+            elif message["type"] == "http.response.body":
+                capture.add_response_chunk(message.get("body", b""))
+            await send(message)
 
-    async def dispatch(self, request: Request, call_next):
         try:
-            return await asyncio.wait_for(call_next(request), timeout=self.timeout)
-        except asyncio.TimeoutError:
-            raise HTTPException(status_code=408, detail="Request timed out")
-
-class CustomHeaderMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        return response
\ No newline at end of file
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            request_log.submit(capture)
+
+
+class CompressionMiddleware:
+    """
+    Negotiated zstd/br/gzip compression for JSON and text responses.
+
+    Bodies below COMPRESSION_MIN_SIZE, content types outside the allowlist and
+    responses that already carry a Content-Encoding pass through untouched.
+    Streamed responses are compressed chunk by chunk and flushed as they go.
+    """
+
+    # Single bodies above this size are compressed off the event loop
+    THREAD_THRESHOLD = 256 * 1024
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            return await self.app(scope, receive, send)
+
+        encoding = None
+        for key, value in scope["headers"]:
+            if key == b"accept-encoding":
+                encoding = compression.negotiate(value.decode("latin-1"))
+                break
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, encoder, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 304)
+                    or not compression.is_compressible(headers.get("content-type", ""))
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                if int(headers.get("content-length", settings.COMPRESSION_MIN_SIZE)) < (
+                    settings.COMPRESSION_MIN_SIZE
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                headers = MutableHeaders(scope=start_message)
+                if not more_body and len(body) < settings.COMPRESSION_MIN_SIZE:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                encoder = compression.ENCODERS[encoding]()
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["Content-Length"]
+                    await send(start_message)
+                else:
+                    if len(body) > self.THREAD_THRESHOLD:
+                        body = await asyncio.to_thread(_compress_all, encoder, body)
+                    else:
+                        body = _compress_all(encoder, body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+            data = encoder.compress(body)
+            data += encoder.flush() if more_body else encoder.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _compress_all(encoder, body: bytes) -> bytes:
+    return encoder.compress(body) + encoder.finish()
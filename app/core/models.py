@@ -1,5 +1,8 @@
+from app.api.attendance import models as attendance_models
 from app.api.auth import models as auth_models
 from app.api.contacts import models as contacts_models
 from app.api.facilities import models as facilities_models
 from app.api.files import models as files_models
+from app.api.hazard_observations import models as hazard_observations_models
 from app.api.inventory import models as inventory_models
+from app.api.it_tickets import models as it_tickets_models
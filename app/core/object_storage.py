@@ -4,14 +4,19 @@ from minio import Minio
 from minio.error import S3Error
 
 from app.core.config import settings
+from app.core.memory_storage import MemoryObjectStorage
+from app.core.metrics import timed_storage_call
 
-# Initialize the MinIO object_storage_client
-object_storage_client = Minio(
-    settings.S3_ENDPOINT_URL,  # MinIO address
-    access_key=settings.S3_ACCESS_KEY,  # MinIO access key
-    secret_key=settings.S3_SECRET_ACCESS_KEY,  # MinIO secret key
-    secure=False,  # Set to True if using https
-)
+if settings.S3_BACKEND == "memory":
+    object_storage_client = MemoryObjectStorage()
+else:
+    # Initialize the MinIO object_storage_client
+    object_storage_client = Minio(
+        settings.S3_ENDPOINT_URL,  # MinIO address
+        access_key=settings.S3_ACCESS_KEY,  # MinIO access key
+        secret_key=settings.S3_SECRET_ACCESS_KEY,  # MinIO secret key
+        secure=False,  # Set to True if using https
+    )
 
 # Check if the bucket already exists
 if not object_storage_client.bucket_exists(settings.S3_BUCKET_NAME):
@@ -22,12 +27,14 @@ if not object_storage_client.bucket_exists(settings.S3_BUCKET_NAME):
         print(f"Error occurred: {e}")
 
 
+@timed_storage_call("fput_object")
 def upload_file(file_path, bucket_name, object_name):
     object = object_storage_client.fput_object(bucket_name, object_name, file_path)
     return object
 
 
 # Function to generate a presigned URL for uploading a file
+@timed_storage_call("presigned_put_object")
 def generate_presigned_url(object_name, expiration=3600):
     try:
         # Generate the presigned URL to upload a file
@@ -40,6 +47,7 @@ def generate_presigned_url(object_name, expiration=3600):
         return None
 
 
+@timed_storage_call("presigned_get_object")
 def generate_presigned_url_for_download(object_name, expiration=3600, filename=None):
     try:
         response_headers = None
@@ -60,6 +68,7 @@ def generate_presigned_url_for_download(object_name, expiration=3600, filename=N
         return None
 
 
+@timed_storage_call("stat_object")
 def get_head_object(object_name):
     try:
         # Fetch metadata of the object (like head request in S3)
@@ -72,6 +81,7 @@ def get_head_object(object_name):
         return None
 
 
+@timed_storage_call("get_object")
 def get_object(object_name):
     try:
         # Retrieve the actual object from MinIO
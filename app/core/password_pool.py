@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.core import metrics, passwords
+from app.core.config import settings
+
+logger = logging.getLogger("tse.password_pool")
+
+
+class PasswordPool:
+    """
+    bcrypt hashing and verification off the event loop.
+
+    Each call costs a few hundred milliseconds of CPU and passlib's os_crypt
+    backend holds the GIL meanwhile, so the work goes to a small pool of
+    spawned processes rather than threads. At most `max_queue` operations may
+    be waiting or running; beyond that callers get a 503 with Retry-After
+    instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 64):
+        self.workers = workers
+        self.max_queue = max_queue
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def start(self):
+        """Spawns the worker processes ahead of the first login."""
+        executor = self._get_executor()
+        for _ in range(self.workers):
+            executor.submit(passwords.warm_up)
+
+    def stop(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Not fork: the server process has threads (writers, watchdog)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _reset_broken(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, operation: str, func, *args):
+        if self._pending >= self.max_queue:
+            metrics.PASSWORD_HASH_REJECTED.labels(operation).inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many logins in progress, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        metrics.PASSWORD_HASH_QUEUE.inc()
+        try:
+            loop = asyncio.get_running_loop()
+            for attempt in range(2):
+                executor = self._get_executor()
+                submitted = time.monotonic()
+                try:
+                    *result, started, finished = await loop.run_in_executor(executor, func, *args)
+                    break
+                except BrokenProcessPool:
+                    # A worker died (OOM killer, say); start a fresh pool once
+                    logger.exception("Password hashing pool broke, restarting it")
+                    self._reset_broken(executor)
+                    if attempt:
+                        raise
+        finally:
+            self._pending -= 1
+            metrics.PASSWORD_HASH_QUEUE.dec()
+
+        metrics.record_password_hash(operation, max(started - submitted, 0.0), finished - started)
+        return result
+
+    async def hash(self, password: str) -> str:
+        (hashed,) = await self._run("hash", passwords.hash_password, password)
+        return hashed
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, Optional[str]]:
+        """
+        (valid, new hash or None): a new hash is returned when the stored one
+        was made with other cost parameters and should replace it.
+        """
+        valid, new_hash = await self._run("verify", passwords.verify_and_update, password, hashed)
+        return valid, new_hash
+
+
+password_pool = PasswordPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,41 @@
+"""
+Password hashing context and the functions the hashing pool runs.
+
+Kept free of app imports beyond settings: pool workers are spawned
+processes that import only this module.
+"""
+
+import time
+from typing import Optional
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+# min = max = default, so a hash made with any other cost is rehashed on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+
+def hash_password(password: str) -> tuple[str, float, float]:
+    """(hash, started, finished), monotonic times for the pool's wait/run metrics."""
+    started = time.monotonic()
+    hashed = pwd_context.hash(password)
+    return hashed, started, time.monotonic()
+
+
+def verify_and_update(password: str, hashed: str) -> tuple[bool, Optional[str], float, float]:
+    """(valid, replacement hash when the stored one is outdated, started, finished)."""
+    started = time.monotonic()
+    valid, new_hash = pwd_context.verify_and_update(password, hashed)
+    return valid, new_hash, started, time.monotonic()
+
+
+def warm_up() -> None:
+    """Loads passlib's bcrypt backend in a fresh worker."""
+    pwd_context.handler("bcrypt").get_backend()
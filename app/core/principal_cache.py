@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core import metrics
+from app.core.config import settings
+
+
+class PrincipalCache:
+    """
+    TTL + LRU cache of bearer token -> authenticated user snapshot.
+
+    A hit skips both the JWT decode and the `users` lookup. Entries live for
+    `ttl` seconds or until the token expires, whichever comes first, and the
+    least recently used entry is evicted past `max_size`. Tokens are indexed by
+    user id so that changing or deleting a user drops every token of theirs at
+    once. The cache is per worker: another worker keeps serving its own entry
+    for at most `ttl` seconds after a change.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._tokens_by_user: dict[object, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str):
+        """The cached principal for `token`, or None; counted in tse_cache_requests_total."""
+        principal = self.peek(token)
+        metrics.record_cache("principal", principal is not None)
+        return principal
+
+    def peek(self, token: str):
+        """Like get, without touching the hit/miss counters."""
+        if not self.ttl:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires, principal = entry
+            if expires <= time.monotonic():
+                self._remove(token, principal)
+                return None
+            self._entries.move_to_end(token)
+            return principal
+
+    def put(self, token: str, principal, token_expires: Optional[float] = None):
+        """
+        Caches `principal` (anything with an `id`). `token_expires` is the
+        token's `exp` claim as a Unix timestamp.
+        """
+        if not self.ttl:
+            return
+        lifetime = self.ttl
+        if token_expires is not None:
+            lifetime = min(lifetime, token_expires - time.time())
+        if lifetime <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(token, None)
+            if previous is not None:
+                self._remove(token, previous[1])
+            self._entries[token] = (time.monotonic() + lifetime, principal)
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+            while len(self._entries) > self.max_size:
+                evicted, (_, evicted_principal) = self._entries.popitem(last=False)
+                self._unindex(evicted, evicted_principal)
+
+    def invalidate(self, user_id):
+        """Drops every cached token of `user_id`."""
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, ()):
+                self._entries.pop(token, None)
+
+    def discard(self, token: str):
+        """Drops one token, e.g. on logout."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                self._remove(token, entry[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, token: str, principal):
+        self._entries.pop(token, None)
+        self._unindex(token, principal)
+
+    def _unindex(self, token: str, principal):
+        tokens = self._tokens_by_user.get(principal.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[principal.id]
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
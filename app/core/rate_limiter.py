@@ -0,0 +1,168 @@
+import asyncio
+import math
+import time
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import bindparam, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import rate_limit_buckets, sessionmanager
+from app.core.dependencies import decode_token
+from app.core.principal_cache import principal_cache
+
+# Buckets untouched this long are full again and can be dropped
+PRUNE_INTERVAL_SECONDS = 60
+
+
+class MemoryBucketStore:
+    """
+    Buckets of one worker. Each bucket is its theoretical arrival time (GCRA,
+    the token bucket as a single timestamp): the bucket is full while it lies
+    in the past, and a request is allowed while it is no more than
+    `tolerance` ahead of now.
+    """
+
+    def __init__(self):
+        self._tats: dict[str, float] = {}
+        self._pruned = time.monotonic()
+
+    def acquire(self, key: str, interval: float, tolerance: float, now: float) -> float:
+        """0 if the request may proceed, else the seconds until it would."""
+        tat = max(self._tats.get(key, now), now)
+        if tat - now > tolerance:
+            return tat - tolerance - now
+        self._tats[key] = tat + interval
+        if time.monotonic() - self._pruned > PRUNE_INTERVAL_SECONDS:
+            self._prune(now)
+        return 0.0
+
+    def _prune(self, now: float):
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+        self._pruned = time.monotonic()
+
+
+class PostgresBucketStore:
+    """
+    The same buckets in `rate_limit_buckets`, shared by every worker. The
+    check and update are one upsert whose update only applies when the
+    request is allowed, so concurrent requests cannot overdraw a bucket.
+    Costs a round trip per request; called from a thread.
+    """
+
+    def __init__(self):
+        self._pruned = time.monotonic()
+
+        now = bindparam("now")
+        interval = bindparam("interval")
+        tolerance = bindparam("tolerance")
+        statement = insert(rate_limit_buckets).values(key=bindparam("key"), tat=now + interval)
+        tat = func.greatest(rate_limit_buckets.c.tat, now)
+        self._acquire = statement.on_conflict_do_update(
+            index_elements=[rate_limit_buckets.c.key],
+            set_={"tat": tat + interval},
+            where=tat - now <= tolerance,
+        ).returning(rate_limit_buckets.c.tat)
+        self._current = select(rate_limit_buckets.c.tat).where(
+            rate_limit_buckets.c.key == bindparam("key")
+        )
+
+    def acquire(self, key: str, interval: float, tolerance: float, now: float) -> float:
+        parameters = {"key": key, "now": now, "interval": interval, "tolerance": tolerance}
+        with sessionmanager.connect() as connection:
+            if connection.execute(self._acquire, parameters).first() is not None:
+                if time.monotonic() - self._pruned > PRUNE_INTERVAL_SECONDS:
+                    self._pruned = time.monotonic()
+                    connection.execute(
+                        delete(rate_limit_buckets).where(rate_limit_buckets.c.tat < now)
+                    )
+                return 0.0
+            tat = connection.execute(self._current, {"key": key}).scalar()
+        return max((tat or now) - tolerance - now, 0.0)
+
+
+class RateLimiter:
+    """
+    Token-bucket limits per caller and route prefix.
+
+    The caller is the user id of a valid bearer token, otherwise the client
+    address. Requests are counted against the bucket of the longest matching
+    prefix in `overrides` ({prefix: (times, seconds)}), or the default
+    bucket: `times` requests at once, refilled at `times` per `seconds`.
+    """
+
+    def __init__(
+        self,
+        times: int,
+        seconds: float,
+        overrides: Optional[dict[str, tuple[int, float]]] = None,
+        backend: str = "memory",
+    ):
+        self.times = times
+        self.seconds = seconds
+        self.overrides = overrides or {}
+        self.store = PostgresBucketStore() if backend == "postgres" else MemoryBucketStore()
+        self.shared = backend == "postgres"
+        self._rules: dict[str, tuple[str, int, float]] = {}
+
+    def rule(self, route: str) -> tuple[str, int, float]:
+        """(bucket prefix, times, seconds) for a route template."""
+        rule = self._rules.get(route)
+        if rule is None:
+            rule = ("", self.times, self.seconds)
+            for prefix, (times, seconds) in self.overrides.items():
+                if route.startswith(prefix) and len(prefix) > len(rule[0]):
+                    rule = (prefix, times, seconds)
+            self._rules[route] = rule
+        return rule
+
+    async def check(self, request: Request):
+        """Raises 429 with Retry-After when the caller's bucket is empty."""
+        route = getattr(request.scope.get("route"), "path", None) or "unmatched"
+        prefix, times, seconds = self.rule(route)
+        if times <= 0:
+            return
+
+        interval = seconds / times
+        key = f"{prefix}:{caller(request)}"
+        arguments = (key, interval, interval * (times - 1), time.time())
+        if self.shared:
+            wait = await asyncio.to_thread(self.store.acquire, *arguments)
+        else:
+            wait = self.store.acquire(*arguments)
+        if wait > 0:
+            metrics.record_rate_limited(route)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please slow down",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+
+def caller(request: Request) -> str:
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        principal = principal_cache.peek(token)
+        if principal is not None:
+            return f"user:{principal.id}"
+        try:
+            return f"user:{decode_token(token)['sub']}"
+        except HTTPException:
+            pass  # rejected by the auth dependency after this
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+rate_limiter = RateLimiter(
+    times=settings.LIMITER_TIMES,
+    seconds=settings.LIMITER_SECONDS,
+    overrides=settings.RATE_LIMIT_OVERRIDES,
+    backend=settings.RATE_LIMIT_BACKEND,
+)
+
+
+async def rate_limit(request: Request):
+    """App-wide dependency: runs after routing, before the route's own dependencies."""
+    await rate_limiter.check(request)
@@ -0,0 +1,129 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Callable, Optional
+
+from sqlalchemy import event
+
+# Statements kept per request for the slow-request log
+MAX_RECORDED_STATEMENTS = 500
+
+
+class RequestContext:
+    """
+    Per-request state shared between the middleware, database event hooks and
+    handlers. Sync handlers run in a thread pool with a copy of the context,
+    so they see (and mutate) this same object.
+    """
+
+    __slots__ = (
+        "scope",
+        "db_queries",
+        "db_time",
+        "statements",
+        "timings",
+        "handler_done",
+        "user_id",
+        "user_role",
+    )
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.statements: list[tuple[str, float]] = []
+        self.timings: dict[str, float] = {}
+        self.handler_done: Optional[float] = None
+        # Set once get_current_user has loaded the caller
+        self.user_id = None
+        self.user_role: Optional[str] = None
+
+    @property
+    def route(self) -> str:
+        """Route template once routing has happened, e.g. /it-tickets/{ticket_id}."""
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+    def record_query(self, statement: str, duration: float):
+        self.db_queries += 1
+        self.db_time += duration
+        if len(self.statements) < MAX_RECORDED_STATEMENTS:
+            self.statements.append((statement, duration))
+
+    def add_time(self, phase: str, seconds: float):
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+
+_current: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_context", default=None
+)
+
+
+def activate(scope) -> tuple[RequestContext, Token]:
+    context = RequestContext(scope)
+    return context, _current.set(context)
+
+
+def deactivate(token: Token):
+    _current.reset(token)
+
+
+def current() -> Optional[RequestContext]:
+    return _current.get()
+
+
+def add_time(phase: str, seconds: float):
+    context = _current.get()
+    if context is not None:
+        context.add_time(phase, seconds)
+
+
+@contextmanager
+def timed(phase: str):
+    """Adds the time spent in the block to `phase` of the current request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(phase, time.perf_counter() - started)
+
+
+def set_user(user_id, role):
+    context = _current.get()
+    if context is not None:
+        context.user_id = user_id
+        context.user_role = role
+
+
+def mark_handler_done():
+    """Called when the handler has built its payload; serialization starts here."""
+    context = _current.get()
+    if context is not None:
+        context.handler_done = time.perf_counter()
+
+
+def instrument_engine(engine, on_query: Optional[Callable[[str, float], None]] = None):
+    """
+    Times every statement and records it on the current request's context;
+    `on_query(route, duration)` also sees statements run outside a request,
+    as route "background".
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_started"].pop()
+        current = _current.get()
+        if current is not None:
+            current.record_query(statement, duration)
+        if on_query is not None:
+            on_query(current.route if current is not None else "background", duration)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
@@ -0,0 +1,229 @@
+import json
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+from uuid import UUID
+
+from jose import JWTError, jwt
+
+from app.api.auth.models import UserLog
+from app.core.batch_writer import BatchWriter
+from app.core.config import settings
+
+REDACTED = "[REDACTED]"
+
+# Keys masked in every captured body, at any nesting depth
+SENSITIVE_FIELDS = {
+    "password",
+    "new_password",
+    "current_password",
+    "hashed_password",
+    "access_token",
+    "refresh_token",
+    "token",
+    "secret",
+}
+
+# Per-route rules keyed by route template: "*" drops the whole body,
+# a set masks those keys on top of SENSITIVE_FIELDS
+ROUTE_REDACTIONS: dict[str, dict[str, str | set[str]]] = {
+    "/auth/login": {"request": "*", "response": {"access_token", "token_type"}},
+    "/auth/refresh": {"request": "*"},
+    "/auth/profile": {"request": {"password"}},
+    "/auth/employees": {"request": {"password"}},
+    "/auth/employees/{employee_id}": {"request": {"password"}},
+}
+
+_SENSITIVE_PATTERN = re.compile(
+    r'("(?:%s)"\s*:\s*)"[^"]*"' % "|".join(sorted(SENSITIVE_FIELDS))
+)
+
+
+class Capture:
+    """Raw request/response data collected by RequestLogMiddleware."""
+
+    __slots__ = (
+        "scope",
+        "limit",
+        "request_body",
+        "request_size",
+        "response_body",
+        "response_size",
+        "response_content_type",
+        "status_code",
+        "timestamp",
+        "started",
+        "duration",
+    )
+
+    def __init__(self, scope, limit: int):
+        self.scope = scope
+        self.limit = limit
+        self.request_body = bytearray()
+        self.request_size = 0
+        self.response_body = bytearray()
+        self.response_size = 0
+        self.response_content_type = ""
+        self.status_code = 500
+        self.timestamp = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.duration = None
+
+    def add_request_chunk(self, chunk: bytes):
+        self.request_size += len(chunk)
+        if len(self.request_body) < self.limit:
+            self.request_body += chunk[: self.limit - len(self.request_body)]
+
+    def start_response(self, message):
+        self.status_code = message["status"]
+        for key, value in message.get("headers", []):
+            if key == b"content-type":
+                self.response_content_type = value.decode("latin-1")
+
+    def add_response_chunk(self, chunk: bytes):
+        self.response_size += len(chunk)
+        if len(self.response_body) < self.limit:
+            self.response_body += chunk[: self.limit - len(self.response_body)]
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope["path"]
+
+
+def _should_sample(capture: Capture) -> bool:
+    if capture.scope["method"] == "OPTIONS":
+        return False
+    if _route_template(capture.scope) in settings.REQUEST_LOG_EXCLUDE_PATHS:
+        return False
+    rate = (
+        settings.REQUEST_LOG_ERROR_SAMPLE_RATE
+        if capture.status_code >= 500
+        else settings.REQUEST_LOG_SAMPLE_RATE
+    )
+    return random.random() < rate
+
+
+def submit(capture: Capture):
+    """Queues a finished capture if it is sampled. Never touches the database."""
+    capture.duration = time.perf_counter() - capture.started
+    if not _should_sample(capture):
+        return
+
+    headers = dict(capture.scope["headers"])
+    request_log_writer.put(
+        {
+            "capture": capture,
+            "authorization": headers.get(b"authorization", b"").decode("latin-1"),
+            "request_content_type": headers.get(b"content-type", b"").decode("latin-1"),
+        }
+    )
+
+
+def redact(value, fields: set[str]):
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if str(key).lower() in fields else redact(item, fields)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item, fields) for item in value]
+    return value
+
+
+def sanitize_query(query_string: bytes) -> Optional[str]:
+    """The query string with sensitive parameters masked, e.g. ?token=... links."""
+    if not query_string:
+        return None
+    pairs = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    return urlencode(
+        [(key, REDACTED if key.lower() in SENSITIVE_FIELDS else value) for key, value in pairs]
+    )
+
+
+def decode_body(body: bytes, size: int, content_type: str, rule) -> Optional[dict | list]:
+    """Turns a captured body into something storable in a JSON column."""
+    if size == 0:
+        return None
+    if rule == "*":
+        return {"_redacted": True, "_size": size}
+
+    fields = SENSITIVE_FIELDS | (rule or set())
+    if size > len(body):
+        preview = body.decode("utf-8", errors="replace")
+        return {
+            "_truncated": True,
+            "_size": size,
+            "_preview": _SENSITIVE_PATTERN.sub(rf'\1"{REDACTED}"', preview),
+        }
+
+    if "json" in content_type:
+        try:
+            return redact(json.loads(body), fields)
+        except ValueError:
+            pass
+    elif "x-www-form-urlencoded" in content_type:
+        return redact(dict(parse_qsl(body.decode("utf-8", errors="replace"))), fields)
+
+    return {"_content_type": content_type or None, "_size": size}
+
+
+def user_id_from_authorization(authorization: str) -> Optional[UUID]:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"verify_exp": False},
+        )
+        return UUID(payload["sub"])
+    except (JWTError, KeyError, ValueError):
+        return None
+
+
+def build_rows(entries: list[dict]) -> list[dict]:
+    """Runs in the writer thread: token decoding, parsing and redaction."""
+    rows = []
+    for entry in entries:
+        capture: Capture = entry["capture"]
+        rule = ROUTE_REDACTIONS.get(_route_template(capture.scope), {})
+        rows.append(
+            {
+                "user_id": user_id_from_authorization(entry["authorization"]),
+                "path": capture.scope["path"],
+                "method": capture.scope["method"],
+                "status_code": str(capture.status_code),
+                "query": sanitize_query(capture.scope.get("query_string", b"")),
+                "duration_ms": round(capture.duration * 1000, 3),
+                "request_body": decode_body(
+                    bytes(capture.request_body),
+                    capture.request_size,
+                    entry["request_content_type"],
+                    rule.get("request"),
+                ),
+                "response_body": decode_body(
+                    bytes(capture.response_body),
+                    capture.response_size,
+                    capture.response_content_type,
+                    rule.get("response"),
+                ),
+                "timestamp": capture.timestamp,
+            }
+        )
+    return rows
+
+
+request_log_writer = BatchWriter(
+    "request-log",
+    UserLog,
+    batch_size=settings.REQUEST_LOG_BATCH_SIZE,
+    flush_interval=settings.REQUEST_LOG_FLUSH_INTERVAL_SECONDS,
+    max_size=settings.REQUEST_LOG_BUFFER_SIZE,
+    prepare=build_rows,
+)
@@ -0,0 +1,20 @@
+import time
+
+from fastapi.responses import JSONResponse
+
+from app.core import request_context
+
+
+class TimedJSONResponse(JSONResponse):
+    """
+    JSONResponse that reports the serialize phase to the request context:
+    from the handler returning its payload (see create_api_response) to the
+    rendered bytes, which covers FastAPI's jsonable_encoder pass and json.dumps.
+    """
+
+    def render(self, content) -> bytes:
+        body = super().render(content)
+        context = request_context.current()
+        if context is not None and context.handler_done is not None:
+            context.add_time("serialize", time.perf_counter() - context.handler_done)
+        return body
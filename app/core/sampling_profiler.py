@@ -0,0 +1,350 @@
+import asyncio
+import concurrent.futures.thread
+import contextvars
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from app.core import request_context
+from app.core.config import settings
+from app.core.dependencies import decode_token
+from app.core.principal_cache import principal_cache
+from fastapi import HTTPException
+
+logger = logging.getLogger("tse.profiler")
+
+PROFILE_ID = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{8}$")
+
+# Outermost frames searched for a thread-pool entry point
+_ENTRY_SEARCH_DEPTH = 12
+
+
+def _thread_entry_codes() -> dict:
+    """Code objects of the thread-pool loops that run a request's offloaded calls."""
+    codes = {concurrent.futures.thread._WorkItem.run.__code__: "executor"}
+    try:
+        from anyio._backends._asyncio import WorkerThread
+
+        codes[WorkerThread.run.__code__] = "anyio"
+    except (ImportError, AttributeError):
+        pass
+    return codes
+
+
+_label_cache: dict = {}
+
+
+def _label(code) -> str:
+    label = _label_cache.get(code)
+    if label is None:
+        filename = code.co_filename
+        for marker in ("/site-packages/", "/lib/python3", "/app/"):
+            index = filename.rfind(marker)
+            if index != -1:
+                filename = filename[index + 1 :]
+                break
+        label = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+        _label_cache[code] = label
+    return label
+
+
+def _thread_cpu_time(ident: int) -> Optional[float]:
+    """CPU seconds used by another thread so far; None where unsupported."""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError):
+        return None
+
+
+class Profile:
+    __slots__ = (
+        "id",
+        "method",
+        "path",
+        "trigger",
+        "task",
+        "context",
+        "created_at",
+        "wall",
+        "cpu",
+        "samples",
+        "cpu_time",
+        "threads",
+        "status_code",
+        "duration",
+    )
+
+    def __init__(self, method: str, path: str, trigger: str, task, context):
+        self.created_at = datetime.now(timezone.utc)
+        self.id = f"{self.created_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.task = task
+        self.context = context
+        self.wall: Counter = Counter()
+        self.cpu: Counter = Counter()
+        self.samples = 0
+        self.cpu_time = 0.0
+        self.threads: set[str] = set()
+        self.status_code = None
+        self.duration = None
+
+    def metadata(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.context.route,
+            "trigger": self.trigger,
+            "status_code": self.status_code,
+            "duration": self.duration,
+            "samples": self.samples,
+            "cpu_time": round(self.cpu_time, 6),
+            "threads": sorted(self.threads),
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for individual requests, flame-graph output only.
+
+    While a profiled request is in flight a background thread samples every
+    thread's stack each `interval` seconds. Event-loop samples count for the
+    request whose task is running; thread-pool samples count for the request
+    whose context the worker is running (sync dependencies, run_in_threadpool,
+    asyncio.to_thread). The wall profile counts samples; the CPU profile weighs
+    each stack by the microseconds of CPU its thread used since the previous
+    sample.
+
+    Profiles are written as folded stacks (flamegraph.pl, speedscope, inferno)
+    with a JSON metadata file next to them, keeping the newest `max_profiles`.
+    """
+
+    def __init__(
+        self,
+        directory: str = "profiles",
+        interval: float = 0.005,
+        sample_rate: float = 0.0,
+        max_concurrent: int = 2,
+        max_profiles: int = 200,
+    ):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.sample_rate = sample_rate
+        self.max_concurrent = max_concurrent
+        self.max_profiles = max_profiles
+
+        self._active: dict[int, Profile] = {}
+        self._finished: list[Profile] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop = None
+        self._loop_thread: Optional[int] = None
+        self._cpu_seen: dict[int, tuple[int, float]] = {}
+        self._round = 0
+        self._entry_codes = _thread_entry_codes()
+
+    def trigger(self, scope) -> Optional[str]:
+        """
+        'header'/'query' when a manager asked for a profile, 'sampled' when
+        picked at random. Anyone else's X-Profile or ?_profile=1 is ignored.
+        """
+        requested = None
+        for key, value in scope["headers"]:
+            if key == b"x-profile" and value in (b"1", b"true"):
+                requested = "header"
+        if requested is None and b"_profile=1" in scope.get("query_string", b"").split(b"&"):
+            requested = "query"
+        if requested is not None and _bearer_is_manager(scope):
+            return requested
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def start(self, scope, context) -> Optional[Profile]:
+        trigger = self.trigger(scope)
+        if trigger is None:
+            return None
+        task = asyncio.current_task()
+        with self._lock:
+            if len(self._active) >= self.max_concurrent or task is None:
+                return None
+            if self._loop is None:
+                self._loop = asyncio.get_running_loop()
+                self._loop_thread = threading.get_ident()
+            profile = Profile(scope["method"], scope["path"], trigger, task, context)
+            self._active[id(context)] = profile
+        self._ensure_thread()
+        self._wake.set()
+        return profile
+
+    def finish(self, profile: Profile, status_code: int, duration: float):
+        profile.status_code = status_code
+        profile.duration = duration
+        with self._lock:
+            self._active.pop(id(profile.context), None)
+            # Client-triggered profiles are only kept for managers
+            if profile.trigger == "sampled" or _is_manager(profile.context):
+                self._finished.append(profile)
+        self._wake.set()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                idle = not self._active
+                finished, self._finished = self._finished, []
+            for profile in finished:
+                try:
+                    self._write(profile)
+                except OSError:
+                    logger.exception("Could not write profile %s", profile.id)
+            if idle:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            self._sample()
+            time.sleep(self.interval)
+
+    def _sample(self):
+        frames = sys._current_frames()
+        with self._lock:
+            by_context = dict(self._active)
+        by_task = {profile.task: profile for profile in by_context.values()}
+        own = threading.get_ident()
+        self._round += 1
+
+        for ident, frame in frames.items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame)
+                frame = frame.f_back
+            stack.reverse()
+
+            if ident == self._loop_thread:
+                profile, kind = by_task.get(asyncio.current_task(self._loop)), "event-loop"
+            else:
+                profile, kind = self._offloaded_profile(stack, by_context), "worker"
+            if profile is None:
+                continue
+
+            folded = ";".join([kind, *(_label(item.f_code) for item in stack)])
+            profile.wall[folded] += 1
+            profile.samples += 1
+            profile.threads.add(kind)
+            cpu = self._cpu_delta(ident)
+            if cpu:
+                profile.cpu[folded] += round(cpu * 1e6)
+                profile.cpu_time += cpu
+
+    def _offloaded_profile(self, stack: list, by_context: dict) -> Optional[Profile]:
+        for frame in stack[:_ENTRY_SEARCH_DEPTH]:
+            kind = self._entry_codes.get(frame.f_code)
+            if kind is None:
+                continue
+            local = frame.f_locals
+            if kind == "anyio":
+                future, context = local.get("future"), local.get("context")
+            else:
+                work = local.get("self")
+                future = getattr(work, "future", None)
+                # asyncio.to_thread submits functools.partial(context.run, func, ...)
+                context = getattr(getattr(getattr(work, "fn", None), "func", None), "__self__", None)
+            # A worker keeps its last item's locals while idle; only running work counts
+            if not isinstance(context, contextvars.Context) or future is None or future.done():
+                return None
+            owner = context.get(request_context._current, None)
+            return by_context.get(id(owner)) if owner is not None else None
+        return None
+
+    def _cpu_delta(self, ident: int) -> float:
+        """CPU the thread used since the previous round; 0 when it was not sampled then."""
+        now = _thread_cpu_time(ident)
+        if now is None:
+            return 0.0
+        previous = self._cpu_seen.get(ident)
+        self._cpu_seen[ident] = (self._round, now)
+        if previous is None or previous[0] != self._round - 1:
+            return 0.0
+        return now - previous[1]
+
+    def _write(self, profile: Profile):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        base = self.directory / profile.id
+        for kind, stacks in (("wall", profile.wall), ("cpu", profile.cpu)):
+            with open(f"{base}.{kind}.folded", "w") as file:
+                file.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        with open(f"{base}.json", "w") as file:
+            json.dump(profile.metadata(), file)
+        self._prune()
+
+    def _prune(self):
+        profiles = sorted(self.directory.glob("*.json"))
+        for path in profiles[: max(len(profiles) - self.max_profiles, 0)]:
+            for suffix in (".json", ".wall.folded", ".cpu.folded"):
+                path.with_name(path.stem + suffix).unlink(missing_ok=True)
+
+    def list(self) -> list[dict]:
+        if not self.directory.exists():
+            return []
+        profiles = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                profiles.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def path(self, profile_id: str, kind: str) -> Optional[Path]:
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.{kind}.folded"
+        return path if path.exists() else None
+
+
+def _is_manager(context) -> bool:
+    return context.user_role == "MANAGER"
+
+
+def _bearer_is_manager(scope) -> bool:
+    """Whether the request carries a valid manager token, before auth has run."""
+    authorization = next(
+        (value for key, value in scope["headers"] if key == b"authorization"), b""
+    )
+    scheme, _, token = authorization.decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    principal = principal_cache.peek(token)
+    if principal is not None:
+        return principal.role == "MANAGER"
+    try:
+        return decode_token(token).get("role") == "MANAGER"
+    except HTTPException:
+        return False
+
+
+sampling_profiler = SamplingProfiler(
+    directory=settings.PROFILER_DIR,
+    interval=settings.PROFILER_INTERVAL_SECONDS,
+    sample_rate=settings.PROFILER_SAMPLE_RATE,
+    max_concurrent=settings.PROFILER_MAX_CONCURRENT,
+    max_profiles=settings.PROFILER_MAX_PROFILES,
+)
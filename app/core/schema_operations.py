@@ -1,9 +1,12 @@
 from typing import Any, Optional, Type, Union
+from uuid import UUID
 
 from fastapi import HTTPException
 from fastapi.exceptions import RequestValidationError
 from pydantic import BaseModel as PydanticBaseModel
-from pydantic import JsonValue, ValidationError
+from pydantic import Field, JsonValue, ValidationError
+
+from app.core import request_context
 
 
 class BaseModel(PydanticBaseModel):
@@ -19,6 +22,10 @@ class ApiResponse(BaseModel):
     errors: Optional[Any] = None
 
 
+class BulkIdsSchema(BaseModel):
+    ids: list[UUID] = Field(..., min_length=1, max_length=1000)
+
+
 def build_nested_model(model: type[BaseModel], data):
     result = {}
 
@@ -41,6 +48,8 @@ def create_api_response(
             status_code = 500
         raise HTTPException(status_code=status_code, detail=message)
 
+    request_context.mark_handler_done()
+
     output = {
         "success": success,
         "message": message,
@@ -1,50 +1,53 @@
+import hashlib
+import secrets
+import time
 from datetime import datetime, timedelta
 
 from dotenv import load_dotenv
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import jwt
 
 from app.core.config import settings
+from app.core.passwords import pwd_context  # noqa: F401  re-exported for scripts
 
 load_dotenv()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.ROOT_PATH}/auth/login")
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def get_current_token(token: str = Depends(oauth2_scheme)) -> str:
     return token
 
 
+def principal_claims(user) -> dict:
+    """
+    Claims that let get_current_principal authorize without loading the user:
+    role, department and the token_version they were issued under.
+    """
+    return {
+        "sub": str(user.id),
+        "role": user.role.value,
+        "department": user.department.value if user.department else None,
+        "ver": user.token_version or 0,
+    }
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": int(time.time())})
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
     return encoded_jwt
 
 
-def refresh_token(current_token: str = Depends(oauth2_scheme)):
-    try:
-        payload = jwt.decode(
-            current_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        new_payload = payload.copy()
-        expire = datetime.now() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-        new_payload["exp"] = expire
-        new_token = jwt.encode(
-            new_payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-        )
-        return {"access_token": new_token, "token_type": "bearer"}
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token for refresh",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+def new_refresh_token() -> str:
+    """An opaque refresh token; only its digest is stored (refresh_tokens)."""
+    return secrets.token_urlsafe(32)
+
+
+def token_digest(token: str) -> str:
+    """SHA-256 hex of a token, the key refresh and revoked tokens are stored under."""
+    return hashlib.sha256(token.encode()).hexdigest()
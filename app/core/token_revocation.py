@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, select
+
+from app.api.auth.models import RefreshToken, RevokedToken
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import sessionmanager
+from app.core.security import token_digest
+
+logger = logging.getLogger("tse.token_revocation")
+
+# Incremental loads re-read revocations this far behind the newest one seen, so
+# a transaction that started earlier but committed later is not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """Fixed-size bit array over SHA-256 hex digests (double hashing)."""
+
+    def __init__(self, bits: int, hashes: int):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        capacity = max(capacity, 1)
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        return cls(bits, max(1, round(bits / capacity * math.log(2))))
+
+    def _positions(self, digest: str) -> list[int]:
+        first, step = int(digest[:16], 16), int(digest[16:32], 16) | 1
+        return [(first + i * step) % self.bits for i in range(self.hashes)]
+
+    def add(self, digest: str):
+        for position in self._positions(digest):
+            self._array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: str) -> bool:
+        array = self._array
+        for position in self._positions(digest):
+            if not array[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RevocationList:
+    """
+    Revoked access tokens, checked on every authenticated request.
+
+    `revoked_tokens` is the shared list: a logout in any worker inserts the
+    token's digest there. Each worker mirrors it in a bloom filter, which
+    run_revocation_refresher keeps current from the lifespan: loading new rows
+    every `refresh_interval` seconds and rebuilding from scratch (after
+    deleting expired rows) every `rebuild_interval`. Requests only read the
+    current filter. A token whose digest is not in the filter is not revoked,
+    which is the common case and costs one hash; a match is confirmed against
+    the table, so a false positive costs a primary-key lookup rather than a
+    rejected request. Another worker stops accepting a revoked token within
+    `refresh_interval`.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        refresh_interval: float = 5,
+        rebuild_interval: float = 600,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+
+        self._bloom = BloomFilter.for_capacity(capacity, error_rate)
+        self._synced_until: Optional[datetime] = None  # newest revoked_at loaded
+        self._rebuilt = float("-inf")
+
+    def refresh(self):
+        """Loads new revocations, or rebuilds when due; called from one thread."""
+        started = time.monotonic()
+        with sessionmanager.session() as session:
+            if started - self._rebuilt > self.rebuild_interval:
+                self._rebuild(session)
+                self._rebuilt = started
+            else:
+                self._load(session, self._bloom, self._synced_until)
+
+    def _rebuild(self, session):
+        now = func.now()
+        session.execute(delete(RevokedToken).where(RevokedToken.expires_at < now))
+        session.execute(delete(RefreshToken).where(RefreshToken.expires_at < now))
+        session.commit()
+
+        count = session.scalar(select(func.count()).select_from(RevokedToken))
+        bloom = BloomFilter.for_capacity(max(self.capacity, 2 * count), self.error_rate)
+        self._load(session, bloom, None)
+        self._bloom = bloom
+
+    def _load(self, session, bloom: BloomFilter, since: Optional[datetime]):
+        query = select(RevokedToken.token_digest, RevokedToken.revoked_at).where(
+            RevokedToken.expires_at > func.now()
+        )
+        if since is not None:
+            query = query.where(RevokedToken.revoked_at > since - SYNC_OVERLAP)
+        for digest, revoked_at in session.execute(query):
+            bloom.add(digest)
+            if self._synced_until is None or revoked_at > self._synced_until:
+                self._synced_until = revoked_at
+
+    def add(self, digest: str):
+        """Marks a digest this worker has just revoked, ahead of the next refresh."""
+        self._bloom.add(digest)
+
+    def confirm(self, digest: str) -> bool:
+        with sessionmanager.session() as session:
+            revoked = session.scalar(
+                select(func.count())
+                .select_from(RevokedToken)
+                .where(RevokedToken.token_digest == digest)
+            )
+        metrics.record_revocation_lookup(bool(revoked))
+        return bool(revoked)
+
+    async def is_revoked(self, token: str) -> bool:
+        digest = token_digest(token)
+        if digest not in self._bloom:
+            return False
+        return await asyncio.to_thread(self.confirm, digest)
+
+
+revocation_list = RevocationList(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    refresh_interval=settings.REVOCATION_REFRESH_SECONDS,
+    rebuild_interval=settings.REVOCATION_REBUILD_SECONDS,
+)
+
+
+async def run_revocation_refresher():
+    """Keeps this worker's revocation_list current, starting with a full load."""
+    while True:
+        try:
+            await asyncio.to_thread(revocation_list.refresh)
+        except Exception:
+            logger.exception("Revocation list refresh failed")
+        await asyncio.sleep(revocation_list.refresh_interval)
@@ -0,0 +1,117 @@
+"""
+Requests per second through the middleware stack on a trivial endpoint.
+
+"legacy" rebuilds the previous BaseHTTPMiddleware layers (security headers,
+timeout, and the @app.middleware("http") timing function); "asgi" uses
+RequestPipelineMiddleware. Requests are driven in-process, so the numbers
+isolate middleware overhead from the server and the network.
+
+    python -m app.scripts.bench_middleware --requests 20000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, HTTPException, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.middlewares import RequestPipelineMiddleware
+from app.core.schema_operations import create_api_response
+from app.scripts.bench_utils import asgi_request, print_table
+
+
+class LegacyTimeoutMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, timeout: int):
+        super().__init__(app)
+        self.timeout = timeout
+
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await asyncio.wait_for(call_next(request), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=408, detail="Request timed out")
+
+
+class LegacyCustomHeaderMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        return response
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return create_api_response(success=True, message="pong")
+
+    if stack == "legacy":
+        app.add_middleware(LegacyCustomHeaderMiddleware)
+        app.add_middleware(LegacyTimeoutMiddleware, timeout=999)
+
+        @app.middleware("http")
+        async def add_process_time_header(request: Request, call_next):
+            start_time = time.perf_counter()
+            response = await call_next(request)
+            response.headers["X-Process-Time"] = str(time.perf_counter() - start_time)
+            return response
+
+    elif stack == "asgi":
+        app.add_middleware(RequestPipelineMiddleware)
+
+    return app
+
+
+async def measure(app, requests: int, concurrency: int) -> float:
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            status, _, _ = await asgi_request(app, "GET", "/ping")
+            assert status == 200, status
+
+    # Warm-up builds the middleware stack and the route caches
+    for _ in range(100):
+        await asgi_request(app, "GET", "/ping")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main(stacks: list[str], requests: int, concurrency: int, rounds: int):
+    rows = []
+    for stack in stacks:
+        app = build_app(stack)
+        results = [await measure(app, requests, concurrency) for _ in range(rounds)]
+        rows.append(
+            {
+                "stack": stack,
+                "best_rps": round(max(results)),
+                "median_rps": round(sorted(results)[len(results) // 2]),
+            }
+        )
+    baseline = rows[0]["best_rps"]
+    for row in rows:
+        row["vs_first"] = f"{row['best_rps'] / baseline:.2f}x"
+    print_table(rows, ["stack", "best_rps", "median_rps", "vs_first"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--stacks", nargs="+", default=["legacy", "asgi", "none"],
+        choices=["legacy", "asgi", "none"],
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.stacks, args.requests, args.concurrency, args.rounds))
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import math
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Any, Optional
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Linear-interpolated percentile, `p` in 0-100."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(latencies: list[float]) -> dict:
+    """Latency summary in milliseconds."""
+    if not latencies:
+        return {"count": 0}
+    return {
+        "count": len(latencies),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+def print_table(rows: list[dict], columns: list[str]):
+    widths = {
+        column: max(len(column), *(len(str(row.get(column, ""))) for row in rows))
+        for column in columns
+    }
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(str(row.get(column, "")).ljust(widths[column]) for column in columns))
+
+
+def http_request(
+    method: str,
+    url: str,
+    token: Optional[str] = None,
+    json_body: Any = None,
+    form: Optional[dict] = None,
+    timeout: float = 60,
+) -> tuple[int, Any, float]:
+    """Sends one request and returns (status, parsed body, elapsed seconds)."""
+    headers = {"Accept": "application/json"}
+    data = None
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    if json_body is not None:
+        data = json.dumps(json_body).encode()
+        headers["Content-Type"] = "application/json"
+    elif form is not None:
+        data = urllib.parse.urlencode(form).encode()
+        headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+    request = urllib.request.Request(url, data=data, headers=headers, method=method)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        body = error.read()
+        status = error.code
+    elapsed = time.perf_counter() - started
+
+    try:
+        parsed = json.loads(body) if body else None
+    except ValueError:
+        parsed = body
+    return status, parsed, elapsed
+
+
+def login(base_url: str, username: str, password: str) -> str:
+    status, body, _ = http_request(
+        "POST",
+        f"{base_url}/auth/login",
+        form={"username": username, "password": password},
+    )
+    if status != 200:
+        raise SystemExit(f"Login failed ({status}): {body}")
+    return body["data"]["access_token"]
+
+
+async def asgi_request(
+    app, method: str, path: str, headers: list[tuple[str, str]] = (), body: bytes = b""
+) -> tuple[int, list, bytes]:
+    """Calls an ASGI app in-process, without a server or network in between."""
+    path, _, query_string = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string.encode(),
+        "headers": [(key.lower().encode(), value.encode()) for key, value in headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    response = {"status": 0, "headers": [], "body": bytearray()}
+    disconnected = asyncio.Event()
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # The client stays connected until the response is complete
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        disconnected.set()
+    return response["status"], response["headers"], bytes(response["body"])
+
+
+class AsyncHTTPClient:
+    """
+    Minimal HTTP/1.1 keep-alive client on asyncio streams, so load generators
+    need no third-party packages. At most `max_connections` requests are in
+    flight; further requests wait for a free connection.
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 100, timeout: float = 30):
+        url = urllib.parse.urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.ssl = url.scheme == "https"
+        self.prefix = url.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        token: Optional[str] = None,
+        json_body: Any = None,
+        form: Optional[dict] = None,
+    ) -> tuple[int, Any]:
+        """Sends one request and returns (status, parsed body)."""
+        headers = {"Host": self.host, "Accept": "application/json", "Accept-Encoding": "identity"}
+        body = b""
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers["Content-Type"] = "application/json"
+        elif form is not None:
+            body = urllib.parse.urlencode(form).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        headers["Content-Length"] = str(len(body))
+        head = f"{method} {self.prefix}{path} HTTP/1.1\r\n" + "".join(
+            f"{key}: {value}\r\n" for key, value in headers.items()
+        )
+        payload = head.encode("latin-1") + b"\r\n" + body
+
+        async with self._slots:
+            status, response_headers, raw = await asyncio.wait_for(
+                self._exchange(payload), self.timeout
+            )
+
+        if "application/json" in response_headers.get("content-type", ""):
+            return status, json.loads(raw) if raw else None
+        return status, raw
+
+    async def _exchange(self, payload: bytes) -> tuple[int, dict, bytes]:
+        while self._idle:
+            # Idle connections may have been closed by the server; retry on a new one
+            connection = self._idle.pop()
+            try:
+                return await self._send(connection, payload)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection[1].close()
+        connection = await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+        return await self._send(connection, payload)
+
+    async def _send(self, connection, payload: bytes) -> tuple[int, dict, bytes]:
+        reader, writer = connection
+        try:
+            writer.write(payload)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionResetError("connection closed by server")
+            status = int(status_line.split()[1])
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            if headers.get("transfer-encoding") == "chunked":
+                chunks = []
+                while size := int((await reader.readline()).split(b";")[0], 16):
+                    chunks.append(await reader.readexactly(size))
+                    await reader.readline()
+                await reader.readline()
+                body = b"".join(chunks)
+            elif "content-length" in headers:
+                body = await reader.readexactly(int(headers["content-length"]))
+            else:
+                body = await reader.read()
+                headers["connection"] = "close"
+        except BaseException:
+            writer.close()
+            raise
+
+        if headers.get("connection", "").lower() == "close":
+            writer.close()
+        else:
+            self._idle.append(connection)
+        return status, headers, body
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
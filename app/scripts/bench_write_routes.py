@@ -0,0 +1,89 @@
+"""
+Measures latency of write routes against a running instance.
+
+Run it once per CONTRIBUTION_LOG_MODE (restarting the server in between) and
+compare the saved reports. It sends about six requests per iteration, so
+disable the rate limiter (RATE_LIMIT_ENABLED=false) on the server under test:
+
+    python -m app.scripts.bench_write_routes --label transaction --output tx.json
+    python -m app.scripts.bench_write_routes --label background --output bg.json
+"""
+
+import argparse
+import json
+from collections import defaultdict
+
+from app.scripts.bench_utils import http_request, login, print_table, summarize
+
+
+def run(
+    base_url: str, username: str, password: str, iterations: int
+) -> dict[str, list[float]]:
+    token = login(base_url, username, password)
+    latencies = defaultdict(list)
+
+    def timed(route: str, method: str, path: str, **kwargs):
+        status, body, elapsed = http_request(method, f"{base_url}{path}", token, **kwargs)
+        if status >= 400:
+            raise SystemExit(f"{method} {path} failed ({status}): {body}")
+        latencies[route].append(elapsed)
+        return body
+
+    for i in range(iterations):
+        ticket = timed(
+            "POST /it-tickets",
+            "POST",
+            "/it-tickets",
+            json_body={
+                "title": f"Benchmark ticket {i}",
+                "description": "Created by the write-route benchmark",
+            },
+        )["data"]
+        timed(
+            "PUT /it-tickets/{id}",
+            "PUT",
+            f"/it-tickets/{ticket['id']}",
+            json_body={"priority": "low"},
+        )
+        timed("DELETE /it-tickets/{id}", "DELETE", f"/it-tickets/{ticket['id']}")
+        timed(
+            "POST /contacts",
+            "POST",
+            "/contacts",
+            json_body={"name": f"Benchmark contact {i}"},
+        )
+        # Logout revokes the token it is called with, so it ends a session of its own
+        session_token = login(base_url, username, password)
+        status, body, elapsed = http_request(
+            "POST", f"{base_url}/auth/logout", session_token
+        )
+        if status >= 400:
+            raise SystemExit(f"POST /auth/logout failed ({status}): {body}")
+        latencies["POST /auth/logout"].append(elapsed)
+
+    return latencies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000/backend")
+    parser.add_argument("--username", default="manager")
+    parser.add_argument("--password", default="manager123")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    latencies = run(args.base_url, args.username, args.password, args.iterations)
+
+    report = {
+        "label": args.label,
+        "routes": {route: summarize(values) for route, values in latencies.items()},
+    }
+    print_table(
+        [{"route": route, **summary} for route, summary in report["routes"].items()],
+        ["route", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"],
+    )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
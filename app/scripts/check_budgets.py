@@ -0,0 +1,329 @@
+"""
+Per-endpoint performance budgets.
+
+Boots the app in-process against a throwaway Postgres (see
+ephemeral_postgres.py) and the in-memory object storage, seeds it with
+synthetic_data.generate, then calls every list, detail, analytics and export
+route `--iterations` times. Each route is checked against perf_budgets.json:
+
+    max_statements  SQL statements per request
+    max_rows        rows returned by those statements
+    p95_ms          p95 latency over the iterations
+
+A violation prints the diff between the recorded statement fingerprints and
+the current ones and the script exits 1. Every GET route must either have a
+budget or be listed in SKIPPED_ROUTES, so new endpoints cannot slip through.
+
+    python -m app.scripts.check_budgets                 # check
+    python -m app.scripts.check_budgets --record        # re-baseline
+    python -m app.scripts.check_budgets --only it_tickets.list
+"""
+
+import argparse
+import asyncio
+import difflib
+import json
+import math
+import re
+import sys
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.scripts.bench_utils import asgi_request, percentile, print_table
+from app.scripts.ephemeral_postgres import EphemeralPostgres
+
+BUDGETS_PATH = Path(__file__).with_name("perf_budgets.json")
+
+# name -> path; "{table}" placeholders are filled with a seeded id from that table
+ROUTES = {
+    "attendance.locations": "/attendance/locations",
+    "attendance.location": "/attendance/locations/{attendance_locations}",
+    "attendance.records": "/attendance/records",
+    "attendance.record": "/attendance/records/{attendance_records}",
+    "attendance.status": "/attendance/status",
+    "auth.me": "/auth/me",
+    "auth.employees": "/auth/employees",
+    "auth.employee": "/auth/employees/{users}",
+    "contacts.list": "/contacts",
+    "contacts.detail": "/contacts/{contacts}",
+    "contacts.options": "/contacts/utils/options",
+    "contacts.zones": "/contacts/utils/zones",
+    "contacts.export": "/contacts/export/csv",
+    "facilities.list": "/facilities",
+    "facilities.detail": "/facilities/{facilities}",
+    "facilities.options": "/facilities/utils/options",
+    "facilities.coordinates": "/facilities/{facilities}/coordinates",
+    "files.metadata": "/files/{files}/metadata",
+    "files.download": "/files/{files}/download",
+    "files.image": "/files/{files}/image?width=320",
+    "hazard_observations.list": "/hazard-observations",
+    "hazard_observations.detail": "/hazard-observations/{hazard_observations}",
+    "hazard_observations.export": "/hazard-observations/export/csv",
+    "hazard_observations.analytics": "/hazard-observations/analytics/summary",
+    "inventory.list": "/inventory",
+    "inventory.detail": "/inventory/{inventory}",
+    "inventory.options": "/inventory/utils/options",
+    "it_tickets.list": "/it-tickets",
+    "it_tickets.detail": "/it-tickets/{it_tickets}",
+    "it_tickets.export": "/it-tickets/export/csv",
+    "it_tickets.analytics": "/it-tickets/analytics/summary",
+}
+
+# GET routes deliberately without a budget
+SKIPPED_ROUTES = {
+    "/files/upload-url",  # inserts a pending file record
+    "/metrics",
+    "/monitoring/sql-stats",
+    "/monitoring/admission",
+    "/monitoring/loop-blocks",
+    "/monitoring/profiles",
+    "/monitoring/profiles/{profile_id}",
+    "/monitoring/memory",
+    "/monitoring/memory/routes",
+    "/monitoring/memory/snapshots/{snapshot_id}",
+    "/monitoring/memory/diff",
+}
+
+
+class StatementRecorder:
+    """Collects (fingerprint, rows) for every statement while active."""
+
+    def __init__(self):
+        self.active = False
+        self.statements: list[tuple[str, int]] = []
+
+    def install(self, engine):
+        from app.core.database.statements import fingerprint
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if self.active:
+                rows = max(cursor.rowcount, 0) if cursor.description is not None else 0
+                self.statements.append((fingerprint(statement), rows))
+
+    def start(self):
+        self.statements = []
+        self.active = True
+
+    def stop(self) -> list[tuple[str, int]]:
+        self.active = False
+        return self.statements
+
+
+def uncovered_routes(app) -> list[str]:
+    from fastapi.routing import APIRoute
+
+    covered = {path.split("?")[0] for path in ROUTES.values()}
+    covered = {
+        "/".join("{}" if part.startswith("{") else part for part in path.split("/"))
+        for path in covered
+    }
+    missing = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        shape = "/".join("{}" if part.startswith("{") else part for part in route.path.split("/"))
+        if shape not in covered and route.path not in SKIPPED_ROUTES:
+            missing.append(route.path)
+    return missing
+
+
+def resolve(path: str, ids: dict) -> str:
+    def placeholder(match):
+        values = ids.get(match.group(1))
+        return values[len(values) // 2] if isinstance(values, list) else match.group(0)
+
+    return re.sub(r"\{(\w+)\}", placeholder, path)
+
+
+async def measure(app, recorder: StatementRecorder, path: str, token: str, iterations: int) -> dict:
+    headers = [("Authorization", f"Bearer {token}")]
+    # Warm-up: first-use costs (compiled statement cache, imports) are not budgeted
+    status, _, body = await asgi_request(app, "GET", path, headers)
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}: {body[:300]!r}")
+
+    latencies, statement_counts, row_counts = [], [], []
+    statements: list[str] = []
+    for _ in range(iterations):
+        recorder.start()
+        started = asyncio.get_running_loop().time()
+        status, _, body = await asgi_request(app, "GET", path, headers)
+        latencies.append(asyncio.get_running_loop().time() - started)
+        recorded = recorder.stop()
+        if status != 200:
+            raise RuntimeError(f"GET {path} returned {status}: {body[:300]!r}")
+        statement_counts.append(len(recorded))
+        row_counts.append(sum(rows for _, rows in recorded))
+        if len(recorded) >= len(statements):
+            statements = [statement for statement, _ in recorded]
+
+    return {
+        "statements": max(statement_counts),
+        "rows": max(row_counts),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "fingerprints": statements,
+    }
+
+
+def check(result: dict, budget: dict) -> list[str]:
+    violations = []
+    if result["statements"] > budget["max_statements"]:
+        violations.append(f"statements {result['statements']} > {budget['max_statements']}")
+    if result["rows"] > budget["max_rows"]:
+        violations.append(f"rows {result['rows']} > {budget['max_rows']}")
+    if result["p95_ms"] > budget["p95_ms"]:
+        violations.append(f"p95 {result['p95_ms']}ms > {budget['p95_ms']}ms")
+    return violations
+
+
+def statement_diff(budget: dict, result: dict) -> str:
+    return "\n".join(
+        difflib.unified_diff(
+            budget.get("statements", []),
+            result["fingerprints"],
+            fromfile="budget",
+            tofile="current",
+            lineterm="",
+        )
+    )
+
+
+def budget_from(result: dict, args) -> dict:
+    return {
+        # Statement counts are deterministic for a given seed: no headroom
+        "max_statements": result["statements"],
+        "max_rows": math.ceil(result["rows"] * args.rows_headroom),
+        "p95_ms": round(max(result["p95_ms"] * args.latency_headroom, result["p95_ms"] + 5), 1),
+        "statements": result["fingerprints"],
+    }
+
+
+async def run(args, app, recorder, ids: dict, token: str) -> int:
+    budgets = {} if args.record else json.loads(args.budgets.read_text())
+    if not args.record and (budgets.get("scale"), budgets.get("seed")) != (args.scale, args.seed):
+        print(
+            f"{args.budgets} was recorded with scale={budgets.get('scale')} "
+            f"seed={budgets.get('seed')}; pass the same values or --record"
+        )
+        return 1
+
+    failed = False
+    missing = uncovered_routes(app)
+    if missing and not args.only:
+        failed = True
+        print("GET routes without a budget (add to ROUTES or SKIPPED_ROUTES):")
+        for path in missing:
+            print(f"  {path}")
+
+    routes = {name: path for name, path in ROUTES.items() if not args.only or name in args.only}
+    rows, recorded = [], {}
+    for name, path in routes.items():
+        result = await measure(app, recorder, resolve(path, ids), token, args.iterations)
+        row = {"route": name, **{key: result[key] for key in ("statements", "rows", "p95_ms")}}
+
+        if args.record:
+            recorded[name] = budget_from(result, args)
+            row["status"] = "recorded"
+        elif name not in budgets.get("routes", {}):
+            failed = True
+            row["status"] = "NO BUDGET"
+        else:
+            budget = budgets["routes"][name]
+            violations = check(result, budget)
+            row["status"] = "ok" if not violations else "FAIL: " + "; ".join(violations)
+            if violations:
+                failed = True
+                diff = statement_diff(budget, result)
+                print(f"\n{name} ({path}): {'; '.join(violations)}")
+                print(diff or "(same statements; only rows or latency changed)")
+        rows.append(row)
+
+    print()
+    print_table(rows, ["route", "statements", "rows", "p95_ms", "status"])
+
+    if args.record:
+        if args.only and args.budgets.exists():
+            existing = json.loads(args.budgets.read_text())
+            recorded = {**existing.get("routes", {}), **recorded}
+        document = {
+            "scale": args.scale,
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "routes": dict(sorted(recorded.items())),
+        }
+        args.budgets.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"\nBudgets written to {args.budgets}")
+        return 0
+    return 1 if failed else 0
+
+
+@contextmanager
+def seeded_app(scale: float, seed: int, use_cluster: bool = True):
+    """
+    Yields (app, engine, ids, token): the app on a throwaway database loaded
+    with synthetic_data at `scale`, its ids and a manager's bearer token.
+    """
+    with EphemeralPostgres(settings, use_cluster=use_cluster) as postgres:
+        postgres.configure(settings)
+        settings.S3_BACKEND = "memory"
+        settings.QUERY_DETECTOR_MODE = "off"
+        settings.REQUEST_LOG_ENABLED = False
+        settings.RATE_LIMIT_ENABLED = False
+        # Sampled EXPLAINs and slow-request logs would skew and flood the run
+        settings.SQL_PROFILER_ENABLED = False
+        settings.SLOW_REQUEST_THRESHOLD_SECONDS = 0
+
+        # Imported only now: the engine and storage client are built at import time
+        from app.core import models  # noqa: F401  registers every table
+        from app.core.database import Base, sessionmanager
+        from app.core.main import app
+        from app.api.auth.models import User
+        from app.core.security import create_access_token, principal_claims, pwd_context
+        from app.scripts.synthetic_data import generate
+
+        engine = sessionmanager._engine
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            ids = generate(connection, scale, seed, pwd_context.hash("perf"))
+
+        with sessionmanager.session() as session:
+            manager = session.get(User, uuid.UUID(str(ids["manager_id"])))
+            token = create_access_token(data=principal_claims(manager))
+        try:
+            yield app, engine, ids, token
+        finally:
+            sessionmanager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--record", action="store_true", help="write budgets instead of checking")
+    parser.add_argument("--only", nargs="*", help="route names to run (see ROUTES)")
+    parser.add_argument("--iterations", type=int, default=20)
+    # 1% of production volumes (synthetic_data.VOLUMES) keeps a full run to a minute or so
+    parser.add_argument("--scale", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--budgets", type=Path, default=BUDGETS_PATH)
+    parser.add_argument("--rows-headroom", type=float, default=1.1)
+    parser.add_argument("--latency-headroom", type=float, default=2.0)
+    parser.add_argument(
+        "--no-cluster",
+        action="store_true",
+        help="use a temporary database on the DB_* server even if initdb is available",
+    )
+    args = parser.parse_args()
+
+    with seeded_app(args.scale, args.seed, use_cluster=not args.no_cluster) as (app, engine, ids, token):
+        recorder = StatementRecorder()
+        recorder.install(engine)
+        status = asyncio.run(run(args, app, recorder, ids, token))
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Query plan snapshots for the list, analytics and export queries.
+
+Calls each entry in CATALOG in-process against a throwaway database seeded by
+synthetic_data (see check_budgets.seeded_app), captures the SELECT statements
+it runs with their parameters, and EXPLAINs them (FORMAT JSON). The plan
+shape, meaning node types, scanned relations, index names and join strategies
+but not costs or row estimates, is compared with plan_snapshots.json.
+
+A sequential scan on a table with at least `--large-table-rows` rows that the
+entry's snapshot did not have fails the run (exit 1). Other shape changes, and
+statements whose text no longer matches the snapshot, are printed and only
+fail with `--strict`. Seq scans already in the snapshot are listed as known
+so they stay visible.
+
+    python -m app.scripts.check_plans                   # check
+    python -m app.scripts.check_plans --record          # re-snapshot
+    python -m app.scripts.check_plans --only it_tickets.filter_status --verbose
+"""
+
+import argparse
+import asyncio
+import difflib
+import json
+import sys
+from pathlib import Path
+from urllib.parse import urlencode
+
+from sqlalchemy import event, text
+
+from app.scripts.bench_utils import asgi_request, print_table
+from app.scripts.check_budgets import resolve, seeded_app
+
+SNAPSHOTS_PATH = Path(__file__).with_name("plan_snapshots.json")
+
+
+def listing(path: str, filters: dict = None, sort: str = None, **params) -> str:
+    """A get_paginated_data URL: `filters` is {column: value} in the client's filter format."""
+    if filters:
+        params["filter"] = json.dumps(
+            {str(index): {"name": name, "value": value} for index, (name, value) in enumerate(filters.items())}
+        )
+    if sort:
+        params["sort"] = sort
+    # Braces stay unescaped so check_budgets.resolve can fill "{table}" placeholders
+    return f"{path}?{urlencode(params, safe='{}')}" if params else path
+
+
+# name -> path; "{table}" placeholders are filled with a seeded id from that table
+CATALOG = {
+    # get_paginated_data + apply_filters
+    "it_tickets.list": listing("/it-tickets"),
+    "it_tickets.filter_status": listing("/it-tickets", {"status": "open"}),
+    "it_tickets.filter_priority_title": listing("/it-tickets", {"priority": "high", "title": "laptop"}),
+    "it_tickets.sort_priority_deep_page": listing("/it-tickets", sort="priority:asc", page=20),
+    "it_tickets.filter_reporter": listing("/it-tickets", {"reporter_id": "{users}"}),
+    "hazard_observations.list": listing("/hazard-observations"),
+    "hazard_observations.filter_date_range": listing(
+        "/hazard-observations", {"observation_date": "2025-03-01 to 2025-03-31"}
+    ),
+    "hazard_observations.filter_facility": listing("/hazard-observations", {"facility_id": "{facilities}"}),
+    "attendance.records": listing("/attendance/records"),
+    "attendance.records_filter_user": listing("/attendance/records", {"user_id": "{users}"}),
+    "attendance.records_filter_status": listing(
+        "/attendance/records", {"status": "CHECKED_IN"}, sort="check_in_time:desc"
+    ),
+    "contacts.list": listing("/contacts"),
+    "contacts.filter_regional_name": listing("/contacts", {"regional": "2-3", "name": "an"}),
+    "inventory.list": listing("/inventory"),
+    "inventory.filter_category": listing("/inventory", {"item_category": "PPE"}, sort="item_name:asc"),
+    "facilities.list": listing("/facilities"),
+    "auth.employees": listing("/auth/employees", {"department": "QA"}),
+    # analytics aggregates
+    "it_tickets.analytics": "/it-tickets/analytics/summary",
+    "hazard_observations.analytics": "/hazard-observations/analytics/summary",
+    # exports
+    "contacts.export": "/contacts/export/csv",
+    "it_tickets.export": "/it-tickets/export/csv",
+    "hazard_observations.export": "/hazard-observations/export/csv",
+}
+
+
+class PlanCapture:
+    """Collects (statement, parameters) for every SELECT while active."""
+
+    def __init__(self):
+        self.active = False
+        self.statements: list[tuple[str, object]] = []
+
+    def install(self, engine):
+        @event.listens_for(engine, "after_cursor_execute")
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            if self.active and not executemany and statement.lstrip()[:6].upper() in ("SELECT", "WITH "):
+                self.statements.append((statement, parameters))
+
+    def start(self):
+        self.statements = []
+        self.active = True
+
+    def stop(self) -> list[tuple[str, object]]:
+        self.active = False
+        return self.statements
+
+
+def outline(node: dict, depth: int = 0, lines: list[str] = None) -> list[str]:
+    """Plan tree as indented node labels, without costs or estimates."""
+    lines = [] if lines is None else lines
+    label = node["Node Type"]
+    if node.get("Parallel Aware"):
+        label = f"Parallel {label}"
+    if "Join Type" in node:
+        label += f" ({node['Join Type']})"
+    if node.get("Strategy") and node["Node Type"] in ("Aggregate", "SetOp"):
+        label += f" ({node['Strategy']})"
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+    lines.append("  " * depth + label)
+    for child in node.get("Plans", []):
+        outline(child, depth + 1, lines)
+    return lines
+
+
+def seq_scans(shape: list[str]) -> set[str]:
+    return {
+        line.rsplit(" on ", 1)[1]
+        for line in shape
+        if line.strip().removeprefix("Parallel ").startswith("Seq Scan on ")
+    }
+
+
+def explain(engine, statement: str, parameters) -> list[str]:
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            (plan,) = cursor.fetchone()
+    finally:
+        connection.close()
+    return outline(plan[0]["Plan"])
+
+
+def table_sizes(engine) -> dict[str, int]:
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text(
+                "SELECT relname, reltuples::bigint FROM pg_class "
+                "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+            )
+        )
+        return {name: max(rows, 0) for name, rows in rows}
+
+
+async def capture_plans(app, engine, capture: PlanCapture, path: str, token: str) -> list[dict]:
+    from app.core.database.statements import fingerprint
+
+    status, _, body = await asgi_request(app, "GET", path, [("Authorization", f"Bearer {token}")])
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}: {body[:300]!r}")
+    capture.start()
+    await asgi_request(app, "GET", path, [("Authorization", f"Bearer {token}")])
+    statements = capture.stop()
+
+    plans, seen = [], set()
+    for statement, parameters in statements:
+        key = fingerprint(statement)
+        if key in seen:
+            continue
+        seen.add(key)
+        plans.append({"statement": key, "shape": explain(engine, statement, parameters)})
+    return plans
+
+
+def compare(
+    plans: list[dict], snapshot: list[dict], large: set[str]
+) -> tuple[list[str], bool, bool]:
+    """
+    Returns (regressions, shape changed, statement text changed) for one
+    catalog entry. Seq scans are compared per entry rather than per statement,
+    so a statement whose text changed (a column added to the select list, say)
+    does not turn the entry's known seq scans into new ones.
+    """
+    known_scans = set().union(*(seq_scans(plan["shape"]) for plan in snapshot))
+    current_scans = set().union(*(seq_scans(plan["shape"]) for plan in plans))
+    new_scans = (current_scans & large) - known_scans
+    regressions = [f"seq scan on {table}" for table in sorted(new_scans)]
+
+    recorded = {plan["statement"]: plan["shape"] for plan in snapshot}
+    changed = renamed = False
+    for plan in plans:
+        if plan["statement"] not in recorded:
+            renamed = True
+        elif recorded[plan["statement"]] != plan["shape"]:
+            changed = True
+    if len(plans) != len(snapshot):
+        renamed = True
+    return regressions, changed, renamed
+
+
+def shape_diff(snapshot: list[dict], plans: list[dict]) -> str:
+    def render(entries):
+        lines = []
+        for entry in entries:
+            lines.append(entry["statement"][:160])
+            lines.extend("  " + line for line in entry["shape"])
+        return lines
+
+    return "\n".join(
+        difflib.unified_diff(render(snapshot), render(plans), "snapshot", "current", lineterm="")
+    )
+
+
+async def run(args, app, engine, ids: dict, token: str) -> int:
+    snapshots = {} if args.record else json.loads(args.snapshots.read_text())
+    if not args.record and (snapshots.get("scale"), snapshots.get("seed")) != (args.scale, args.seed):
+        print(
+            f"{args.snapshots} was recorded with scale={snapshots.get('scale')} "
+            f"seed={snapshots.get('seed')}; pass the same values or --record"
+        )
+        return 1
+
+    sizes = table_sizes(engine)
+    large = {table for table, rows in sizes.items() if rows >= args.large_table_rows}
+    capture = PlanCapture()
+    capture.install(engine)
+
+    failed = False
+    rows, recorded = [], {}
+    catalog = {name: path for name, path in CATALOG.items() if not args.only or name in args.only}
+    for name, path in catalog.items():
+        plans = await capture_plans(app, engine, capture, resolve(path, ids), token)
+        scans = set().union(*(seq_scans(plan["shape"]) for plan in plans)) & large
+        row = {"query": name, "statements": len(plans), "large_seq_scans": ", ".join(sorted(scans))}
+
+        if args.record:
+            recorded[name] = {"path": path, "plans": plans}
+            row["status"] = "recorded"
+        elif name not in snapshots.get("queries", {}):
+            failed = True
+            row["status"] = "NO SNAPSHOT"
+        else:
+            snapshot = snapshots["queries"][name]["plans"]
+            regressions, changed, renamed = compare(plans, snapshot, large)
+            if regressions:
+                failed = True
+                row["status"] = "FAIL: " + "; ".join(sorted(set(regressions)))
+            elif changed or renamed:
+                failed = failed or args.strict
+                row["status"] = "changed" if changed else "statement changed, re-record"
+            else:
+                row["status"] = "ok"
+            if regressions or (changed and args.verbose):
+                print(f"\n{name} ({path}): {row['status']}")
+                print(shape_diff(snapshot, plans))
+        if args.verbose and args.record:
+            print(f"\n{name} ({path})")
+            print(shape_diff([], plans))
+        rows.append(row)
+
+    print()
+    print_table(rows, ["query", "statements", "large_seq_scans", "status"])
+    print(
+        f"\nLarge tables (>= {args.large_table_rows} rows): "
+        + ", ".join(f"{table} ({sizes[table]})" for table in sorted(large))
+    )
+
+    if args.record:
+        if args.only and args.snapshots.exists():
+            existing = json.loads(args.snapshots.read_text())
+            recorded = {**existing.get("queries", {}), **recorded}
+        document = {
+            "scale": args.scale,
+            "seed": args.seed,
+            "queries": dict(sorted(recorded.items())),
+        }
+        args.snapshots.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"\nSnapshots written to {args.snapshots}")
+        return 0
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--record", action="store_true", help="write snapshots instead of checking")
+    parser.add_argument("--only", nargs="*", help="catalog entries to run (see CATALOG)")
+    parser.add_argument("--strict", action="store_true", help="fail on any plan shape change")
+    parser.add_argument("--verbose", action="store_true", help="print every changed or recorded plan")
+    # Big enough that the planner's choices resemble production's on the larger tables
+    parser.add_argument("--scale", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--large-table-rows", type=int, default=5000)
+    parser.add_argument("--snapshots", type=Path, default=SNAPSHOTS_PATH)
+    parser.add_argument(
+        "--no-cluster",
+        action="store_true",
+        help="use a temporary database on the DB_* server even if initdb is available",
+    )
+    args = parser.parse_args()
+
+    with seeded_app(args.scale, args.seed, use_cluster=not args.no_cluster) as (app, engine, ids, token):
+        status = asyncio.run(run(args, app, engine, ids, token))
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
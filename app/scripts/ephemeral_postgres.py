@@ -0,0 +1,132 @@
+"""
+Throwaway Postgres databases for performance scripts.
+
+With `initdb`/`pg_ctl` available (PG_BIN or PATH), a private cluster is
+created in a temporary directory on a free port, tuned for speed over
+durability, and removed on exit. Otherwise a temporary database is created on
+the server from the DB_* settings and dropped on exit.
+
+    with EphemeralPostgres() as postgres:
+        postgres.configure(settings)  # before app.core.database is imported
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import psycopg2
+
+DB_USER = "tse"
+DB_NAME = "tse"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def find_pg_bin() -> Optional[Path]:
+    candidates = [os.environ.get("PG_BIN")] if os.environ.get("PG_BIN") else []
+    initdb = shutil.which("initdb")
+    if initdb:
+        candidates.append(str(Path(initdb).parent))
+    for candidate in candidates:
+        path = Path(candidate)
+        if (path / "initdb").exists() and (path / "pg_ctl").exists():
+            return path
+    return None
+
+
+class EphemeralPostgres:
+    def __init__(self, server_settings=None, use_cluster: bool = True):
+        # server_settings: used for the temporary-database fallback
+        self.server_settings = server_settings
+        self.pg_bin = find_pg_bin() if use_cluster else None
+        self.host = self.port = self.user = self.password = self.database = None
+        self._workdir: Optional[str] = None
+
+    def __enter__(self):
+        if self.pg_bin is not None and os.geteuid() != 0:
+            self._start_cluster()
+        else:
+            self._create_database()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._workdir is not None:
+            self._run("pg_ctl", "-D", self._data_dir, "-m", "immediate", "-w", "stop")
+            shutil.rmtree(self._workdir, ignore_errors=True)
+        else:
+            self._drop_database()
+
+    @property
+    def _data_dir(self) -> str:
+        return os.path.join(self._workdir, "data")
+
+    def _run(self, program: str, *args: str):
+        subprocess.run(
+            [str(self.pg_bin / program), *args],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+
+    def _start_cluster(self):
+        self._workdir = tempfile.mkdtemp(prefix="tse-pg-")
+        self.host, self.port = "127.0.0.1", _free_port()
+        self.user, self.password, self.database = DB_USER, "", "postgres"
+
+        self._run("initdb", "-D", self._data_dir, "-U", DB_USER, "-A", "trust", "-E", "UTF8", "--no-sync")
+        options = (
+            f"-p {self.port} -k {self._workdir} -c listen_addresses={self.host} "
+            "-c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+        )
+        self._run(
+            "pg_ctl", "-D", self._data_dir, "-o", options,
+            "-l", os.path.join(self._workdir, "postgres.log"), "-w", "start",
+        )
+        self._admin(f'CREATE DATABASE "{DB_NAME}"')
+        self.database = DB_NAME
+
+    def _create_database(self):
+        server = self.server_settings
+        if server is None:
+            raise RuntimeError("No initdb found and no server settings for a temporary database")
+        self.host, self.port = server.DB_SERVER, server.DB_PORT
+        self.user, self.password = server.DB_USER, server.DB_PASSWORD
+        self.database = "postgres"
+        name = f"tse_perf_{os.getpid()}"
+        self._admin(f'CREATE DATABASE "{name}"')
+        self.database = name
+
+    def _drop_database(self):
+        name, self.database = self.database, "postgres"
+        self._admin(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+
+    def _admin(self, statement: str):
+        connection = psycopg2.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            dbname="postgres",
+        )
+        connection.autocommit = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(statement)
+        finally:
+            connection.close()
+
+    def configure(self, settings):
+        """Points the app settings at this database; call before importing app.core.database."""
+        settings.DB_SERVER = self.host
+        settings.DB_PORT = self.port
+        settings.DB_USER = self.user
+        settings.DB_PASSWORD = self.password or ""
+        settings.DB_DB = self.database
@@ -0,0 +1,355 @@
+"""
+Open-loop load scenarios against a running stack.
+
+Requests arrive as a Poisson process at `--rate` per second for `--duration`
+seconds, whether or not earlier requests have finished, so a slow server
+builds a queue instead of slowing the generator down (no coordinated
+omission). Latency is measured from each arrival, including time spent
+waiting for one of the `--connections` client connections.
+
+Scenarios:
+
+    shift-start   employees check in (QR + geofence validation), then poll
+                  their attendance status
+    end-of-day    employees check out while managers load the dashboards
+                  (ticket and hazard analytics, attendance records)
+    office-hours  ticket list and detail browsing; each detail view also
+                  requests image URLs for the ticket's photos
+
+Employee accounts come from synthetic_data (employee000001, ...) and share the
+password the data was generated with; `--users` must not exceed the generated
+user count. Logging them in and resetting their
+attendance state happens before the measured run. Start the target with
+RATE_LIMIT_ENABLED=false (or raised limits) unless the limits are under test:
+a handful of users at these rates exhaust their buckets and get 429s.
+
+    python -m app.scripts.load_test shift-start --rate 50 --duration 60 --ramp-up 20
+    python -m app.scripts.load_test office-hours --rate 100 --output office.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import defaultdict, deque
+
+from app.scripts.bench_utils import AsyncHTTPClient, print_table, summarize
+
+DASHBOARD_PATHS = [
+    ("GET /it-tickets/analytics/summary", "/it-tickets/analytics/summary"),
+    ("GET /hazard-observations/analytics/summary", "/hazard-observations/analytics/summary"),
+    ("GET /attendance/records", "/attendance/records?page=1&limit=20"),
+]
+
+
+class SetupError(Exception):
+    pass
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.skipped = 0
+        self.lateness: list[float] = []
+
+    def record(self, route: str, status: int, elapsed: float):
+        self.latencies[route].append(elapsed)
+        self.statuses[route][status] += 1
+        if status == 0 or status >= 400:
+            self.errors[route] += 1
+
+    def report(self, wall_time: float, samples: bool = False) -> dict:
+        routes = {}
+        for route, latencies in sorted(self.latencies.items()):
+            count = len(latencies)
+            routes[route] = {
+                **summarize(latencies),
+                "rps": round(count / wall_time, 2),
+                "errors": self.errors[route],
+                "error_rate": round(self.errors[route] / count * 100, 2),
+                "statuses": dict(self.statuses[route]),
+            }
+            if samples:
+                routes[route]["samples_ms"] = [round(value * 1000, 3) for value in latencies]
+        return {
+            "wall_time_s": round(wall_time, 2),
+            "skipped_arrivals": self.skipped,
+            "generator_late_p99_ms": round(
+                sorted(self.lateness)[int(len(self.lateness) * 0.99)] * 1000, 3
+            )
+            if self.lateness
+            else 0.0,
+            "routes": routes,
+        }
+
+
+class Scenario:
+    def __init__(self, client: AsyncHTTPClient, stats: LoadStats, args):
+        self.client = client
+        self.stats = stats
+        self.args = args
+        self.rng = random.Random(args.seed)
+
+    async def call(self, route: str, method: str, path: str, token: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            status, body = await self.client.request(method, path, token, **kwargs)
+        except (OSError, asyncio.TimeoutError, ValueError):
+            status, body = 0, None
+        self.stats.record(route, status, time.perf_counter() - started)
+        return status, body
+
+    async def login(self, username: str) -> str:
+        status, body = await self.client.request(
+            "POST", "/auth/login", form={"username": username, "password": self.args.password}
+        )
+        if status != 200:
+            raise SetupError(f"Login failed for {username} ({status}): {body}")
+        return body["data"]["access_token"]
+
+    async def login_employees(self) -> list[str]:
+        usernames = [f"employee{index:06d}" for index in range(1, self.args.users + 1)]
+        # bcrypt makes logins expensive; a few at a time keeps setup from timing out
+        slots = asyncio.Semaphore(4)
+
+        async def login(username):
+            async with slots:
+                return await self.login(username)
+
+        return list(await asyncio.gather(*(login(username) for username in usernames)))
+
+    async def setup(self):
+        self.manager_token = await self.login(self.args.manager)
+
+    async def fire(self):
+        raise NotImplementedError
+
+
+class AttendanceScenario(Scenario):
+    async def setup(self):
+        await super().setup()
+        status, body = await self.client.request(
+            "GET", "/attendance/locations?active_only=true&limit=1000", self.manager_token
+        )
+        self.locations = body["data"]["data"]
+        if not self.locations:
+            raise SetupError("No active attendance locations; load synthetic data first")
+        self.tokens = await self.login_employees()
+
+    def position(self, location: dict) -> tuple[float, float]:
+        """A point inside the location's geofence (within half its radius)."""
+        distance = self.rng.uniform(0, location["radius_meters"] / 2)
+        bearing = self.rng.uniform(0, 2 * math.pi)
+        latitude = location["latitude"] + distance * math.cos(bearing) / 111_320
+        longitude = location["longitude"] + distance * math.sin(bearing) / (
+            111_320 * max(math.cos(math.radians(location["latitude"])), 0.01)
+        )
+        return latitude, longitude
+
+    async def active_record(self, token: str):
+        _, body = await self.client.request("GET", "/attendance/status", token)
+        return body["data"]["active_check_in"]
+
+    async def check_in(self, token: str, route: str = None):
+        location = self.rng.choice(self.locations)
+        latitude, longitude = self.position(location)
+        json_body = {
+            "location_id": location["id"],
+            "qr_code_data": location["qr_code_data"],
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+        if route is None:
+            return await self.client.request("POST", "/attendance/check-in", token, json_body=json_body)
+        return await self.call(route, "POST", "/attendance/check-in", token, json_body=json_body)
+
+    def check_out_body(self, record: dict) -> dict:
+        latitude, longitude = self.position(
+            next(
+                (item for item in self.locations if item["id"] == record["location_id"]),
+                self.locations[0],
+            )
+        )
+        return {"attendance_record_id": record["id"], "latitude": latitude, "longitude": longitude}
+
+
+class ShiftStart(AttendanceScenario):
+    async def setup(self):
+        await super().setup()
+        # Everyone starts checked out; the data can hold several forgotten check-outs per user
+        for token in self.tokens:
+            while record := await self.active_record(token):
+                await self.client.request(
+                    "POST", "/attendance/check-out", token, json_body=self.check_out_body(record)
+                )
+        self.ready = deque(self.tokens)
+
+    async def fire(self):
+        if not self.ready:
+            self.stats.skipped += 1
+            return
+        token = self.ready.popleft()
+        status, _ = await self.check_in(token, "POST /attendance/check-in")
+        if status == 200:
+            await self.call("GET /attendance/status", "GET", "/attendance/status", token)
+
+
+class EndOfDay(AttendanceScenario):
+    async def setup(self):
+        await super().setup()
+        # Everyone starts checked in
+        self.ready = deque()
+        for token in self.tokens:
+            record = await self.active_record(token)
+            if not record:
+                _, body = await self.check_in(token)
+                record = body["data"]
+            self.ready.append((token, record))
+
+    async def fire(self):
+        if self.rng.random() < self.args.dashboard_share:
+            route, path = self.rng.choice(DASHBOARD_PATHS)
+            await self.call(route, "GET", path, self.manager_token)
+            return
+        if not self.ready:
+            self.stats.skipped += 1
+            return
+        token, record = self.ready.popleft()
+        await self.call(
+            "POST /attendance/check-out",
+            "POST",
+            "/attendance/check-out",
+            token,
+            json_body=self.check_out_body(record),
+        )
+
+
+class OfficeHours(Scenario):
+    async def setup(self):
+        await super().setup()
+        self.tokens = [self.manager_token]
+        status, body = await self.client.request("GET", "/it-tickets?page=1&limit=100", self.manager_token)
+        self.ticket_ids = [ticket["id"] for ticket in body["data"]["data"]]
+        self.last_page = max(1, body["data"]["meta"]["lastPage"] // 10)
+        if not self.ticket_ids:
+            raise SetupError("No tickets to browse; load synthetic data first")
+
+    async def fire(self):
+        if self.rng.random() < self.args.list_share:
+            page = self.rng.randint(1, self.last_page)
+            await self.call(
+                "GET /it-tickets", "GET", f"/it-tickets?page={page}&limit=10", self.manager_token
+            )
+            return
+
+        ticket_id = self.rng.choice(self.ticket_ids)
+        status, body = await self.call(
+            "GET /it-tickets/{id}", "GET", f"/it-tickets/{ticket_id}", self.manager_token
+        )
+        if status != 200:
+            return
+        # Thumbnails load in parallel once the detail view renders
+        photos = (body["data"].get("photo_file_ids") or [])[:4]
+        await asyncio.gather(
+            *(
+                self.call(
+                    "GET /files/{id}/image",
+                    "GET",
+                    f"/files/{photo_id}/image?width=320",
+                    self.manager_token,
+                )
+                for photo_id in photos
+            )
+        )
+
+
+SCENARIOS = {"shift-start": ShiftStart, "end-of-day": EndOfDay, "office-hours": OfficeHours}
+
+
+async def open_loop(fire, stats: LoadStats, rate: float, duration: float, ramp_up: float, rng):
+    """Poisson arrivals at `rate`/s (ramping linearly over `ramp_up` seconds) for `duration` seconds."""
+    loop = asyncio.get_running_loop()
+    start = next_at = loop.time()
+    tasks = set()
+    while True:
+        next_at += rng.expovariate(rate)
+        elapsed = next_at - start
+        if elapsed > duration:
+            break
+        # Thinning: during the ramp an arrival survives with probability rate(t)/rate
+        if ramp_up and elapsed < ramp_up and rng.random() > elapsed / ramp_up:
+            continue
+        delay = next_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            stats.lateness.append(-delay)
+        task = asyncio.create_task(fire())
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+    return loop.time() - start
+
+
+async def run(args) -> dict:
+    stats = LoadStats()
+    client = AsyncHTTPClient(args.base_url, max_connections=args.connections, timeout=args.timeout)
+    scenario = SCENARIOS[args.scenario](client, stats, args)
+    try:
+        print(f"Setting up {args.scenario}...")
+        await scenario.setup()
+        print(f"Running {args.rate}/s for {args.duration}s")
+        wall_time = await open_loop(
+            scenario.fire, stats, args.rate, args.duration, args.ramp_up, random.Random(args.seed)
+        )
+    finally:
+        await client.close()
+    return {"scenario": args.scenario, "rate": args.rate, "label": args.label, **stats.report(wall_time)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("scenario", choices=SCENARIOS)
+    parser.add_argument("--base-url", default="http://localhost:8000/backend")
+    parser.add_argument("--rate", type=float, default=20, help="arrivals per second")
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--ramp-up", type=float, default=0, help="seconds to reach --rate")
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--users", type=int, default=200, help="employee accounts to log in")
+    parser.add_argument("--manager", default="perf-manager")
+    parser.add_argument("--password", default="manager123")
+    parser.add_argument("--dashboard-share", type=float, default=0.2, help="end-of-day only")
+    parser.add_argument("--list-share", type=float, default=0.4, help="office-hours only")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    try:
+        report = asyncio.run(run(args))
+    except SetupError as exc:
+        sys.exit(str(exc))
+    print_table(
+        [{"route": route, **summary} for route, summary in report["routes"].items()],
+        ["route", "count", "rps", "error_rate", "p50_ms", "p95_ms", "p99_ms", "max_ms"],
+    )
+    print(
+        f"\nwall time {report['wall_time_s']}s, skipped arrivals {report['skipped_arrivals']}, "
+        f"generator lateness p99 {report['generator_late_p99_ms']}ms"
+    )
+    if report["skipped_arrivals"]:
+        print("Some arrivals found no idle employee; raise --users or lower --rate/--duration")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Microbenchmarks for hot helpers that need no running services.
+
+Each benchmark is timed over `--repeat` rounds of an auto-sized loop and
+reported per call. Results are compared with the stored baselines in
+microbench_baselines.json on the fastest round, which is the least sensitive
+to scheduler noise; one slower than `--threshold` percent is a regression and
+the script exits 1.
+
+    python -m app.scripts.microbench                    # compare with baselines
+    python -m app.scripts.microbench --save             # store new baselines
+    python -m app.scripts.microbench -k imgproxy --repeat 9
+    python -m app.scripts.microbench --baseline /tmp/main.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from app.core.config import settings
+
+BASELINES_PATH = Path(__file__).with_name("microbench_baselines.json")
+
+# name -> factory; the factory does the setup and returns the callable to time
+BENCHMARKS: dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+@benchmark("imgproxy.build_url")
+def _imgproxy_build_url():
+    from app.core.imgproxy import ImgProxy
+
+    def run():
+        return ImgProxy.from_s3(
+            bucket="tse",
+            object_key="3f1c2a9e-7d4b-4c8e-9a51-2b6f0e7d9c14",
+            proxy_host="https://img.example.com",
+            key="943b421c9eb07c830af81030552c86009268de4e532ba2ee2eab8247c6da0881",
+            salt="520f986b998545b4785e0defbc4f3c1203f22de2374a3d53cb7a7fe9fea309c5",
+            width=320,
+            height=240,
+            enlarge=True,
+        ).build_url()
+
+    return run
+
+
+@benchmark("imgproxy._calculate_signature")
+def _imgproxy_signature():
+    from app.core.imgproxy import ImgProxy
+
+    client = ImgProxy.from_s3(
+        bucket="tse",
+        object_key="3f1c2a9e-7d4b-4c8e-9a51-2b6f0e7d9c14",
+        key="943b421c9eb07c830af81030552c86009268de4e532ba2ee2eab8247c6da0881",
+        salt="520f986b998545b4785e0defbc4f3c1203f22de2374a3d53cb7a7fe9fea309c5",
+    )
+    path = "/rs:fit:320:240:1:0/plain/s3://tse/3f1c2a9e-7d4b-4c8e-9a51-2b6f0e7d9c14"
+    return lambda: client._calculate_signature(path)
+
+
+@benchmark("attendance.calculate_distance")
+def _calculate_distance():
+    from app.api.attendance.crud import calculate_distance
+
+    return lambda: calculate_distance(-1.2654, 116.8312, -1.2661, 116.8325)
+
+
+@benchmark("attendance.validate_geolocation")
+def _validate_geolocation():
+    from app.api.attendance.crud import validate_geolocation
+
+    return lambda: validate_geolocation(-1.2654, 116.8312, -1.2661, 116.8325, 200)
+
+
+def _inventory_schema():
+    import uuid
+
+    from app.api.inventory.schemas import InventorySchema
+
+    return InventorySchema(
+        item_name="Safety Helmet",
+        item_description="Class E hard hat",
+        item_category="PPE",
+        item_code="PPE-00042",
+        manufacturer="MSA",
+        quantity=120,
+        quantity_uom="pcs",
+        storage_location_id=uuid.UUID("0b8f6a3c-54c1-4f0e-8a77-2d9e51c0b6aa"),
+        condition_status="New",
+        photo_file_ids=[uuid.UUID(int=index) for index in range(3)],
+    )
+
+
+@benchmark("schema.parse_schema")
+def _parse_schema():
+    from app.core.schema_operations import parse_schema
+
+    schema = _inventory_schema()
+    return lambda: parse_schema(schema)
+
+
+@benchmark("schema.model_from_dict")
+def _model_from_dict():
+    from app.api.inventory.models import Inventory
+    from app.core.schema_operations import model_from_dict
+
+    data = _inventory_schema().model_dump()
+    return lambda: model_from_dict(Inventory, data, exclude_ids=True)
+
+
+@benchmark("filters.apply_filters")
+def _apply_filters():
+    from sqlalchemy.orm import Session
+
+    from app.api.it_tickets.models import ITTicket
+    from app.utils.filter_utils import apply_filters
+
+    session = Session()
+    filter_param = json.dumps(
+        {
+            "0": {"name": "title", "value": "laptop"},
+            "1": {"name": "status", "value": "open"},
+            "2": {"name": "priority", "value": "high"},
+        }
+    )
+    return lambda: apply_filters(ITTicket, filter_param, session.query(ITTicket)).statement
+
+
+@benchmark("models.to_jsonable_dict")
+def _to_jsonable_dict():
+    import uuid
+
+    from app.api.it_tickets.models import ITTicket, TicketCategory, TicketPriority
+    from app.utils.models_utils import to_jsonable_dict
+
+    ticket = ITTicket(
+        id=uuid.UUID("6d1f0c52-8a3e-4b7d-9e21-5c4a7f3b2e10"),
+        photo_file_ids=[uuid.UUID(int=index) for index in range(3)],
+        title="Laptop cannot connect to VPN",
+        description="Connection drops every few minutes on site wifi",
+        category=TicketCategory.NETWORK,
+        priority=TicketPriority.HIGH,
+        reporter_id=uuid.UUID("0b8f6a3c-54c1-4f0e-8a77-2d9e51c0b6aa"),
+        created_at=datetime(2025, 3, 14, 8, 30),
+        updated_at=datetime(2025, 3, 14, 8, 30),
+    )
+    return lambda: to_jsonable_dict(ticket)
+
+
+@benchmark("string.parse_string")
+def _parse_string():
+    from app.utils.string import parse_string
+
+    # One of each shape, ending with the slowest path (falls through every format)
+    values = ["true", "42", "3.14", "6d1f0c52-8a3e-4b7d-9e21-5c4a7f3b2e10", "14/03/2025", "laptop"]
+
+    def run():
+        for value in values:
+            parse_string(value)
+
+    return run
+
+
+@benchmark("datetime.validate_date")
+def _validate_date():
+    from app.utils.datetime import validate_date
+
+    def run():
+        validate_date("2025-03-14T08:30:00.123Z")
+        validate_date("14/03/2025")
+
+    return run
+
+
+@benchmark("datetime.validate_time")
+def _validate_time():
+    from app.utils.datetime import validate_time
+
+    def run():
+        validate_time("2025-03-14T08:30:00.123Z")
+        validate_time("08:30:00")
+
+    return run
+
+
+def measure(func: Callable[[], object], repeat: int, min_time: float) -> dict:
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    # autorange stops at >= 0.2s; scale the loop up to the requested round time
+    if elapsed < min_time:
+        number = max(number, int(number * min_time / max(elapsed, 1e-9)))
+    rounds = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "loops": number,
+        "min_us": round(min(rounds) * 1e6, 4),
+        "median_us": round(statistics.median(rounds) * 1e6, 4),
+        "stdev_us": round(statistics.stdev(rounds) * 1e6, 4) if len(rounds) > 1 else 0.0,
+    }
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", "--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    parser.add_argument("--baseline", type=Path, default=BASELINES_PATH)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=15.0, help="regression threshold, percent")
+    args = parser.parse_args()
+
+    # Importing the app modules must not reach for MinIO
+    settings.S3_BACKEND = "memory"
+    from app.core import models  # noqa: F401  configures every mapper
+
+    from app.scripts.bench_utils import print_table
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    previous = baseline.get("benchmarks", {})
+    results, rows, regressed = {}, [], False
+
+    for name, factory in BENCHMARKS.items():
+        if args.filter and args.filter not in name:
+            continue
+        result = results[name] = measure(factory(), args.repeat, args.min_time)
+        row = {"benchmark": name, "min_us": result["min_us"], "median_us": result["median_us"]}
+
+        if name in previous:
+            before = previous[name]["min_us"]
+            change = (result["min_us"] - before) / before * 100
+            row["baseline_us"] = before
+            row["change"] = f"{change:+.1f}%"
+            if change > args.threshold and not args.save:
+                row["change"] += " REGRESSION"
+                regressed = True
+        rows.append(row)
+
+    print_table(rows, ["benchmark", "min_us", "median_us", "baseline_us", "change"])
+    if baseline and not args.save:
+        recorded = baseline.get("environment", {})
+        if recorded.get("python") != platform.python_version():
+            print(f"\nNote: baseline was recorded on Python {recorded.get('python')}")
+
+    if args.save:
+        merged = {**previous, **results} if args.filter else results
+        document = {"environment": environment(), "benchmarks": dict(sorted(merged.items()))}
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"\nBaselines written to {args.baseline}")
+        return 0
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+import argparse
+import json
+
+from app.core.database.purge import in_purge_window, purge_soft_deleted
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Move soft-deleted rows past retention into archived_records"
+    )
+    parser.add_argument("--retention-days", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--pause-seconds", type=float, default=None)
+    parser.add_argument(
+        "--max-batches", type=int, default=None, help="Batch budget per table"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run even outside the configured quiet window",
+    )
+    args = parser.parse_args()
+
+    if not args.force and not in_purge_window():
+        print("Outside the purge window, use --force to run anyway")
+    else:
+        report = purge_soft_deleted(
+            retention_days=args.retention_days,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause_seconds,
+            max_batches=args.max_batches,
+        )
+        print(json.dumps(report, indent=2))
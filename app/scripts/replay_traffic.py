@@ -0,0 +1,279 @@
+"""
+Replay recorded traffic against a test instance and compare builds.
+
+The request log (REQUEST_LOG_ENABLED, see app/core/request_log.py) stores a
+sample of real requests in `user_logs` with their query strings, sensitive
+parameters masked, and server-side timings. This tool turns that into a
+benchmark with the real `filter` and `sort` values clients send:
+
+    export   read captured GET requests from user_logs into a JSONL file
+    replay   send them to a running build at their recorded pace, or
+             `--speed` times faster, and write a latency report
+    compare  compare two replay reports route by route; exits 1 when a route's
+             p95 regressed by more than `--threshold` percent
+
+Only reads are replayed: bodies of writes are redacted or truncated when
+captured, and replaying them would change the target's data between builds.
+The log keeps REQUEST_LOG_SAMPLE_RATE of the traffic, so `--speed 20` with a
+5% sample approximates the original request rate. Replays send everything with
+one token, so run the target with RATE_LIMIT_ENABLED=false.
+
+    python -m app.scripts.replay_traffic export --since 2025-06-02T06:00 --until 2025-06-02T10:00 -o monday.jsonl
+    python -m app.scripts.replay_traffic replay monday.jsonl --speed 20 --label main -o main.json
+    python -m app.scripts.replay_traffic replay monday.jsonl --speed 20 --label branch -o branch.json
+    python -m app.scripts.replay_traffic compare main.json branch.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+from bisect import bisect_right
+from datetime import datetime
+
+from app.core.config import settings
+
+REPLAYED_METHODS = ("GET", "HEAD")
+
+_ID_SEGMENT = re.compile(
+    r"/(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)(?=/|$)"
+)
+
+
+def route_of(path: str) -> str:
+    """Groups concrete paths by shape: /it-tickets/<uuid> -> /it-tickets/{id}."""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def export(args) -> int:
+    from sqlalchemy import select
+
+    from app.api.auth.models import UserLog
+    from app.core.database import sessionmanager
+
+    statement = (
+        select(
+            UserLog.timestamp,
+            UserLog.method,
+            UserLog.path,
+            UserLog.query,
+            UserLog.status_code,
+            UserLog.duration_ms,
+        )
+        .where(UserLog.method.in_(REPLAYED_METHODS))
+        .order_by(UserLog.timestamp)
+    )
+    if args.since:
+        statement = statement.where(UserLog.timestamp >= args.since)
+    if args.until:
+        statement = statement.where(UserLog.timestamp < args.until)
+    if args.limit:
+        statement = statement.limit(args.limit)
+
+    count, first = 0, None
+    with sessionmanager.session() as session, open(args.output, "w") as file:
+        for row in session.execute(statement.execution_options(yield_per=5000)):
+            first = first or row.timestamp
+            # Stored paths include the mount prefix; --base-url carries it on replay
+            path = row.path
+            if settings.ROOT_PATH and path.startswith(settings.ROOT_PATH + "/"):
+                path = path[len(settings.ROOT_PATH) :]
+            entry = {
+                "offset_s": round((row.timestamp - first).total_seconds(), 3),
+                "method": row.method,
+                "path": path,
+                "query": row.query,
+                "status": int(row.status_code),
+                "duration_ms": row.duration_ms,
+            }
+            file.write(json.dumps(entry) + "\n")
+            count += 1
+    print(f"Exported {count} requests to {args.output}")
+    return 0
+
+
+def load_entries(path: str) -> list[dict]:
+    with open(path) as file:
+        entries = [json.loads(line) for line in file if line.strip()]
+    return [entry for entry in entries if entry["method"] in REPLAYED_METHODS]
+
+
+async def replay_entries(args, entries: list[dict]) -> dict:
+    from app.scripts.bench_utils import AsyncHTTPClient, summarize
+    from app.scripts.load_test import LoadStats
+
+    stats = LoadStats()
+    client = AsyncHTTPClient(args.base_url, max_connections=args.connections, timeout=args.timeout)
+    try:
+        token = args.token
+        if not token:
+            status, body = await client.request(
+                "POST", "/auth/login", form={"username": args.username, "password": args.password}
+            )
+            if status != 200:
+                sys.exit(f"Login failed ({status}): {body}")
+            token = body["data"]["access_token"]
+
+        async def send(entry):
+            route = f"{entry['method']} {route_of(entry['path'])}"
+            path = entry["path"] + (f"?{entry['query']}" if entry.get("query") else "")
+            started = loop.time()
+            try:
+                status, _ = await client.request(entry["method"], path, token)
+            except (OSError, asyncio.TimeoutError, ValueError):
+                status = 0
+            stats.record(route, status, loop.time() - started)
+
+        # Open loop: each request goes out at its recorded offset, however slow the target is
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tasks = set()
+        for entry in entries:
+            delay = start + entry["offset_s"] / args.speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                stats.lateness.append(-delay)
+            task = asyncio.create_task(send(entry))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+        wall_time = loop.time() - start
+    finally:
+        await client.close()
+
+    report = stats.report(wall_time, samples=True)
+    recorded: dict[str, list[float]] = {}
+    for entry in entries:
+        if entry.get("duration_ms") is not None:
+            route = f"{entry['method']} {route_of(entry['path'])}"
+            recorded.setdefault(route, []).append(entry["duration_ms"] / 1000)
+    for route, summary in report["routes"].items():
+        if route in recorded:
+            summary["recorded_p95_ms"] = summarize(recorded[route])["p95_ms"]
+    return {"label": args.label, "source": args.log, "speed": args.speed, **report}
+
+
+def replay(args) -> int:
+    from app.scripts.bench_utils import print_table
+
+    entries = load_entries(args.log)
+    if args.sample < 1:
+        rng = random.Random(args.seed)
+        entries = [entry for entry in entries if rng.random() < args.sample]
+    if not entries:
+        print(f"No replayable requests in {args.log}")
+        return 1
+    span = entries[-1]["offset_s"] / args.speed
+    print(f"Replaying {len(entries)} requests over {span:.0f}s against {args.base_url}")
+
+    report = asyncio.run(replay_entries(args, entries))
+    print_table(
+        [{"route": route, **summary} for route, summary in report["routes"].items()],
+        ["route", "count", "error_rate", "p50_ms", "p95_ms", "p99_ms", "recorded_p95_ms"],
+    )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file)
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+def ks_statistic(first: list[float], second: list[float]) -> float:
+    """Two-sample Kolmogorov-Smirnov D: the largest gap between the two latency CDFs."""
+    first, second = sorted(first), sorted(second)
+    return max(
+        abs(bisect_right(first, value) / len(first) - bisect_right(second, value) / len(second))
+        for value in first + second
+    )
+
+
+def compare(args) -> int:
+    from app.scripts.bench_utils import print_table
+
+    with open(args.base) as file:
+        base = json.load(file)
+    with open(args.candidate) as file:
+        candidate = json.load(file)
+
+    rows, regressed = [], False
+    for route in sorted(set(base["routes"]) | set(candidate["routes"])):
+        before, after = base["routes"].get(route), candidate["routes"].get(route)
+        if not before or not after:
+            rows.append({"route": route, "verdict": "only in " + ("candidate" if after else "base")})
+            continue
+        change = (after["p95_ms"] - before["p95_ms"]) / max(before["p95_ms"], 1e-9) * 100
+        row = {
+            "route": route,
+            "count": f"{before['count']}/{after['count']}",
+            "p50_ms": f"{before['p50_ms']} -> {after['p50_ms']}",
+            "p95_ms": f"{before['p95_ms']} -> {after['p95_ms']}",
+            "p99_ms": f"{before['p99_ms']} -> {after['p99_ms']}",
+            "p95_change": f"{change:+.1f}%",
+            "ks_d": round(ks_statistic(before["samples_ms"], after["samples_ms"]), 3),
+            "errors": f"{before['error_rate']}% -> {after['error_rate']}%",
+        }
+        enough = min(before["count"], after["count"]) >= args.min_count
+        if not enough:
+            row["verdict"] = "too few samples"
+        elif change > args.threshold or after["error_rate"] > before["error_rate"] + 1:
+            row["verdict"] = "REGRESSION"
+            regressed = True
+        elif change < -args.threshold:
+            row["verdict"] = "faster"
+        else:
+            row["verdict"] = "ok"
+        rows.append(row)
+
+    print(f"{base.get('label')} -> {candidate.get('label')}")
+    print_table(
+        rows,
+        ["route", "count", "p50_ms", "p95_ms", "p99_ms", "p95_change", "ks_d", "errors", "verdict"],
+    )
+    return 1 if regressed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="user_logs -> JSONL")
+    export_parser.add_argument("-o", "--output", required=True)
+    export_parser.add_argument("--since", type=datetime.fromisoformat)
+    export_parser.add_argument("--until", type=datetime.fromisoformat)
+    export_parser.add_argument("--limit", type=int)
+
+    replay_parser = commands.add_parser("replay", help="JSONL -> latency report")
+    replay_parser.add_argument("log")
+    replay_parser.add_argument("--base-url", default="http://localhost:8000/backend")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="1 = recorded pace")
+    replay_parser.add_argument("--sample", type=float, default=1.0, help="fraction of requests to send")
+    replay_parser.add_argument("--seed", type=int, default=1)
+    replay_parser.add_argument("--token", help="bearer token; otherwise log in as --username")
+    replay_parser.add_argument("--username", default="perf-manager")
+    replay_parser.add_argument("--password", default="manager123")
+    replay_parser.add_argument("--connections", type=int, default=100)
+    replay_parser.add_argument("--timeout", type=float, default=30)
+    replay_parser.add_argument("--label", default="run")
+    replay_parser.add_argument("-o", "--output")
+
+    compare_parser = commands.add_parser("compare", help="two replay reports -> verdict")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="p95 regression, percent")
+    compare_parser.add_argument("--min-count", type=int, default=20)
+
+    args = parser.parse_args()
+    if args.command == "export":
+        # user_logs is all this needs; do not reach for MinIO when models are imported
+        settings.S3_BACKEND = "memory"
+        from app.core import models  # noqa: F401  configures every mapper
+    handlers = {"export": export, "replay": replay, "compare": compare}
+    sys.exit(handlers[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+from typing import Any, Iterable
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
+
+from app.core.database import DataChange
+
+
+def build_outcomes(ids: list[UUID], affected: set[UUID], action: str) -> list[dict]:
+    """Per-id result list in the order the ids were requested."""
+    return [
+        {
+            "id": str(id),
+            "success": id in affected,
+            "message": action if id in affected else "not found",
+        }
+        for id in ids
+    ]
+
+
+def bulk_update(
+    db: Session,
+    model,
+    ids: Iterable[UUID],
+    values: dict[str, Any],
+    action: str = "UPDATE",
+    where=None,
+) -> list[dict]:
+    """
+    Applies `values` to all rows in `ids` (that also match `where`, if given)
+    with a single UPDATE ... RETURNING and records one aggregated DataChange
+    entry instead of one per row.
+    Rows that are missing or soft-deleted are reported as not found.
+    """
+    ids = list(dict.fromkeys(ids))
+    user_id = db.info.get("user_id")
+
+    values = dict(values)
+    values.setdefault("last_updated", datetime.now(timezone.utc))
+    if user_id:
+        values.setdefault("last_updated_by_id", user_id)
+
+    criteria = [model.id.in_(ids), model.is_deleted.is_(False)]
+    if where is not None:
+        criteria.append(where)
+    affected = _update_returning(db, model, criteria, values, action)
+    if action == "DELETE":
+        _cascade_soft_delete(db, model, affected, values)
+    db.flush()
+
+    return build_outcomes(ids, set(affected), "deleted" if action == "DELETE" else "updated")
+
+
+def bulk_soft_delete(db: Session, model, ids: Iterable[UUID]) -> list[dict]:
+    """
+    Soft-deletes all rows in `ids` in one statement, and their children along
+    delete-cascading relationships in one statement per relationship, as
+    cascade_soft_delete does for rows deleted one at a time.
+    """
+    values = {"is_deleted": True, "deleted_at": datetime.now(timezone.utc)}
+    if db.info.get("user_id"):
+        values["deleted_by_id"] = db.info["user_id"]
+    return bulk_update(db, model, ids, values, action="DELETE")
+
+
+def _update_returning(db: Session, model, criteria: list, values: dict, action: str) -> list:
+    """Runs the UPDATE and records it: literal values once, computed ones per row."""
+    computed = [key for key, value in values.items() if isinstance(value, ClauseElement)]
+    statement = (
+        update(model)
+        .where(*criteria)
+        .values(**values)
+        .returning(model.id, *(getattr(model, key) for key in computed))
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.execute(statement).all()
+
+    changed_data = {
+        "ids": sorted(str(row.id) for row in rows),
+        "values": {key: value for key, value in values.items() if key not in computed},
+    }
+    if computed:
+        changed_data["rows"] = {
+            str(row.id): {key: getattr(row, key) for key in computed} for row in rows
+        }
+    db.add(
+        DataChange(
+            table_name=model.__tablename__,
+            action=action,
+            row_id=None,
+            changed_data=jsonable_encoder(changed_data),
+        )
+    )
+    return [row.id for row in rows]
+
+
+def _cascade_soft_delete(db: Session, model, ids: list, values: dict):
+    if not ids:
+        return
+    for relationship in inspect(model).relationships:
+        if not (relationship.cascade.delete or relationship.cascade.delete_orphan):
+            continue
+        child = relationship.mapper.class_
+        if not hasattr(child, "is_deleted"):
+            continue
+        criteria = [child.is_deleted.is_(False)]
+        for local, remote in relationship.local_remote_pairs:
+            criteria.append(remote.in_(select(local).where(model.id.in_(ids))))
+        child_values = {key: value for key, value in values.items() if hasattr(child, key)}
+        child_ids = _update_returning(db, child, criteria, child_values, "DELETE")
+        _cascade_soft_delete(db, child, child_ids, values)
+
+
+def summarize_outcomes(outcomes: list[dict]) -> dict:
+    succeeded = sum(1 for outcome in outcomes if outcome["success"])
+    return {
+        "succeeded": succeeded,
+        "failed": len(outcomes) - succeeded,
+        "results": outcomes,
+    }
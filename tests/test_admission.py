@@ -0,0 +1,52 @@
+import asyncio
+import unittest
+
+from app.core.admission import AdmissionController
+
+
+def controller(queue_timeout: float = 0.1) -> AdmissionController:
+    return AdmissionController(
+        classes={"interactive": (1, 2)},
+        routes={},
+        adaptive=[],
+        exempt_paths=[],
+        queue_timeout=queue_timeout,
+        adjust_interval=3600,
+    )
+
+
+class AcquireTest(unittest.IsolatedAsyncioTestCase):
+    async def test_timed_out_waiters_leave_the_queue(self):
+        admission = controller()
+        route_class = admission.classes["interactive"]
+        self.assertTrue(await admission.acquire(route_class))
+
+        shed = await asyncio.gather(admission.acquire(route_class), admission.acquire(route_class))
+
+        self.assertEqual(shed, [False, False])
+        self.assertEqual(len(route_class.waiters), 0)
+        # The queue has room again, and a freed slot goes straight to a new arrival
+        admission.release(route_class)
+        self.assertTrue(await admission.acquire(route_class))
+        self.assertEqual(route_class.active, 1)
+
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        admission = controller(queue_timeout=10)
+        route_class = admission.classes["interactive"]
+        self.assertTrue(await admission.acquire(route_class))
+
+        task = asyncio.create_task(admission.acquire(route_class))
+        await asyncio.sleep(0)
+        self.assertEqual(len(route_class.waiters), 1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertEqual(len(route_class.waiters), 0)
+        admission.release(route_class)
+        self.assertEqual(route_class.active, 0)
+        self.assertTrue(await admission.acquire(route_class))
+
+
+if __name__ == "__main__":
+    unittest.main()
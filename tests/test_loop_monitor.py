@@ -0,0 +1,45 @@
+import asyncio
+import inspect
+import time
+import unittest
+
+from app.core.loop_monitor import LoopWatchdog
+from prometheus_client import REGISTRY
+
+
+def block_loop():
+    time.sleep(0.3)
+    finished = True
+    return finished
+
+
+class LoopWatchdogTest(unittest.IsolatedAsyncioTestCase):
+    async def test_block_is_labelled_where_the_loop_was_held(self):
+        watchdog = LoopWatchdog(interval=0.01, threshold=0.1)
+        watchdog.start(asyncio.get_running_loop())
+        try:
+            await asyncio.sleep(0.05)
+            block_loop()
+            await asyncio.sleep(0.05)
+        finally:
+            watchdog.stop()
+
+        sites = watchdog.snapshot()["blocking_calls"]
+        self.assertEqual(len(sites), 1)
+        sleep_line = inspect.getsourcelines(block_loop)[1] + 1
+        self.assertTrue(sites[0]["blocking_frame"].endswith(f":{sleep_line})"))
+        self.assertEqual(sites[0]["stack"][0], sites[0]["blocking_frame"])
+
+    async def test_lag_only_measures_without_capturing(self):
+        before = REGISTRY.get_sample_value("tse_event_loop_lag_seconds_count") or 0
+        watchdog = LoopWatchdog(interval=0.01, threshold=0.1, capture_blocks=False)
+        watchdog.start(asyncio.get_running_loop())
+        try:
+            await asyncio.sleep(0.05)
+            block_loop()
+            await asyncio.sleep(0.05)
+        finally:
+            watchdog.stop()
+
+        self.assertGreater(REGISTRY.get_sample_value("tse_event_loop_lag_seconds_count"), before)
+        self.assertEqual(watchdog.snapshot()["blocking_calls"], [])